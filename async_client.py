@@ -0,0 +1,112 @@
+from client import APIV2, AccountAPIV2, TokenAPIV2, NFTAPIV2, TransactionAPIV2, BlockAPIV2, MonitoringAPIV2
+from bulk import aiter_bulk, abulk
+from columnar import ato_table
+from enrich import aiter_enriched
+from models import decode_records
+from pagination import aiter_pages, aiter_before
+from transport import AsyncTransport
+
+
+class AsyncAPIV2(APIV2):
+    """
+    Asyncio version of APIV2. Every endpoint method is inherited from the sync client, so it keeps the exact same
+    signature and URL building, but returns an awaitable because requests go through an AsyncTransport.
+    All sub-clients share one aiohttp session. The iter_* methods return async iterators.
+    """
+    _iter_pages = staticmethod(aiter_pages)
+    _iter_before = staticmethod(aiter_before)
+    _iter_bulk = staticmethod(aiter_bulk)
+    _bulk = staticmethod(abulk)
+    _to_table = staticmethod(ato_table)
+    _iter_enriched = staticmethod(aiter_enriched)
+
+    def __init__(self, api_key, transport: AsyncTransport | None = None, typed: bool = False):
+        super().__init__(api_key, transport if transport is not None else AsyncTransport(), typed)
+
+    async def _get(self, method_url, model=None):
+        response = await self._transport.get(method_url, self.headers)
+        if model is not None and self.typed:
+            return decode_records(response, model)
+        return response
+
+    @property
+    def token(self) -> "AsyncTokenAPIV2":
+        """Возвращает объект AsyncTokenAPIV2."""
+        if not hasattr(self, "_token"):
+            self._token = AsyncTokenAPIV2(self._api_key, self._transport, self.typed)
+        return self._token
+
+    @property
+    def account(self) -> "AsyncAccountAPIV2":
+        """Возвращает объект AsyncAccountAPIV2."""
+        if not hasattr(self, "_account"):
+            self._account = AsyncAccountAPIV2(self._api_key, self._transport, self.typed)
+        return self._account
+
+    @property
+    def nft(self) -> "AsyncNFTAPIV2":
+        """Возвращает объект AsyncNFTAPIV2."""
+        if not hasattr(self, "_nft"):
+            self._nft = AsyncNFTAPIV2(self._api_key, self._transport, self.typed)
+        return self._nft
+
+    @property
+    def transaction(self) -> "AsyncTransactionAPIV2":
+        """Возвращает объект AsyncTransactionAPIV2."""
+        if not hasattr(self, "_transaction"):
+            self._transaction = AsyncTransactionAPIV2(self._api_key, self._transport, self.typed)
+        return self._transaction
+
+    @property
+    def block(self) -> "AsyncBlockAPIV2":
+        """Возвращает объект AsyncBlockAPIV2."""
+        if not hasattr(self, "_block"):
+            self._block = AsyncBlockAPIV2(self._api_key, self._transport, self.typed)
+        return self._block
+
+    @property
+    def monitoring(self) -> "AsyncMonitoringAPIV2":
+        """Возвращает объект AsyncMonitoringAPIV2."""
+        if not hasattr(self, "_monitoring"):
+            self._monitoring = AsyncMonitoringAPIV2(self._api_key, self._transport, self.typed)
+        return self._monitoring
+
+    async def close(self):
+        await self._transport.close()
+
+    def __enter__(self):
+        # The sync protocol would call the async close() without awaiting it and leak the aiohttp session
+        raise TypeError(f'{type(self).__name__} must be used with "async with", not "with"')
+
+    def __exit__(self, *exc):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+class AsyncAccountAPIV2(AsyncAPIV2, AccountAPIV2):
+    pass
+
+
+class AsyncTokenAPIV2(AsyncAPIV2, TokenAPIV2):
+    pass
+
+
+class AsyncNFTAPIV2(AsyncAPIV2, NFTAPIV2):
+    pass
+
+
+class AsyncTransactionAPIV2(AsyncAPIV2, TransactionAPIV2):
+    pass
+
+
+class AsyncBlockAPIV2(AsyncAPIV2, BlockAPIV2):
+    pass
+
+
+class AsyncMonitoringAPIV2(AsyncAPIV2, MonitoringAPIV2):
+    pass
@@ -0,0 +1,158 @@
+import json
+import math
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from pagination import _page_items
+from sync import _field
+
+
+def _row_key(row):
+    if not isinstance(row, dict):
+        row = row.to_dict()
+    return json.dumps(row, sort_keys=True, default=str)
+
+
+def _block_time(row):
+    return _field(row, 'block_time') or 0
+
+
+class Backfill:
+    def __init__(self, fetch, start: int, stop: int, workers: int = 4, page_size: int = 100,
+                 target_rows: int = 2000, initial_window: int = 3600, min_window: int = 1,
+                 max_window: int | None = None, max_pages: int | None = None, paged: bool = True, key=_row_key):
+        """
+        Crawl a large block_time range by splitting it into sub-windows that are fetched in parallel and merged
+        back in time order. Each sub-window is small enough to be read from its first pages, so deep page numbers
+        are never requested: a window that fills max_pages is halved and the rest of it is fetched as a separate
+        window. Window sizes adapt to the row density observed in finished windows, and the first window is read
+        alone before the others are fanned out to the workers
+
+        Usage:
+            for row in Backfill(partial(api.account.transfer, address, flow='in'), start, stop, workers=8):
+                ...
+
+        Args:
+            fetch (callable): Endpoint accepting block_time=[start, stop] (and page/page_size when paged),
+            e.g. partial(api.account.transfer, address)
+
+            start (int): Start of the range. UnixTime in seconds
+
+            stop (int): End of the range, inclusive. UnixTime in seconds
+
+            workers (int): Number of windows fetched in parallel
+
+            page_size (int): Number items per page
+
+            target_rows (int): Number of rows a window should hold once the density is known
+
+            initial_window (int): Window size in seconds used until the first windows finish
+
+            min_window (int): Smallest window size in seconds
+
+            max_window (int | None): Largest window size in seconds
+
+            max_pages (int | None): Pages read from one window before it is split. Defaults to enough pages for
+            target_rows. Windows of min_window seconds are read to the end
+
+            paged (bool): False for endpoints returning a whole window in one call, such as transfer_export
+
+            key (callable): Identity of a row, used to drop rows returned by two adjacent windows
+        """
+        self.fetch = fetch
+        self.start = start
+        self.stop = stop
+        self.workers = workers
+        self.page_size = page_size
+        self.target_rows = target_rows
+        self.min_window = min_window
+        self.max_window = max_window
+        self.max_pages = max_pages if max_pages is not None else max(1, math.ceil(target_rows / page_size))
+        self.paged = paged
+        self.key = key
+        self._window = initial_window
+        self._lock = threading.Lock()
+
+    def _observe(self, window_start, window_stop, rows):
+        seconds = max(1, window_stop - window_start)
+        with self._lock:
+            if rows:
+                size = self.target_rows * seconds / rows
+            else:
+                # Nothing here, look further ahead next time
+                size = self._window * 2
+            size = max(self.min_window, int(size))
+            if self.max_window is not None:
+                size = min(self.max_window, size)
+            self._window = size
+
+    def _next_window(self, window_start):
+        with self._lock:
+            return window_start, min(self.stop, window_start + self._window)
+
+    def _read(self, window_start, window_stop, max_pages):
+        """
+        Rows of [window_start, window_stop] and whether they are all of them (False when max_pages were full)
+        """
+        fetch = partial(self.fetch, block_time=[window_start, window_stop])
+        if not self.paged:
+            return _page_items(fetch()), True
+        rows = []
+        page = 1
+        while max_pages is None or page <= max_pages:
+            items = _page_items(fetch(page=page, page_size=self.page_size))
+            rows.extend(items)
+            if len(items) < self.page_size:
+                return rows, True
+            page += 1
+        return rows, False
+
+    def _fetch_window(self, window_start, window_stop):
+        # Windows share their boundary second so nothing falls between them, duplicates are dropped on merge
+        while True:
+            size = window_stop - window_start
+            splittable = size > self.min_window
+            rows, complete = self._read(window_start, window_stop, self.max_pages if splittable else None)
+            # A full window still tells the density is at least this high
+            self._observe(window_start, window_stop, len(rows))
+            if complete:
+                break
+            window_stop = window_start + max(self.min_window, size // 2)
+        rows.sort(key=_block_time)
+        return window_stop, rows
+
+    def __iter__(self):
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        pending = deque()
+        window_start = self.start
+        edge = -1
+        edge_keys = set()
+        # The first window is read alone so the others are sized from its density
+        fan_out = 1
+        try:
+            while pending or window_start <= self.stop:
+                while window_start <= self.stop and len(pending) < fan_out:
+                    window_start, window_stop = self._next_window(window_start)
+                    pending.append((window_stop, executor.submit(self._fetch_window, window_start, window_stop)))
+                    window_start = window_stop if window_stop < self.stop else self.stop + 1
+                requested, future = pending.popleft()
+                window_stop, rows = future.result()
+                if window_stop < requested:
+                    # The window was split: fetch the rest of it before the windows queued after it
+                    pending.appendleft((requested, executor.submit(self._fetch_window, window_stop, requested)))
+                fan_out = self.workers
+                next_edge_keys = set()
+                for row in rows:
+                    block_time = _block_time(row)
+                    if block_time <= edge and self.key(row) in edge_keys:
+                        continue
+                    if block_time >= window_stop:
+                        next_edge_keys.add(self.key(row))
+                    yield row
+                edge, edge_keys = window_stop, next_edge_keys
+        finally:
+            for _, future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
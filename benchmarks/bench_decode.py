@@ -0,0 +1,35 @@
+"""
+Compare JSON decoders on endpoint payloads: python benchmarks/bench_decode.py [--number N]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from decoders import DECODERS  # noqa: E402
+from fixtures import load_payloads  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--number', type=int, default=200, help='decodes per measurement')
+    args = parser.parse_args()
+
+    payloads = load_payloads()
+    names = list(DECODERS)
+    print(f'{"endpoint":<26}{"size KB":>9}' + ''.join(f'{name + " us":>14}' for name in names) + f'{"speedup":>10}')
+    for endpoint, body in payloads.items():
+        timings = {}
+        for name in names:
+            decode = DECODERS[name]
+            best = min(timeit.repeat(lambda: decode(body), number=args.number, repeat=5))
+            timings[name] = best / args.number * 1e6
+        fastest = min(timings.values())
+        print(f'{endpoint:<26}{len(body) / 1024:>9.1f}' + ''.join(f'{timings[name]:>14.1f}' for name in names)
+              + f'{timings["json"] / fastest:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+Memory held by decoded rows as plain dicts vs typed slotted records:
+python benchmarks/bench_models.py [--pages N]
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import Transfer, BalanceChange, DefiActivity, TokenHolder, NFTActivity, decode_records  # noqa: E402
+from fixtures import synthetic_payloads  # noqa: E402
+
+MODELS = {
+    'account_transfer': Transfer,
+    'account_balance_change': BalanceChange,
+    'account_defi_activities': DefiActivity,
+    'token_holders': TokenHolder,
+    'nft_activities': NFTActivity,
+}
+
+
+def measure(bodies, convert):
+    gc.collect()
+    tracemalloc.start()
+    kept = [convert(json.loads(body)) for body in bodies]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rows = sum(len(page['data']['items'] if isinstance(page['data'], dict) else page['data']) for page in kept)
+    del kept
+    return size, rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--pages', type=int, default=50, help='distinct pages per endpoint')
+    args = parser.parse_args()
+
+    pages = [synthetic_payloads(seed) for seed in range(args.pages)]
+    print(f'{"endpoint":<26}{"rows":>8}{"dict B/row":>12}{"record B/row":>14}{"saved":>8}')
+    for endpoint, model in MODELS.items():
+        bodies = [json.dumps(page[endpoint]).encode() for page in pages]
+        dict_size, rows = measure(bodies, lambda response: response)
+        record_size, _ = measure(bodies, lambda response: decode_records(response, model))
+        print(f'{endpoint:<26}{rows:>8}{dict_size / rows:>12.0f}{record_size / rows:>14.0f}'
+              f'{1 - record_size / dict_size:>8.0%}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""
+Compare URL building of the old string concatenation with the endpoint specs of endpoints.py:
+python benchmarks/bench_urls.py [--number N]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from endpoints import ACCOUNT_TRANSFER  # noqa: E402
+
+BASE = 'https://pro-api.solscan.io/v2.0/'
+ADDRESS = 'GThUX1Atko4tqhN2NaiTazWSeFWMuiUvfFnyJyUghFMJ'
+
+
+def concat_transfer(address, activity_type=None, token_account=None, from_=None, to_=None, token=None, amount=None,
+                    exclude_amount_zero=None, flow=None, block_time=None, page=None, page_size=None, sort_by=None,
+                    sort_order=None):
+    # AccountAPIV2.transfer as it was built before endpoints.py, kept here as the baseline
+    method_url = BASE + 'account/' + 'transfer?address=' + address
+    if isinstance(activity_type, list):
+        for i in range(0, len(activity_type)):
+            method_url = method_url + '&activity_type[]=' + activity_type[i]
+    elif activity_type is not None:
+        raise TypeError('Wrong type for input args')
+    if isinstance(token_account, str):
+        method_url = method_url + '&token_account=' + token_account
+    elif token_account is not None:
+        raise TypeError('Wrong type for input args')
+    if isinstance(from_, str):
+        method_url = method_url + '&from=' + from_
+    elif from_ is not None:
+        raise TypeError('Wrong type for input args')
+    if isinstance(to_, str):
+        method_url = method_url + '&from=' + to_
+    elif to_ is not None:
+        raise TypeError('Wrong type for input args')
+    if isinstance(token, str):
+        method_url = method_url + '&token=' + token
+    elif token is not None:
+        raise TypeError('Wrong type for input args')
+    if isinstance(amount, list):
+        for i in range(0, len(amount)):
+            method_url = method_url + '&amount[]=' + str(amount[i])
+    elif amount is not None:
+        raise TypeError('Wrong type for input args')
+    if isinstance(flow, str):
+        method_url = method_url + '&flow=' + flow
+    elif flow is not None:
+        raise TypeError('Wrong type for input args')
+    if isinstance(exclude_amount_zero, bool):
+        method_url = method_url + '&exclude_amount_zero=' + str(exclude_amount_zero).lower()
+    elif exclude_amount_zero is not None:
+        raise TypeError('Wrong type for input args')
+    if isinstance(block_time, list):
+        for i in range(0, len(block_time)):
+            method_url = method_url + '&block_time[]=' + str(block_time[i])
+    elif block_time is not None:
+        raise TypeError('Wrong type for input args')
+    if isinstance(page, int):
+        method_url = method_url + '&page=' + str(page)
+    elif page is not None:
+        raise TypeError('Wrong type for input args')
+    if isinstance(page_size, int):
+        method_url = method_url + '&page_size=' + str(page_size)
+    elif page_size is not None:
+        raise TypeError('Wrong type for input args')
+    if isinstance(sort_by, str):
+        method_url = method_url + '&sort_by=' + sort_by
+    elif sort_by is not None:
+        raise TypeError('Wrong type for input args')
+    if isinstance(sort_order, str):
+        method_url = method_url + '&sort_order=' + sort_order
+    elif sort_order is not None:
+        raise TypeError('Wrong type for input args')
+    return method_url
+
+
+def spec_transfer(address, activity_type=None, token_account=None, from_=None, to_=None, token=None, amount=None,
+                  exclude_amount_zero=None, flow=None, block_time=None, page=None, page_size=None, sort_by=None,
+                  sort_order=None):
+    return ACCOUNT_TRANSFER.url(BASE, address, activity_type, token_account, from_, to_, token, amount,
+                                exclude_amount_zero, flow, block_time, page, page_size, sort_by, sort_order)
+
+
+CASES = {
+    'address only': {},
+    'paged': {'page': 3, 'page_size': 100},
+    'block_time window': {'block_time': [1700000000, 1700086400], 'page': 3, 'page_size': 100,
+                          'sort_by': 'block_time', 'sort_order': 'desc'},
+    'all filters': {'activity_type': ['ACTIVITY_SPL_TRANSFER', 'ACTIVITY_SPL_BURN'], 'token_account': ADDRESS,
+                    'from_': ADDRESS, 'to_': ADDRESS, 'token': ADDRESS, 'amount': [1, 1000],
+                    'exclude_amount_zero': True, 'flow': 'in', 'block_time': [1700000000, 1700086400],
+                    'page': 3, 'page_size': 100, 'sort_by': 'block_time', 'sort_order': 'desc'},
+    '50 activity types': {'activity_type': ['ACTIVITY_SPL_TRANSFER'] * 50, 'page': 1, 'page_size': 100},
+}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--number', type=int, default=20000, help='URLs built per measurement')
+    args = parser.parse_args()
+
+    print(f'{"case":<20}{"concat us":>12}{"spec us":>14}{"ratio":>8}')
+    for name, kwargs in CASES.items():
+        timings = []
+        for build in (concat_transfer, spec_transfer):
+            best = min(timeit.repeat(lambda: build(ADDRESS, **kwargs), number=args.number, repeat=5))
+            timings.append(best / args.number * 1e6)
+        print(f'{name:<20}{timings[0]:>12.2f}{timings[1]:>14.2f}{timings[0] / timings[1]:>7.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+"""
+Response payloads for the benchmarks.
+
+Recorded API responses dropped into benchmarks/fixtures/<endpoint>.json (e.g. transaction_detail.json) are used
+as is. Endpoints without a recording fall back to a deterministic synthetic payload with the same shape and
+roughly the same size as a real page_size=100 response.
+"""
+import json
+import os
+import random
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+ALPHABET = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
+
+
+def _address(rng):
+    return ''.join(rng.choice(ALPHABET) for _ in range(44))
+
+
+def _signature(rng):
+    return ''.join(rng.choice(ALPHABET) for _ in range(88))
+
+
+def _transfer(rng, block_time):
+    return {
+        'block_id': 300000000 + rng.randrange(10 ** 6), 'trans_id': _signature(rng), 'block_time': block_time,
+        'time': '2024-12-08T10:00:00.000Z', 'activity_type': 'ACTIVITY_SPL_TRANSFER',
+        'from_address': _address(rng), 'to_address': _address(rng), 'token_address': _address(rng),
+        'token_decimals': 6, 'amount': rng.randrange(10 ** 12), 'flow': rng.choice(['in', 'out']),
+    }
+
+
+def _balance_change(rng, block_time):
+    return {
+        'block_id': 300000000 + rng.randrange(10 ** 6), 'block_time': block_time, 'time': '2024-12-08T10:00:00.000Z',
+        'trans_id': _signature(rng), 'address': _address(rng), 'token_address': _address(rng),
+        'token_account': _address(rng), 'token_decimals': 9, 'amount': rng.randrange(10 ** 12),
+        'pre_balance': rng.randrange(10 ** 12), 'post_balance': rng.randrange(10 ** 12),
+        'change_type': rng.choice(['inc', 'dec']), 'fee': 5000,
+    }
+
+
+def _defi_activity(rng, block_time):
+    return {
+        'block_id': 300000000 + rng.randrange(10 ** 6), 'trans_id': _signature(rng), 'block_time': block_time,
+        'time': '2024-12-08T10:00:00.000Z', 'activity_type': 'ACTIVITY_TOKEN_SWAP', 'from_address': _address(rng),
+        'to_address': _address(rng), 'sources': [_address(rng)], 'platform': _address(rng),
+        'routers': {'token1': _address(rng), 'token1_decimals': 9, 'amount1': rng.randrange(10 ** 12),
+                    'token2': _address(rng), 'token2_decimals': 6, 'amount2': rng.randrange(10 ** 12)},
+    }
+
+
+def _holder(rng, rank):
+    return {'address': _address(rng), 'amount': rng.randrange(10 ** 15), 'decimals': 6, 'owner': _address(rng),
+            'rank': rank}
+
+
+def _nft_activity(rng, block_time):
+    return {
+        'block_id': 300000000 + rng.randrange(10 ** 6), 'trans_id': _signature(rng), 'block_time': block_time,
+        'time': '2024-12-08T10:00:00.000Z', 'activity_type': 'ACTIVITY_NFT_SOLD', 'from_address': _address(rng),
+        'to_address': _address(rng), 'token_address': _address(rng), 'marketplace_address': _address(rng),
+        'collection_address': _address(rng), 'amount': 1, 'price': rng.randrange(10 ** 11),
+        'currency_token': 'So11111111111111111111111111111111111111112', 'currency_decimals': 9,
+    }
+
+
+def _instruction(rng, depth):
+    instruction = {
+        'ins_index': rng.randrange(20), 'parsed_type': 'transfer', 'type': 'transfer', 'program_id': _address(rng),
+        'program': 'spl-token', 'outer_program_id': None, 'outer_ins_index': -1,
+        'data_raw': {'info': {'source': _address(rng), 'destination': _address(rng),
+                              'authority': _address(rng), 'amount': str(rng.randrange(10 ** 12))}},
+        'accounts': [_address(rng) for _ in range(6)], 'activities': [], 'transfers': [], 'program_invoke_level': 1,
+    }
+    if depth:
+        instruction['inner_instructions'] = [_instruction(rng, depth - 1) for _ in range(3)]
+    return instruction
+
+
+def _transaction_detail(rng):
+    return {
+        'block_id': 300000000, 'fee': 5000, 'reward': [], 'sol_bal_change': [
+            {'address': _address(rng), 'pre_balance': str(rng.randrange(10 ** 12)),
+             'post_balance': str(rng.randrange(10 ** 12)), 'change_amount': str(rng.randrange(10 ** 9))}
+            for _ in range(15)],
+        'token_bal_change': [
+            {'address': _address(rng), 'change_type': 'inc', 'change_amount': str(rng.randrange(10 ** 9)),
+             'decimals': 6, 'post_balance': str(rng.randrange(10 ** 12)), 'pre_balance': '0',
+             'token_address': _address(rng), 'owner': _address(rng)} for _ in range(10)],
+        'tokens_involved': [_address(rng) for _ in range(8)], 'parsed_instructions': [
+            _instruction(rng, 2) for _ in range(8)],
+        'programs_involved': [_address(rng) for _ in range(6)], 'signer': [_address(rng)], 'status': 1,
+        'account_keys': [{'pubkey': _address(rng), 'signer': False, 'source': 'transaction', 'writable': True}
+                         for _ in range(30)],
+        'compute_units_consumed': 180000, 'confirmations': None, 'version': 0, 'tx_hash': _signature(rng),
+        'block_time': 1733652000, 'log_message': ['Program log: Instruction: Transfer'] * 40,
+        'recent_block_hash': _address(rng),
+    }
+
+
+def _block_transaction(rng):
+    return {
+        'slot': 300000000, 'fee': 5000, 'status': 'Success', 'signer': [_address(rng)], 'block_time': 1733652000,
+        'tx_hash': _signature(rng), 'parsed_instructions': [
+            {'type': 'transfer', 'program': 'spl-token', 'program_id': _address(rng)} for _ in range(4)],
+        'program_ids': [_address(rng) for _ in range(3)], 'time': '2024-12-08T10:00:00.000Z',
+    }
+
+
+def synthetic_payloads(seed=1):
+    rng = random.Random(seed)
+    times = [1733652000 - i * 7 for i in range(100)]
+    return {
+        'account_transfer': {'success': True, 'data': [_transfer(rng, t) for t in times]},
+        'account_balance_change': {'success': True, 'data': [_balance_change(rng, t) for t in times]},
+        'account_defi_activities': {'success': True, 'data': [_defi_activity(rng, t) for t in times]},
+        'token_holders': {'success': True, 'data': {'total': 100000,
+                                                    'items': [_holder(rng, i + 1) for i in range(40)]}},
+        'nft_activities': {'success': True, 'data': [_nft_activity(rng, t) for t in times]},
+        'block_transactions': {'success': True, 'data': {'total': 1500,
+                                                         'transactions': [_block_transaction(rng)
+                                                                          for _ in range(100)]}},
+        'transaction_detail': {'success': True, 'data': _transaction_detail(rng)},
+    }
+
+
+def load_payloads():
+    """
+    Return {endpoint: raw JSON bytes}, recorded fixtures taking precedence over synthetic ones
+    """
+    payloads = {name: json.dumps(payload).encode() for name, payload in synthetic_payloads().items()}
+    if os.path.isdir(FIXTURES_DIR):
+        for filename in sorted(os.listdir(FIXTURES_DIR)):
+            if filename.endswith('.json'):
+                with open(os.path.join(FIXTURES_DIR, filename), 'rb') as file:
+                    payloads[filename[:-len('.json')]] = file.read()
+    return payloads
@@ -0,0 +1,146 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pagination import _page_items
+
+
+def _slot(block):
+    for key in ('current_slot', 'slot', 'block_id'):
+        if block.get(key) is not None:
+            return int(block[key])
+    return None
+
+
+class BlockStream:
+    def __init__(self, block, start: int | None = None, workers: int = 8, buffer: int = 64, page_size: int = 100,
+                 prefetch: int = 2, poll_interval: float = 0.4, last_limit: int = 100, include_skipped: bool = False,
+                 max_attempts: int = 5):
+        """
+        Follow the chain tip and yield every new block with all of its transactions, in slot order. New slots are
+        found with block.last(); the transaction pages of up to `workers` slots are fetched concurrently. Slots
+        missing from block.last() are checked with block.detail() and reported as skipped when no block was
+        produced. A request that still fails after the transport's retries ends the iteration with its error;
+        restart with start= the slot after the last one handled. At most `buffer` slots are fetched ahead of the
+        consumer, so a slow consumer slows the stream down instead of growing memory
+
+        Usage:
+            for item in BlockStream(api.block):
+                handle(item['slot'], item['transactions'])
+
+        Args:
+            block (BlockAPIV2): Client used for the requests
+
+            start (int | None): First slot to yield. Earlier slots are caught up at full speed. None starts at
+            the current tip
+
+            workers (int): Slots fetched concurrently
+
+            buffer (int): Slots fetched or being fetched ahead of the consumer
+
+            page_size (int): Transactions per page. Enum: 10, 20, 30, 40, 60, 100
+
+            prefetch (int): Pages of one slot fetched ahead concurrently
+
+            poll_interval (float): Seconds between block.last() calls once the stream has caught up
+
+            last_limit (int): Blocks requested from block.last() per poll
+
+            include_skipped (bool): Also yield skipped slots, as {'slot': slot, 'block': None, 'transactions': []}
+
+            max_attempts (int): Times a block is re-read while it has fewer transactions than its
+            transactions_count, which happens while the indexer is still catching up
+        """
+        self.block = block
+        self.start = start
+        self.workers = workers
+        self.buffer = buffer
+        self.page_size = page_size
+        self.prefetch = prefetch
+        self.poll_interval = poll_interval
+        self.last_limit = last_limit
+        self.include_skipped = include_skipped
+        self.max_attempts = max_attempts
+        self.skipped = 0
+        self.filled = 0
+
+    def _fetch_slot(self, slot, info, known_skipped):
+        if info is None:
+            if known_skipped:
+                return {'slot': slot, 'block': None, 'transactions': []}
+            # Slot fell out of the block.last() window: ask for it directly. Only an answer without a block means
+            # the slot was skipped; failed requests raise to the consumer instead of leaving a silent gap
+            info = self.block.detail(slot).get('data') or None
+            if info is None:
+                return {'slot': slot, 'block': None, 'transactions': []}
+            self.filled += 1
+        expected = info.get('transactions_count')
+        for attempt in range(self.max_attempts):
+            transactions = list(self.block.iter_transactions(slot, page_size=self.page_size, prefetch=self.prefetch))
+            if expected is None or len(transactions) >= expected:
+                break
+            time.sleep(self.poll_interval * (attempt + 1))
+        return {'slot': slot, 'block': info, 'transactions': transactions}
+
+    def _poll(self, known, skipped):
+        """
+        Read block.last() into `known` and `skipped` and return the tip slot
+        """
+        blocks = [block for block in _page_items(self.block.last(self.last_limit)) if _slot(block) is not None]
+        if not blocks:
+            return None
+        slots = {_slot(block): block for block in blocks}
+        known.update(slots)
+        low, tip = min(slots), max(slots)
+        # block.last() lists consecutive produced blocks, so gaps inside its window are skipped slots
+        skipped.update(slot for slot in range(low, tip) if slot not in slots)
+        for slot, block in slots.items():
+            parent = block.get('parent_slot')
+            if parent is not None:
+                skipped.update(range(int(parent) + 1, slot))
+        return tip
+
+    def __iter__(self):
+        known = {}
+        skipped = set()
+        pending = {}
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        tip = None
+        while tip is None:
+            tip = self._poll(known, skipped)
+            if tip is None:
+                time.sleep(self.poll_interval)
+        next_slot = self.start if self.start is not None else tip
+        submitted = next_slot - 1
+        polled = time.monotonic()
+        try:
+            while True:
+                if submitted >= tip:
+                    # Caught up: wait for the next poll unless there are blocks to hand out
+                    if next_slot not in pending:
+                        time.sleep(max(0.0, polled + self.poll_interval - time.monotonic()))
+                    if time.monotonic() - polled >= self.poll_interval:
+                        tip = max(tip, self._poll(known, skipped) or tip)
+                        polled = time.monotonic()
+                while submitted < tip and len(pending) < self.buffer:
+                    submitted += 1
+                    is_skipped = submitted in skipped and submitted not in known
+                    pending[submitted] = executor.submit(self._fetch_slot, submitted, known.pop(submitted, None),
+                                                         is_skipped)
+                    skipped.discard(submitted)
+                if next_slot not in pending:
+                    continue
+                item = pending.pop(next_slot).result()
+                next_slot += 1
+                if item['block'] is None:
+                    self.skipped += 1
+                    if not self.include_skipped:
+                        continue
+                yield item
+                # Forget slots the stream has already passed
+                for slot in [slot for slot in known if slot < next_slot]:
+                    del known[slot]
+                skipped.difference_update([slot for slot in skipped if slot < next_slot])
+        finally:
+            for future in pending.values():
+                future.cancel()
+            executor.shutdown(wait=False)
@@ -0,0 +1,111 @@
+import threading
+import time
+
+
+class BudgetExceededError(Exception):
+    pass
+
+
+class ComputeUnitBudget:
+    def __init__(self, limit: int, costs: dict[str, int] | None = None, default_cost: int = 100,
+                 soft_limit: float = 0.9, throttle_delay: float = 1.0, reconcile_interval: float | None = 300):
+        """
+        Local compute unit accounting for the PRO API. Every request is charged an estimated cost before it is sent,
+        the running total is periodically corrected against monitoring.usage(), and calls are slowed down past
+        the soft limit and refused once the budget is spent
+
+        Args:
+            limit (int): Compute units this client is allowed to spend
+
+            costs (dict[str, int] | None): Estimated cost per endpoint, keyed by endpoint path such as
+            'account/transfer'. Endpoints not listed cost default_cost
+
+            default_cost (int): Estimated cost of an endpoint missing from costs
+
+            soft_limit (float): Fraction of the limit after which every call is delayed by throttle_delay
+
+            throttle_delay (float): Delay in seconds added to each call past the soft limit
+
+            reconcile_interval (float | None): Seconds between reconciliations with monitoring.usage(),
+            None to rely on local estimates only
+        """
+        self.limit = limit
+        self.costs = costs or {}
+        self.default_cost = default_cost
+        self.soft_limit = soft_limit
+        self.throttle_delay = throttle_delay
+        self.reconcile_interval = reconcile_interval
+        self.spent = 0
+        self.remaining_server = None
+        self._breakdown = {}
+        self._baseline = None
+        self._last_reconcile = None
+        self._lock = threading.Lock()
+
+    def cost(self, endpoint: str) -> int:
+        return self.costs.get(endpoint, self.default_cost)
+
+    def reserve(self, endpoint: str) -> float:
+        """
+        Charge one call to `endpoint` and return how long the caller should wait before sending it
+
+        Raises:
+            BudgetExceededError: if the call would go over the limit
+        """
+        cost = self.cost(endpoint)
+        with self._lock:
+            if self.spent + cost > self.limit:
+                raise BudgetExceededError(f'Compute unit budget exhausted: {self.spent}/{self.limit} CU spent, '
+                                          f'{endpoint} needs {cost}')
+            if self.remaining_server is not None and cost > self.remaining_server:
+                raise BudgetExceededError(f'Plan quota exhausted: {self.remaining_server} CU left, '
+                                          f'{endpoint} needs {cost}')
+            self.spent += cost
+            if self.remaining_server is not None:
+                self.remaining_server -= cost
+            calls, units = self._breakdown.get(endpoint, (0, 0))
+            self._breakdown[endpoint] = (calls + 1, units + cost)
+            return self.throttle_delay if self.spent >= self.soft_limit * self.limit else 0.0
+
+    def needs_reconcile(self) -> bool:
+        """
+        True once per reconcile_interval, so only one caller fetches usage at a time
+        """
+        if self.reconcile_interval is None:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            if self._last_reconcile is not None and now - self._last_reconcile < self.reconcile_interval:
+                return False
+            self._last_reconcile = now
+            return True
+
+    def reconcile(self, usage: dict):
+        """
+        Correct the local total with a response of monitoring.usage()
+
+        The first reconciliation only records how much the account had already used, later ones replace the local
+        estimate with the real amount spent since then
+        """
+        data = usage.get('data', usage)
+        used = data.get('usage_cus')
+        with self._lock:
+            if used is not None:
+                if self._baseline is None:
+                    self._baseline = used - self.spent
+                else:
+                    self.spent = max(0, used - self._baseline)
+            if data.get('remaining_cus') is not None:
+                self.remaining_server = data['remaining_cus']
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.limit - self.spent)
+
+    def breakdown(self) -> dict[str, dict[str, int]]:
+        """
+        Estimated calls and compute units per endpoint, most expensive first
+        """
+        with self._lock:
+            items = sorted(self._breakdown.items(), key=lambda item: item[1][1], reverse=True)
+        return {endpoint: {'calls': calls, 'compute_units': units} for endpoint, (calls, units) in items}
@@ -0,0 +1,78 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from itertools import islice
+
+
+def iter_bulk(fetch, addresses, max_workers: int = 16):
+    """
+    Call fetch(address) for every address on a thread pool and yield (address, result) pairs as they complete.
+    A failed call yields its exception as the result instead of aborting the batch. At most 2 * max_workers
+    addresses are taken from the input at a time, so it can be an unbounded iterator
+
+    Args:
+        fetch (callable): Single-address endpoint, e.g. api.token.meta
+
+        addresses (Iterable[str]): Addresses to fetch
+
+        max_workers (int): Maximum number of requests in flight
+    """
+    addresses = iter(addresses)
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pending = {}
+    try:
+        for address in islice(addresses, 2 * max_workers):
+            pending[executor.submit(fetch, address)] = address
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                address = pending.pop(future)
+                for next_address in islice(addresses, 1):
+                    pending[executor.submit(fetch, next_address)] = next_address
+                try:
+                    result = future.result()
+                except Exception as exc:
+                    result = exc
+                yield address, result
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def bulk(fetch, addresses, max_workers: int = 16) -> dict:
+    """
+    Same as iter_bulk, but collects the results into a mapping from address to result or exception
+    """
+    return dict(iter_bulk(fetch, addresses, max_workers))
+
+
+async def aiter_bulk(fetch, addresses, max_workers: int = 64):
+    """
+    Async version of iter_bulk for fetch functions returning awaitables
+    """
+    addresses = iter(addresses)
+    pending = {}
+    try:
+        for address in islice(addresses, max_workers):
+            pending[asyncio.ensure_future(fetch(address))] = address
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                address = pending.pop(task)
+                for next_address in islice(addresses, 1):
+                    pending[asyncio.ensure_future(fetch(next_address))] = next_address
+                try:
+                    result = task.result()
+                except Exception as exc:
+                    result = exc
+                yield address, result
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def abulk(fetch, addresses, max_workers: int = 64) -> dict:
+    """
+    Async version of bulk
+    """
+    return {address: result async for address, result in aiter_bulk(fetch, addresses, max_workers)}
@@ -0,0 +1,197 @@
+import json
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from urllib.parse import urlsplit, parse_qsl, urlencode, urlunsplit
+
+from utils import _endpoint_name, _sqlite_connect
+
+FOREVER = float('inf')
+
+# Seconds a response stays fresh, keyed by endpoint path. Endpoints not listed here are never cached
+DEFAULT_TTLS = {
+    'transaction/detail': FOREVER,
+    'transaction/actions': FOREVER,
+    'block/detail': FOREVER,
+    'token/meta': 3600,
+    'token/price': 5,
+    'token/market/info': 5,
+}
+
+MISS = object()
+
+
+def canonical_url(url, params=None):
+    """
+    Build one canonical form of a request so that the same query written in a different parameter order maps to
+    the same cache entry. Keys are sorted, repeated keys such as block_time[] keep their relative order
+    """
+    scheme, netloc, path, query, _ = urlsplit(url)
+    pairs = parse_qsl(query, keep_blank_values=True)
+    if params:
+        pairs.extend((key, str(value)) for key, value in params.items())
+    pairs.sort(key=lambda pair: pair[0])
+    return urlunsplit((scheme, netloc, path, urlencode(pairs), ''))
+
+
+class LRUCache:
+    def __init__(self, maxsize: int = 10000):
+        """
+        Bounded in-memory cache backend. Least recently used entries are evicted first
+
+        Args:
+            maxsize (int): Maximum number of entries
+        """
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return MISS
+            expires, value = entry
+            if expires < time.time():
+                del self._data[key]
+                return MISS
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._data[key] = (time.time() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class DiskCache:
+    def __init__(self, path: str, max_bytes: int = 1 << 30, compress_level: int = 6):
+        """
+        Persistent cache backend stored in SQLite. Entries survive restarts, and the database can be shared by
+        several processes on one host (WAL mode, one connection per thread and process). Payloads are stored
+        zlib-compressed, least recently used entries are evicted once the stored payloads exceed max_bytes
+
+        Args:
+            path (str): Path of the SQLite database file, created if missing
+
+            max_bytes (int): Maximum total size of compressed payloads
+
+            compress_level (int): zlib compression level, 1 (fast) to 9 (small)
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.compress_level = compress_level
+        self._local = threading.local()
+        self._writes = 0
+        with self._connect() as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value BLOB NOT NULL, '
+                         'expires REAL, size INTEGER NOT NULL, accessed REAL NOT NULL)')
+            conn.execute('CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)')
+
+    def _connect(self):
+        # A lost cache write after a power cut is harmless, so skip the fsync on every commit
+        return _sqlite_connect(self._local, self.path, 'synchronous=NORMAL')
+
+    def get(self, key):
+        conn = self._connect()
+        row = conn.execute('SELECT value, expires FROM entries WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return MISS
+        value, expires = row
+        now = time.time()
+        if expires is not None and expires < now:
+            conn.execute('DELETE FROM entries WHERE key = ?', (key,))
+            return MISS
+        conn.execute('UPDATE entries SET accessed = ? WHERE key = ?', (now, key))
+        return json.loads(zlib.decompress(value))
+
+    def set(self, key, value, ttl):
+        payload = zlib.compress(json.dumps(value, separators=(',', ':')).encode(), self.compress_level)
+        now = time.time()
+        expires = None if ttl == FOREVER else now + ttl
+        conn = self._connect()
+        conn.execute('INSERT OR REPLACE INTO entries (key, value, expires, size, accessed) VALUES (?, ?, ?, ?, ?)',
+                     (key, payload, expires, len(payload), now))
+        self._writes += 1
+        if self._writes % 64 == 0:
+            self.evict()
+
+    def evict(self):
+        """
+        Drop expired entries, then the least recently used ones until the cache fits into max_bytes
+        """
+        conn = self._connect()
+        conn.execute('DELETE FROM entries WHERE expires IS NOT NULL AND expires < ?', (time.time(),))
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        freed = 0
+        keys = []
+        for key, size in conn.execute('SELECT key, size FROM entries ORDER BY accessed'):
+            keys.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        conn.executemany('DELETE FROM entries WHERE key = ?', keys)
+
+    def clear(self):
+        self._connect().execute('DELETE FROM entries')
+
+    def __len__(self):
+        return self._connect().execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+
+class ResponseCache:
+    def __init__(self, backend=None, ttls: dict[str, float] | None = None):
+        """
+        Response cache plugged into Transport and AsyncTransport. Cached responses are shared between callers,
+        treat them as read-only
+
+        Args:
+            backend: Storage with get(key) -> value or MISS and set(key, value, ttl) methods, such as LRUCache or
+            DiskCache. Defaults to LRUCache()
+
+            ttls (dict[str, float] | None): TTL in seconds per endpoint path, merged over DEFAULT_TTLS.
+            Use FOREVER for finalized data and 0 to disable caching of an endpoint
+        """
+        self.backend = backend if backend is not None else LRUCache()
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def ttl(self, url):
+        return self.ttls.get(_endpoint_name(url), 0)
+
+    def get(self, url, params=None):
+        if not self.ttl(url):
+            return MISS
+        value = self.backend.get(canonical_url(url, params))
+        with self._lock:
+            if value is MISS:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, url, value, params=None):
+        ttl = self.ttl(url)
+        # Don't keep API-level errors around
+        if ttl and not (isinstance(value, dict) and value.get('success') is False):
+            self.backend.set(canonical_url(url, params), value, ttl)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
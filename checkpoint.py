@@ -0,0 +1,202 @@
+import hashlib
+import json
+import threading
+import time
+
+from pagination import _page_items
+from utils import _sqlite_connect
+
+
+def row_key(row) -> str:
+    """
+    Identity of a row: its signature plus instruction index fields when the endpoint returns them, otherwise a
+    digest of the whole row
+    """
+    if not isinstance(row, dict):
+        row = row.to_dict()
+    signature = row.get('trans_id') or row.get('tx_hash') or row.get('signature')
+    index = [row[name] for name in ('ins_index', 'outer_ins_index', 'index') if row.get(name) is not None]
+    if signature and index:
+        return f'{signature}:' + ':'.join(map(str, index))
+    return hashlib.sha1(json.dumps(row, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class CheckpointStore:
+    def __init__(self, path: str):
+        """
+        Local SQLite store for crawl cursors and the keys of rows already delivered. Safe to use from several
+        threads and processes on one host
+
+        Args:
+            path (str): Path of the SQLite database file, created if missing
+        """
+        self.path = path
+        self._local = threading.local()
+        conn = self._connect()
+        conn.execute('CREATE TABLE IF NOT EXISTS checkpoints (name TEXT PRIMARY KEY, state TEXT NOT NULL, '
+                     'updated REAL NOT NULL)')
+        conn.execute('CREATE TABLE IF NOT EXISTS seen (name TEXT NOT NULL, key TEXT NOT NULL, '
+                     'PRIMARY KEY (name, key)) WITHOUT ROWID')
+
+    def _connect(self):
+        return _sqlite_connect(self._local, self.path)
+
+    def get(self, name: str) -> dict | None:
+        row = self._connect().execute('SELECT state FROM checkpoints WHERE name = ?', (name,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def unseen(self, name: str, keys: list[str]) -> set[str]:
+        """
+        Return the subset of keys that were not committed yet
+        """
+        conn = self._connect()
+        seen = set()
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            query = f'SELECT key FROM seen WHERE name = ? AND key IN ({",".join("?" * len(chunk))})'
+            seen.update(key for key, in conn.execute(query, (name, *chunk)))
+        return set(keys) - seen
+
+    def commit(self, name: str, state: dict, keys=()):
+        """
+        Atomically save the cursor state together with the keys of the rows delivered in this batch
+        """
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute('INSERT OR REPLACE INTO checkpoints (name, state, updated) VALUES (?, ?, ?)',
+                         (name, json.dumps(state), time.time()))
+            conn.executemany('INSERT OR IGNORE INTO seen (name, key) VALUES (?, ?)', ((name, key) for key in keys))
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+
+    def reset(self, name: str):
+        conn = self._connect()
+        conn.execute('DELETE FROM checkpoints WHERE name = ?', (name,))
+        conn.execute('DELETE FROM seen WHERE name = ?', (name,))
+
+
+class CheckpointedCrawl:
+    def __init__(self, store: CheckpointStore, name: str, fetch, cursor: str = 'page', page_size: int = 100,
+                 start: int | None = None, stop: int | None = None, max_page: int = 50, key=row_key):
+        """
+        Crawl runner that persists its cursor after every committed batch and resumes there after a restart.
+        Rows of committed batches are never delivered again because their keys are stored with the cursor.
+        run(sink) commits each batch as soon as the sink returns, so only a crash between the two re-delivers a
+        batch. Iterating is at-least-once: a yielded batch is committed only when the next one is requested,
+        so stopping or crashing while handling a batch delivers it again on the next run
+
+        Usage:
+            crawl = CheckpointedCrawl(store, 'usdc-transfers', partial(api.token.transfer, mint))
+            crawl.run(sink.write)
+
+        Args:
+            store (CheckpointStore): Where cursor state and delivered keys are kept
+
+            name (str): Unique name of this crawl in the store
+
+            fetch (callable): Endpoint to crawl. It receives page/page_size for cursor='page', before/limit for
+            cursor='before' and block_time/page/page_size/sort_by/sort_order for cursor='block_time'
+
+            cursor (str): 'page' for page numbers, 'before' for the signature cursor of
+            AccountAPIV2.transactions, 'block_time' for an ascending block_time watermark
+
+            page_size (int): Items per request (limit for cursor='before')
+
+            start (int | None): First block_time for cursor='block_time'
+
+            stop (int | None): Last block_time for cursor='block_time', defaults to now
+
+            max_page (int): For cursor='block_time', page depth after which the watermark is moved forward and
+            paging starts again from page 1, so deep pages are never requested
+
+            key (callable): Row identity used for de-duplication
+        """
+        if cursor not in ('page', 'before', 'block_time'):
+            raise ValueError('cursor must be "page", "before" or "block_time"')
+        self.store = store
+        self.name = name
+        self.fetch = fetch
+        self.cursor = cursor
+        self.page_size = page_size
+        self.start = start or 0
+        self.stop = stop
+        self.max_page = max_page
+        self.key = key
+
+    def _initial_state(self):
+        if self.cursor == 'page':
+            return {'page': 1, 'done': False}
+        if self.cursor == 'before':
+            return {'before': None, 'done': False}
+        return {'block_time': self.start, 'page': 1, 'done': False}
+
+    def _fetch(self, state):
+        if self.cursor == 'page':
+            return _page_items(self.fetch(page=state['page'], page_size=self.page_size))
+        if self.cursor == 'before':
+            return _page_items(self.fetch(before=state['before'], limit=self.page_size))
+        stop = self.stop if self.stop is not None else int(time.time())
+        return _page_items(self.fetch(block_time=[state['block_time'], stop], page=state['page'],
+                                      page_size=self.page_size, sort_by='block_time', sort_order='asc'))
+
+    def _advance(self, state, rows):
+        state = dict(state)
+        if len(rows) < self.page_size:
+            state['done'] = True
+        elif self.cursor == 'page':
+            state['page'] += 1
+        elif self.cursor == 'before':
+            state['before'] = rows[-1]['tx_hash'] if isinstance(rows[-1], dict) else rows[-1].tx_hash
+        else:
+            last = rows[-1]
+            last_time = last['block_time'] if isinstance(last, dict) else last.block_time
+            if state['page'] >= self.max_page and last_time > state['block_time']:
+                # Restart from the last second seen; rows of that second come back and are dropped by key
+                state['block_time'] = last_time
+                state['page'] = 1
+            else:
+                state['page'] += 1
+        return state
+
+    @property
+    def state(self) -> dict:
+        return self.store.get(self.name) or self._initial_state()
+
+    def _steps(self):
+        """
+        Yield (new rows, state after this page, keys of the page) until the crawl is done
+        """
+        state = self.state
+        while not state['done']:
+            rows = self._fetch(state)
+            keys = [self.key(row) for row in rows]
+            fresh = self.store.unseen(self.name, keys)
+            batch = []
+            for row, key in zip(rows, keys):
+                if key in fresh:
+                    fresh.discard(key)
+                    batch.append(row)
+            state = self._advance(state, rows)
+            yield batch, state, keys
+
+    def run(self, sink) -> int:
+        """
+        Deliver every new batch to sink(batch) and commit it as soon as the sink returns. A sink that raises
+        leaves its batch uncommitted, so the next run delivers it again. Returns the number of rows delivered
+        """
+        delivered = 0
+        for batch, state, keys in self._steps():
+            if batch:
+                sink(batch)
+                delivered += len(batch)
+            self.store.commit(self.name, state, keys)
+        return delivered
+
+    def __iter__(self):
+        for batch, state, keys in self._steps():
+            if batch:
+                yield batch
+            self.store.commit(self.name, state, keys)
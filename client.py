@@ -1,3 +1,20 @@
+from collections.abc import Iterable
+from functools import partial
+
+from bulk import iter_bulk, bulk
+from columnar import to_table, TRANSFER_SCHEMA, BALANCE_CHANGE_SCHEMA, DEFI_ACTIVITY_SCHEMA, NFT_ACTIVITY_SCHEMA
+from endpoints import (ACCOUNT_DEFI_ACTIVITIES, ACCOUNT_TRANSFER, ACCOUNT_TOKEN_ACCOUNTS, ACCOUNT_BALANCE_CHANGE,
+                       ACCOUNT_TRANSACTIONS, ACCOUNT_STAKE, ACCOUNT_DETAIL, ACCOUNT_REWARDS_EXPORT,
+                       ACCOUNT_TRANSFER_EXPORT, TOKEN_META, TOKEN_MARKETS, TOKEN_MARKET_INFO, TOKEN_TRANSFER,
+                       TOKEN_DEFI_ACTIVITIES, TOKEN_LIST, TOKEN_MARKET_VOLUME, TOKEN_TRENDING, TOKEN_PRICE,
+                       TOKEN_HOLDERS, TOKEN_TOP, NFT_NEWS, NFT_ACTIVITIES, NFT_COLLECTION_LISTS, NFT_COLLECTION_ITEMS,
+                       TRANSACTION_LAST, TRANSACTION_DETAIL, TRANSACTION_ACTIONS, BLOCK_LAST, BLOCK_TRANSACTIONS,
+                       BLOCK_DETAIL, MONITOR_USAGE)
+from enrich import iter_enriched
+from keys import KeyPool
+from models import Transfer, BalanceChange, DefiActivity, TokenHolder, NFTActivity, decode_records
+from pagination import iter_pages, iter_before
+from transport import Transport
 from utils import _make_get_request
 
 
@@ -12,59 +29,95 @@ class PublicAPI:
 
 
 class APIV2:
-    def __init__(self, api_key):
+    _iter_pages = staticmethod(iter_pages)
+    _iter_before = staticmethod(iter_before)
+    _iter_bulk = staticmethod(iter_bulk)
+    _bulk = staticmethod(bulk)
+    _to_table = staticmethod(to_table)
+    _iter_enriched = staticmethod(iter_enriched)
+
+    def __init__(self, api_key: str | KeyPool, transport: Transport | None = None, typed: bool = False):
+        """
+        Args:
+            api_key (str | KeyPool): PRO API key, or a KeyPool to spread requests over several keys
+
+            transport (Transport | None): Shared HTTP transport. A default pooled Transport is created if omitted
+
+            typed (bool): Return rows of transfer, balance_change_activities, defi_activities, holders and
+            NFT activities as slotted records from models.py instead of dicts
+        """
         self.url = 'https://pro-api.solscan.io/v2.0/'
-        self.headers = {"token": api_key}
         self._api_key = api_key
+        # One pooled transport is handed down to every sub-client so they all reuse the same connections
+        self._transport = transport if transport is not None else Transport()
+        if isinstance(api_key, KeyPool):
+            # The transport puts a key from the pool on every request
+            self.headers = {}
+            if self._transport.key_pool is None:
+                self._transport.key_pool = api_key
+        else:
+            self.headers = {"token": api_key}
+        self.typed = typed
+
+    def _get(self, method_url, model=None):
+        response = self._transport.get(method_url, self.headers)
+        if model is not None and self.typed:
+            return decode_records(response, model)
+        return response
+
+    def close(self):
+        self._transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
 
     @property
     def token(self) -> "TokenAPIV2":
         """Возвращает объект TokenAPIV2."""
         if not hasattr(self, "_token"):
-            self._token = TokenAPIV2(self._api_key)
+            self._token = TokenAPIV2(self._api_key, self._transport, self.typed)
         return self._token
 
     @property
     def account(self) -> "AccountAPIV2":
         """Возвращает объект AccountAPIV2."""
         if not hasattr(self, "_account"):
-            self._account = AccountAPIV2(self._api_key)
+            self._account = AccountAPIV2(self._api_key, self._transport, self.typed)
         return self._account
 
     @property
     def nft(self) -> "NFTAPIV2":
         """Возвращает объект NFTAPIV2."""
         if not hasattr(self, "_nft"):
-            self._nft = NFTAPIV2(self._api_key)
+            self._nft = NFTAPIV2(self._api_key, self._transport, self.typed)
         return self._nft
 
     @property
     def transaction(self) -> "TransactionAPIV2":
         """Возвращает объект TransactionAPIV2."""
         if not hasattr(self, "_transaction"):
-            self._transaction = TransactionAPIV2(self._api_key)
+            self._transaction = TransactionAPIV2(self._api_key, self._transport, self.typed)
         return self._transaction
 
     @property
     def block(self) -> "BlockAPIV2":
         """Возвращает объект BlockAPIV2."""
         if not hasattr(self, "_block"):
-            self._block = BlockAPIV2(self._api_key)
+            self._block = BlockAPIV2(self._api_key, self._transport, self.typed)
         return self._block
 
     @property
     def monitoring(self) -> "MonitoringAPIV2":
         """Возвращает объект MonitoringAPIV2."""
         if not hasattr(self, "_monitoring"):
-            self._monitoring = MonitoringAPIV2(self._api_key)
+            self._monitoring = MonitoringAPIV2(self._api_key, self._transport, self.typed)
         return self._monitoring
 
 
 class AccountAPIV2(APIV2):
-    def __init__(self, api_key):
-        super().__init__(api_key)
-        self.url_module = self.url + 'account/'
-
     def defi_activities(self, address: str, activity_type: list[str] | None = None, from_: str | None = None,
                         platform: list[str] | None = None, source: list[str] | None = None, token: str | None = None,
                         block_time: list[int] | None = None, page: int | None = None, page_size: int | None = None,
@@ -100,62 +153,9 @@ class AccountAPIV2(APIV2):
             sort_order (str | None): The parameter allows you to specify the sort order. Possible values: (asc, desc)
 
         """
-        method_url = self.url_module + 'defi/activities?address=' + address
-        if isinstance(activity_type, list):
-            for i in range(0, len(activity_type)):
-                method_url = method_url + '&activity_type[]=' + activity_type[i]
-        elif activity_type is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(from_, str):
-            method_url = method_url + '&from=' + from_
-        elif from_ is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(platform, list):
-            for i in range(0, len(platform)):
-                method_url = method_url + '&platform[]=' + platform[i]
-        elif platform is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(source, list):
-            for i in range(0, len(source)):
-                method_url = method_url + '&source[]=' + source[i]
-        elif source is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(token, str):
-            method_url = method_url + '&token=' + token
-        elif token is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(block_time, list):
-            for i in range(0, len(block_time)):
-                method_url = method_url + '&block_time[]=' + str(block_time[i])
-        elif block_time is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(page, int):
-            method_url = method_url + '&page=' + str(page)
-        elif page is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(page_size, int):
-            method_url = method_url + '&page_size=' + str(page_size)
-        elif page_size is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(sort_by, str):
-            method_url = method_url + '&sort_by=' + sort_by
-        elif sort_by is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(sort_order, str):
-            method_url = method_url + '&sort_order=' + sort_order
-        elif sort_order is not None:
-            raise TypeError('Wrong type for input args')
-
-        return _make_get_request(method_url, self.headers)
+        method_url = ACCOUNT_DEFI_ACTIVITIES.url(self.url, address, activity_type, from_, platform, source, token,
+                                                 block_time, page, page_size, sort_by, sort_order)
+        return self._get(method_url, DefiActivity)
 
     def transfer(self, address: str, activity_type: list[str] | None = None, token_account: str | None = None,
                  from_: str | None = None, to_: str | None = None, token: str | None = None,
@@ -198,76 +198,9 @@ class AccountAPIV2(APIV2):
 
             sort_order (str | None): The parameter allows you to specify the sort order. Possible values: (asc, desc)
         """
-        method_url = self.url_module + 'transfer?address=' + address
-        if isinstance(activity_type, list):
-            for i in range(0, len(activity_type)):
-                method_url = method_url + '&activity_type[]=' + activity_type[i]
-        elif activity_type is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(token_account, str):
-            method_url = method_url + '&token_account=' + token_account
-        elif token_account is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(from_, str):
-            method_url = method_url + '&from=' + from_
-        elif from_ is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(to_, str):
-            method_url = method_url + '&from=' + to_
-        elif to_ is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(token, str):
-            method_url = method_url + '&token=' + token
-        elif token is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(amount, list):
-            for i in range(0, len(amount)):
-                method_url = method_url + '&amount[]=' + str(amount[i])
-        elif amount is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(flow, str):
-            method_url = method_url + '&flow=' + flow
-        elif flow is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(exclude_amount_zero, bool):
-            method_url = method_url + '&exclude_amount_zero=' + str(exclude_amount_zero).lower()
-        elif exclude_amount_zero is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(block_time, list):
-            for i in range(0, len(block_time)):
-                method_url = method_url + '&block_time[]=' + str(block_time[i])
-        elif block_time is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(page, int):
-            method_url = method_url + '&page=' + str(page)
-        elif page is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(page_size, int):
-            method_url = method_url + '&page_size=' + str(page_size)
-        elif page_size is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(sort_by, str):
-            method_url = method_url + '&sort_by=' + sort_by
-        elif sort_by is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(sort_order, str):
-            method_url = method_url + '&sort_order=' + sort_order
-        elif sort_order is not None:
-            raise TypeError('Wrong type for input args')
-
-        return _make_get_request(method_url, self.headers)
+        method_url = ACCOUNT_TRANSFER.url(self.url, address, activity_type, token_account, from_, to_, token, amount,
+                                          exclude_amount_zero, flow, block_time, page, page_size, sort_by, sort_order)
+        return self._get(method_url, Transfer)
 
     def token_accounts(self, address: str, type: str, hide_zero: bool | None = None,
                   page: int | None = None, page_size: int | None = None):
@@ -285,24 +218,8 @@ class AccountAPIV2(APIV2):
 
             page_size (int | None): Number items per page. Possible values: (10, 20, 30, 40, 60, 100)
         """
-        method_url = self.url_module + 'token-accounts?address=' + address + '&type=' + type
-
-        if isinstance(hide_zero, bool):
-            method_url = method_url + '&hide_zero=' + str(hide_zero).lower()
-        elif hide_zero is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(page, int):
-            method_url = method_url + '&page=' + str(page)
-        elif page is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(page_size, int):
-            method_url = method_url + '&page_size=' + str(page_size)
-        elif page_size is not None:
-            raise TypeError('Wrong type for input args')
-
-        return _make_get_request(method_url, self.headers)
+        method_url = ACCOUNT_TOKEN_ACCOUNTS.url(self.url, address, type, hide_zero, page, page_size)
+        return self._get(method_url)
 
     def balance_change_activities(self, address: str, token: str | None = None, remove_spam: bool | None = None,
                  amount: list[int] | None = None, flow: str | None = None,
@@ -334,56 +251,9 @@ class AccountAPIV2(APIV2):
 
             sort_order (str | None): The parameter allows you to specify the sort order. Possible values: (asc, desc)
         """
-        method_url = self.url_module + 'balance_change?address=' + address
-
-        if isinstance(token, str):
-            method_url = method_url + '&token=' + token
-        elif token is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(amount, list):
-            for i in range(0, len(amount)):
-                method_url = method_url + '&amount[]=' + str(amount[i])
-        elif amount is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(flow, str):
-            method_url = method_url + '&flow=' + flow
-        elif flow is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(remove_spam, bool):
-            method_url = method_url + '&remove_spam=' + str(remove_spam).lower()
-        elif remove_spam is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(block_time, list):
-            for i in range(0, len(block_time)):
-                method_url = method_url + '&block_time[]=' + str(block_time[i])
-        elif block_time is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(page, int):
-            method_url = method_url + '&page=' + str(page)
-        elif page is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(page_size, int):
-            method_url = method_url + '&page_size=' + str(page_size)
-        elif page_size is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(sort_by, str):
-            method_url = method_url + '&sort_by=' + sort_by
-        elif sort_by is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(sort_order, str):
-            method_url = method_url + '&sort_order=' + sort_order
-        elif sort_order is not None:
-            raise TypeError('Wrong type for input args')
-
-        return _make_get_request(method_url, self.headers)
+        method_url = ACCOUNT_BALANCE_CHANGE.url(self.url, address, token, remove_spam, amount, flow, block_time, page,
+                                                page_size, sort_by, sort_order)
+        return self._get(method_url, BalanceChange)
 
     def transactions(self, address: str, before: str | None = None, limit: int | None = None):
         """
@@ -396,19 +266,8 @@ class AccountAPIV2(APIV2):
 
             limit (int): The number of transactions should be returned. Enum: 10, 20, 30, 40
         """
-        method_url = self.url_module + 'transactions?address=' + address
-
-        if isinstance(before, str):
-            method_url = method_url + '&before=' + before
-        elif before is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(limit, int):
-            method_url = method_url + '&limit=' + str(limit)
-        elif limit is not None:
-            raise TypeError('Wrong type for input args')
-
-        return _make_get_request(method_url, self.headers)
+        method_url = ACCOUNT_TRANSACTIONS.url(self.url, address, before, limit)
+        return self._get(method_url)
 
     def stake(self, address: str, page: int | None = None, page_size: int | None = None):
         """
@@ -421,19 +280,8 @@ class AccountAPIV2(APIV2):
 
             page_size (int | None): Number items per page. Enum: 10, 20, 30, 40
         """
-        method_url = self.url_module + 'stake?address=' + address
-
-        if isinstance(page, int):
-            method_url = method_url + '&page=' + str(page)
-        elif page is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(page_size, int):
-            method_url = method_url + '&page_size=' + str(page_size)
-        elif page_size is not None:
-            raise TypeError('Wrong type for input args')
-
-        return _make_get_request(method_url, self.headers)
+        method_url = ACCOUNT_STAKE.url(self.url, address, page, page_size)
+        return self._get(method_url)
 
     def detail(self, address: str):
         """
@@ -442,8 +290,8 @@ class AccountAPIV2(APIV2):
         Args:
             address (str): address of an account (required).
         """
-        method_url = self.url_module + 'detail?address=' + address
-        return _make_get_request(method_url, self.headers)
+        method_url = ACCOUNT_DETAIL.url(self.url, address)
+        return self._get(method_url)
 
     def rewards_export(self, address: str, time_from: int, time_to: int):
         """
@@ -456,9 +304,8 @@ class AccountAPIV2(APIV2):
 
             time_to (int): The end time for the export. Format: Unix time in seconds
         """
-        method_url = (self.url_module + 'reward/export?address=' + address +
-                      '&time_from=' + str(time_from) + '&time_to=' + str(time_to))
-        return _make_get_request(method_url, self.headers)
+        method_url = ACCOUNT_REWARDS_EXPORT.url(self.url, address, time_from, time_to)
+        return self._get(method_url)
 
     def transfer_export(self, address: str, activity_type: list[str] | None = None, token_account: str | None = None,
                  from_: str | None = None, to_: str | None = None, token: str | None = None,
@@ -489,63 +336,91 @@ class AccountAPIV2(APIV2):
             block_time (list[int] | None): Used when you want to filter data by block time.
             Format time: UnixTime in seconds. [timestamp_start, timestamp_stop]
         """
-        method_url = self.url_module + 'transfer?address=' + address
-        if isinstance(activity_type, list):
-            for i in range(0, len(activity_type)):
-                method_url = method_url + '&activity_type[]=' + activity_type[i]
-        elif activity_type is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(token_account, str):
-            method_url = method_url + '&token_account=' + token_account
-        elif token_account is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(from_, str):
-            method_url = method_url + '&from=' + from_
-        elif from_ is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(to_, str):
-            method_url = method_url + '&from=' + to_
-        elif to_ is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(token, str):
-            method_url = method_url + '&token=' + token
-        elif token is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(amount, list):
-            for i in range(0, len(amount)):
-                method_url = method_url + '&amount[]=' + str(amount[i])
-        elif amount is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(flow, str):
-            method_url = method_url + '&flow=' + flow
-        elif flow is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(exclude_amount_zero, bool):
-            method_url = method_url + '&exclude_amount_zero=' + str(exclude_amount_zero).lower()
-        elif exclude_amount_zero is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(block_time, list):
-            for i in range(0, len(block_time)):
-                method_url = method_url + '&block_time[]=' + str(block_time[i])
-        elif block_time is not None:
-            raise TypeError('Wrong type for input args')
+        method_url = ACCOUNT_TRANSFER_EXPORT.url(self.url, address, activity_type, token_account, from_, to_, token,
+                                                 amount, exclude_amount_zero, flow, block_time)
+        return self._get(method_url)
 
-        return _make_get_request(method_url, self.headers)
+    def iter_defi_activities(self, address: str, page: int = 1, page_size: int = 100, prefetch: int = 0, **filters):
+        """
+        Iterate over defi activities of an account record by record, fetching pages lazily until the last one.
+        Accepts the same filters as defi_activities(). prefetch > 0 fetches that many pages ahead concurrently
+        """
+        return self._iter_pages(partial(self.defi_activities, address, **filters), page, page_size, prefetch)
 
+    def iter_transfer(self, address: str, page: int = 1, page_size: int = 100, prefetch: int = 0, **filters):
+        """
+        Iterate over transfers of an account record by record, fetching pages lazily until the last one.
+        Accepts the same filters as transfer(). prefetch > 0 fetches that many pages ahead concurrently
+        """
+        return self._iter_pages(partial(self.transfer, address, **filters), page, page_size, prefetch)
 
-class TokenAPIV2(APIV2):
-    def __init__(self, api_key):
-        super().__init__(api_key)
-        self.url_module = self.url + 'token/'
+    def iter_token_accounts(self, address: str, type: str, page: int = 1, page_size: int = 100, prefetch: int = 0, **filters):
+        """
+        Iterate over token accounts of an account record by record, fetching pages lazily until the last one.
+        Accepts the same filters as token_accounts(). prefetch > 0 fetches that many pages ahead concurrently
+        """
+        return self._iter_pages(partial(self.token_accounts, address, type, **filters), page, page_size, prefetch)
+
+    def iter_balance_change_activities(self, address: str, page: int = 1, page_size: int = 100, prefetch: int = 0, **filters):
+        """
+        Iterate over balance change activities of an account record by record, fetching pages lazily until the last one.
+        Accepts the same filters as balance_change_activities(). prefetch > 0 fetches that many pages ahead concurrently
+        """
+        return self._iter_pages(partial(self.balance_change_activities, address, **filters), page, page_size, prefetch)
+
+    def iter_transactions(self, address: str, before: str | None = None, limit: int = 40):
+        """
+        Iterate over transactions of an account record by record, fetching pages lazily until the last one.
+        Follows the `before` signature cursor of transactions()
+        """
+        return self._iter_before(partial(self.transactions, address), before, limit)
+
+    def iter_stake(self, address: str, page: int = 1, page_size: int = 40, prefetch: int = 0, **filters):
+        """
+        Iterate over stake accounts of an account record by record, fetching pages lazily until the last one.
+        Accepts the same filters as stake(). prefetch > 0 fetches that many pages ahead concurrently
+        """
+        return self._iter_pages(partial(self.stake, address, **filters), page, page_size, prefetch)
 
+    def bulk_detail(self, addresses: Iterable[str], max_workers: int = 16):
+        """
+        Get the details of many addresses concurrently. Returns a mapping from address to response, or to the
+        exception raised for that address
+        """
+        return self._bulk(self.detail, addresses, max_workers)
+
+    def iter_bulk_detail(self, addresses: Iterable[str], max_workers: int = 16):
+        """
+        Same as bulk_detail, but yields (address, response or exception) pairs as soon as each one completes
+        """
+        return self._iter_bulk(self.detail, addresses, max_workers)
+
+    def transfer_table(self, address: str, backend: str = 'numpy', page_size: int = 100, prefetch: int = 0, **filters):
+        """
+        Stream all transfers of an account into one columnar table: {column: numpy array} for backend='numpy' or a
+        pyarrow.Table for backend='arrow'. Accepts the same filters as transfer()
+        """
+        rows = self.iter_transfer(address, page_size=page_size, prefetch=prefetch, **filters)
+        return self._to_table(rows, TRANSFER_SCHEMA, backend)
+
+    def balance_change_table(self, address: str, backend: str = 'numpy', page_size: int = 100, prefetch: int = 0, **filters):
+        """
+        Stream all balance change activities of an account into one columnar table: {column: numpy array} for backend='numpy' or a
+        pyarrow.Table for backend='arrow'. Accepts the same filters as balance_change_activities()
+        """
+        rows = self.iter_balance_change_activities(address, page_size=page_size, prefetch=prefetch, **filters)
+        return self._to_table(rows, BALANCE_CHANGE_SCHEMA, backend)
+
+    def defi_activities_table(self, address: str, backend: str = 'numpy', page_size: int = 100, prefetch: int = 0, **filters):
+        """
+        Stream all defi activities of an account into one columnar table: {column: numpy array} for backend='numpy' or a
+        pyarrow.Table for backend='arrow'. Accepts the same filters as defi_activities()
+        """
+        rows = self.iter_defi_activities(address, page_size=page_size, prefetch=prefetch, **filters)
+        return self._to_table(rows, DEFI_ACTIVITY_SCHEMA, backend)
+
+
+class TokenAPIV2(APIV2):
     def meta(self, address: str):
         """
         Get the metadata of a token
@@ -553,8 +428,8 @@ class TokenAPIV2(APIV2):
         Args:
             address (str): address of an account (required).
         """
-        method_url = self.url_module + 'meta?address=' + address
-        return _make_get_request(method_url, self.headers)
+        method_url = TOKEN_META.url(self.url, address)
+        return self._get(method_url)
 
     def markets(self, token: list[str], sort_by: str | None = None, program: list[str] | None = None,
                 page: int | None = None, page_size: int | None = 100):
@@ -573,37 +448,8 @@ class TokenAPIV2(APIV2):
             sort_by (str | None): The parameter allows you to specify the field by which the returned list will be sorted.
             Now only 'block_time' is supported.
         """
-        method_url = self.url_module + 'markets?token[]='
-
-        if isinstance(token, list):
-            method_url = method_url + token[0]
-            for i in range(1, len(token)):
-                method_url = method_url + '&token[]=' + token[i]
-        elif token is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(sort_by, str):
-            method_url = method_url + '&sort_by=' + sort_by
-        elif sort_by is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(program, list):
-            for i in range(0, len(program)):
-                method_url = method_url + '&program[]=' + program[i]
-        elif program is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(page, int):
-            method_url = method_url + '&page=' + str(page)
-        elif page is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(page_size, int):
-            method_url = method_url + '&page_size=' + str(page_size)
-        elif page_size is not None:
-            raise TypeError('Wrong type for input args')
-
-        return _make_get_request(method_url, self.headers)
+        method_url = TOKEN_MARKETS.url(self.url, token, sort_by, program, page, page_size)
+        return self._get(method_url)
 
     def market_info(self, address: str):
         """
@@ -612,13 +458,14 @@ class TokenAPIV2(APIV2):
         Args:
             address (str): address of an account (required).
         """
-        method_url = self.url_module + 'market/info?address=' + address
-        return _make_get_request(method_url, self.headers)
+        method_url = TOKEN_MARKET_INFO.url(self.url, address)
+        return self._get(method_url)
 
     def transfer(self, address: str, activity_type: list[str] | None = None, token_account: str | None = None,
                  from_: str | None = None, to_: str | None = None, token: str | None = None,
                  amount: list[int] | None = None, exclude_amount_zero: bool | None = None, flow: str | None = None,
-                 block_time: list[int] | None = None, sort_by: str | None = None, sort_order: str | None = None):
+                 block_time: list[int] | None = None, page: int | None = None, page_size: int | None = None,
+                 sort_by: str | None = None, sort_order: str | None = None):
         """
         Get transfer data of a token
 
@@ -644,71 +491,18 @@ class TokenAPIV2(APIV2):
             block_time (list[int] | None): Used when you want to filter data by block time.
             Format time: UnixTime in seconds. [timestamp_start, timestamp_stop]
 
+            page (int | None): Page number for pagination
+
+            page_size (int | None): Number items per page. Possible values: (10, 20, 30, 40, 60, 100)
+
             sort_by (str | None): The parameter allows you to specify the field by which the returned list will be sorted.
             Now only 'block_time' is supported.
 
             sort_order (str | None): The parameter allows you to specify the sort order. Possible values: (asc, desc)
         """
-        method_url = self.url_module + 'transfer?address=' + address
-        if isinstance(activity_type, list):
-            for i in range(0, len(activity_type)):
-                method_url = method_url + '&activity_type[]=' + activity_type[i]
-        elif activity_type is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(token_account, str):
-            method_url = method_url + '&token_account=' + token_account
-        elif token_account is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(from_, str):
-            method_url = method_url + '&from=' + from_
-        elif from_ is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(to_, str):
-            method_url = method_url + '&from=' + to_
-        elif to_ is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(token, str):
-            method_url = method_url + '&token=' + token
-        elif token is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(amount, list):
-            for i in range(0, len(amount)):
-                method_url = method_url + '&amount[]=' + str(amount[i])
-        elif amount is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(flow, str):
-            method_url = method_url + '&flow=' + flow
-        elif flow is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(exclude_amount_zero, bool):
-            method_url = method_url + '&exclude_amount_zero=' + str(exclude_amount_zero).lower()
-        elif exclude_amount_zero is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(block_time, list):
-            for i in range(0, len(block_time)):
-                method_url = method_url + '&block_time[]=' + str(block_time[i])
-        elif block_time is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(sort_by, str):
-            method_url = method_url + '&sort_by=' + sort_by
-        elif sort_by is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(sort_order, str):
-            method_url = method_url + '&sort_order=' + sort_order
-        elif sort_order is not None:
-            raise TypeError('Wrong type for input args')
-
-        return _make_get_request(method_url, self.headers)
+        method_url = TOKEN_TRANSFER.url(self.url, address, activity_type, token_account, from_, to_, token, amount,
+                                        exclude_amount_zero, flow, block_time, page, page_size, sort_by, sort_order)
+        return self._get(method_url)
 
     def defi_activities(self, address: str, activity_type: list[str] | None = None, from_: str | None = None,
                         platform: list[str] | None = None, source: list[str] | None = None, token: str | None = None,
@@ -744,62 +538,9 @@ class TokenAPIV2(APIV2):
 
             sort_order (str | None): The parameter allows you to specify the sort order. Possible values: (asc, desc)
         """
-        method_url = self.url_module + 'defi/activities?address=' + address
-        if isinstance(activity_type, list):
-            for i in range(0, len(activity_type)):
-                method_url = method_url + '&activity_type[]=' + activity_type[i]
-        elif activity_type is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(from_, str):
-            method_url = method_url + '&from=' + from_
-        elif from_ is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(platform, list):
-            for i in range(0, len(platform)):
-                method_url = method_url + '&platform[]=' + platform[i]
-        elif platform is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(source, list):
-            for i in range(0, len(source)):
-                method_url = method_url + '&source[]=' + source[i]
-        elif source is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(token, str):
-            method_url = method_url + '&token=' + token
-        elif token is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(block_time, list):
-            for i in range(0, len(block_time)):
-                method_url = method_url + '&block_time[]=' + str(block_time[i])
-        elif block_time is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(page, int):
-            method_url = method_url + '&page=' + str(page)
-        elif page is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(page_size, int):
-            method_url = method_url + '&page_size=' + str(page_size)
-        elif page_size is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(sort_by, str):
-            method_url = method_url + '&sort_by=' + sort_by
-        elif sort_by is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(sort_order, str):
-            method_url = method_url + '&sort_order=' + sort_order
-        elif sort_order is not None:
-            raise TypeError('Wrong type for input args')
-
-        return _make_get_request(method_url, self.headers)
+        method_url = TOKEN_DEFI_ACTIVITIES.url(self.url, address, activity_type, from_, platform, source, token,
+                                               block_time, page, page_size, sort_by, sort_order)
+        return self._get(method_url)
 
     def token_list(self, page: int = 1, page_size: int | None = None,
                         sort_by: str | None = None, sort_order: str | None = None):
@@ -816,24 +557,8 @@ class TokenAPIV2(APIV2):
 
             sort_order (str | None): The parameter allows you to specify the sort order. Possible values: (asc, desc)
         """
-        method_url = self.url_module + 'list?page=' + str(page)
-
-        if isinstance(page_size, int):
-            method_url = method_url + '&page_size=' + str(page_size)
-        elif page_size is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(sort_by, str):
-            method_url = method_url + '&sort_by=' + sort_by
-        elif sort_by is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(sort_order, str):
-            method_url = method_url + '&sort_order=' + sort_order
-        elif sort_order is not None:
-            raise TypeError('Wrong type for input args')
-
-        return _make_get_request(method_url, self.headers)
+        method_url = TOKEN_LIST.url(self.url, page, page_size, sort_by, sort_order)
+        return self._get(method_url)
 
     def market_volume(self, address: str, time: list[int] | None = None):
         """
@@ -844,15 +569,8 @@ class TokenAPIV2(APIV2):
 
             time (list[int]): Used when you want to filter data by time. Format time: YYYYMMDD. You need to pass array into http query to filter by start and end time. Example: ?time[]=20240701&time[]=20240715
         """
-        method_url = self.url_module + 'market/volume?address=' + address
-
-        if isinstance(time, list):
-            for i in range(0, len(time)):
-                method_url = method_url + '&time[]=' + str(time[i])
-        elif time is not None:
-            raise TypeError('Wrong type for input args')
-
-        return _make_get_request(method_url, self.headers)
+        method_url = TOKEN_MARKET_VOLUME.url(self.url, address, time)
+        return self._get(method_url)
 
     def trending(self, limit: int = 10):
         """
@@ -861,8 +579,8 @@ class TokenAPIV2(APIV2):
         Args:
             limit(int): Number items should be returned
         """
-        method_url = self.url_module + 'trending?limit=' + str(limit)
-        return _make_get_request(method_url, self.headers)
+        method_url = TOKEN_TRENDING.url(self.url, limit)
+        return self._get(method_url)
 
     def token_price(self, address: str, time: list[int] | None = None):
         """
@@ -873,15 +591,8 @@ class TokenAPIV2(APIV2):
 
             time (list[int]): Used when you want to filter data by time. Format time: YYYYMMDD. You need to pass array into http query to filter by start and end time. Example: ?time[]=20240701&time[]=20240715
         """
-        method_url = self.url_module + 'price?address=' + address
-
-        if isinstance(time, list):
-            for i in range(0, len(time)):
-                method_url = method_url + '&time[]=' + str(time[i])
-        elif time is not None:
-            raise TypeError('Wrong type for input args')
-
-        return _make_get_request(method_url, self.headers)
+        method_url = TOKEN_PRICE.url(self.url, address, time)
+        return self._get(method_url)
 
     def holders(self, address: str, page: int = 1, page_size: int | None = None,
                         from_amount: int | None = None, to_amount: int | None = None):
@@ -899,38 +610,109 @@ class TokenAPIV2(APIV2):
 
             to_amount (int | None): Filter holders by maximum token holding amount. The number should be in string format
         """
-        method_url = self.url_module + 'list?page=' + str(page)
+        method_url = TOKEN_HOLDERS.url(self.url, address, page, page_size, from_amount, to_amount)
+        return self._get(method_url, TokenHolder)
+
+    def top(self):
+        """
+        Get the list of top tokens
+        """
+        method_url = TOKEN_TOP.url(self.url)
+        return self._get(method_url)
 
-        if isinstance(page_size, int):
-            method_url = method_url + '&page_size=' + str(page_size)
-        elif page_size is not None:
-            raise TypeError('Wrong type for input args')
+    def iter_markets(self, token: list[str], page: int = 1, page_size: int = 100, prefetch: int = 0, **filters):
+        """
+        Iterate over markets of tokens record by record, fetching pages lazily until the last one.
+        Accepts the same filters as markets(). prefetch > 0 fetches that many pages ahead concurrently
+        """
+        return self._iter_pages(partial(self.markets, token, **filters), page, page_size, prefetch)
 
-        if isinstance(from_amount, int):
-            method_url = method_url + '&from_amount=' + str(from_amount)
-        elif from_amount is not None:
-            raise TypeError('Wrong type for input args')
+    def iter_transfer(self, address: str, page: int = 1, page_size: int = 100, prefetch: int = 0, **filters):
+        """
+        Iterate over transfers of a token record by record, fetching pages lazily until the last one.
+        Accepts the same filters as transfer(). prefetch > 0 fetches that many pages ahead concurrently
+        """
+        return self._iter_pages(partial(self.transfer, address, **filters), page, page_size, prefetch)
 
-        if isinstance(to_amount, int):
-            method_url = method_url + '&to_amount=' + str(to_amount)
-        elif to_amount is not None:
-            raise TypeError('Wrong type for input args')
+    def iter_defi_activities(self, address: str, page: int = 1, page_size: int = 100, prefetch: int = 0, **filters):
+        """
+        Iterate over defi activities of a token record by record, fetching pages lazily until the last one.
+        Accepts the same filters as defi_activities(). prefetch > 0 fetches that many pages ahead concurrently
+        """
+        return self._iter_pages(partial(self.defi_activities, address, **filters), page, page_size, prefetch)
 
-        return _make_get_request(method_url, self.headers)
+    def iter_token_list(self, page: int = 1, page_size: int = 100, prefetch: int = 0, **filters):
+        """
+        Iterate over the list of tokens record by record, fetching pages lazily until the last one.
+        Accepts the same filters as token_list(). prefetch > 0 fetches that many pages ahead concurrently
+        """
+        return self._iter_pages(partial(self.token_list, **filters), page, page_size, prefetch)
 
-    def top(self):
+    def iter_holders(self, address: str, page: int = 1, page_size: int = 40, prefetch: int = 0, **filters):
         """
-        Get the list of top tokens
+        Iterate over holders of a token record by record, fetching pages lazily until the last one.
+        Accepts the same filters as holders(). prefetch > 0 fetches that many pages ahead concurrently
         """
-        method_url = self.url_module + 'top'
-        return _make_get_request(method_url, self.headers)
+        return self._iter_pages(partial(self.holders, address, **filters), page, page_size, prefetch)
 
+    def bulk_meta(self, addresses: Iterable[str], max_workers: int = 16):
+        """
+        Get the metadata of many addresses concurrently. Returns a mapping from address to response, or to the
+        exception raised for that address
+        """
+        return self._bulk(self.meta, addresses, max_workers)
 
-class NFTAPIV2(APIV2):
-    def __init__(self, api_key):
-        super().__init__(api_key)
-        self.url_module = self.url + 'nft/'
+    def iter_bulk_meta(self, addresses: Iterable[str], max_workers: int = 16):
+        """
+        Same as bulk_meta, but yields (address, response or exception) pairs as soon as each one completes
+        """
+        return self._iter_bulk(self.meta, addresses, max_workers)
+
+    def bulk_market_info(self, addresses: Iterable[str], max_workers: int = 16):
+        """
+        Get the market info of many addresses concurrently. Returns a mapping from address to response, or to the
+        exception raised for that address
+        """
+        return self._bulk(self.market_info, addresses, max_workers)
 
+    def iter_bulk_market_info(self, addresses: Iterable[str], max_workers: int = 16):
+        """
+        Same as bulk_market_info, but yields (address, response or exception) pairs as soon as each one completes
+        """
+        return self._iter_bulk(self.market_info, addresses, max_workers)
+
+    def bulk_token_price(self, addresses: Iterable[str], time: list[int] | None = None, max_workers: int = 16):
+        """
+        Get the price of many addresses concurrently. Returns a mapping from address to response, or to the
+        exception raised for that address.
+        time filters every address like in token_price()
+        """
+        return self._bulk(partial(self.token_price, time=time), addresses, max_workers)
+
+    def iter_bulk_token_price(self, addresses: Iterable[str], time: list[int] | None = None, max_workers: int = 16):
+        """
+        Same as bulk_token_price, but yields (address, response or exception) pairs as soon as each one completes
+        """
+        return self._iter_bulk(partial(self.token_price, time=time), addresses, max_workers)
+
+    def transfer_table(self, address: str, backend: str = 'numpy', page_size: int = 100, prefetch: int = 0, **filters):
+        """
+        Stream all transfers of a token into one columnar table: {column: numpy array} for backend='numpy' or a
+        pyarrow.Table for backend='arrow'. Accepts the same filters as transfer()
+        """
+        rows = self.iter_transfer(address, page_size=page_size, prefetch=prefetch, **filters)
+        return self._to_table(rows, TRANSFER_SCHEMA, backend)
+
+    def defi_activities_table(self, address: str, backend: str = 'numpy', page_size: int = 100, prefetch: int = 0, **filters):
+        """
+        Stream all defi activities of a token into one columnar table: {column: numpy array} for backend='numpy' or a
+        pyarrow.Table for backend='arrow'. Accepts the same filters as defi_activities()
+        """
+        rows = self.iter_defi_activities(address, page_size=page_size, prefetch=prefetch, **filters)
+        return self._to_table(rows, DEFI_ACTIVITY_SCHEMA, backend)
+
+
+class NFTAPIV2(APIV2):
     def news(self, filter_: str = 'created_time', page: int = 1, page_size: int | None = None):
         """
         Get the list of tokens
@@ -942,19 +724,8 @@ class NFTAPIV2(APIV2):
 
             page_size (int | None): Number items per page. Enum: 12, 24, 36
         """
-        method_url = self.url_module + 'news?filter=' + filter_
-
-        if isinstance(page_size, int):
-            method_url = method_url + '&page_size=' + str(page_size)
-        elif page_size is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(page, int):
-            method_url = method_url + '&page=' + str(page)
-        elif page is not None:
-            raise TypeError('Wrong type for input args')
-
-        return _make_get_request(method_url, self.headers)
+        method_url = NFT_NEWS.url(self.url, filter_, page, page_size)
+        return self._get(method_url)
 
     def activities(self, activity_type: list[str] | None = None, from_: str | None = None, to_: str | None = None,
                         currency_token: str | None = None, collection: str | None = None,
@@ -990,64 +761,11 @@ class NFTAPIV2(APIV2):
 
             page_size (int | None): Number items per page. Enum: 10, 20, 30, 40, 60, 100
         """
-        method_url = self.url_module + 'activities?page=' + str(page)
-        if isinstance(activity_type, list):
-            for i in range(0, len(activity_type)):
-                method_url = method_url + '&activity_type[]=' + activity_type[i]
-        elif activity_type is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(from_, str):
-            method_url = method_url + '&from=' + from_
-        elif from_ is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(to_, str):
-            method_url = method_url + '&to_=' + to_
-        elif to_ is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(currency_token, str):
-            method_url = method_url + '&currency_token=' + currency_token
-        elif currency_token is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(price, list):
-            if not currency_token:
-                raise ValueError('Specify currency_token first before price')
-            for i in range(0, len(price)):
-                method_url = method_url + '&platform[]=' + str(price[i])
-        elif price is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(source, list):
-            for i in range(0, len(source)):
-                method_url = method_url + '&source[]=' + source[i]
-        elif source is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(collection, str):
-            method_url = method_url + '&collection=' + collection
-        elif collection is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(token, str):
-            method_url = method_url + '&token=' + token
-        elif token is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(block_time, list):
-            for i in range(0, len(block_time)):
-                method_url = method_url + '&block_time[]=' + str(block_time[i])
-        elif block_time is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(page_size, int):
-            method_url = method_url + '&page_size=' + str(page_size)
-        elif page_size is not None:
-            raise TypeError('Wrong type for input args')
-
-        return _make_get_request(method_url, self.headers)
+        if price is not None and not currency_token:
+            raise ValueError('Specify currency_token first before price')
+        method_url = NFT_ACTIVITIES.url(self.url, activity_type, from_, to_, currency_token, collection, price, source,
+                                        token, block_time, page, page_size)
+        return self._get(method_url, NFTActivity)
 
     def collection_lists(self, range_: int | None = 1, collection: str | None = None, page: int | None = 1,
                          page_size: int | None = None, sort_by: str | None = None, sort_order: str | None = None):
@@ -1067,34 +785,8 @@ class NFTAPIV2(APIV2):
 
             sort_order (str | None): The parameter allows you to specify the sort order. Possible values: (asc, desc)
         """
-        method_url = self.url_module + 'collection/lists?range=' + str(range_)
-
-        if isinstance(collection, str):
-            method_url = method_url + '&collection=' + collection
-        elif collection is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(page, int):
-            method_url = method_url + '&page=' + str(page)
-        elif page is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(page_size, int):
-            method_url = method_url + '&page_size=' + str(page_size)
-        elif page_size is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(sort_by, str):
-            method_url = method_url + '&sort_by=' + sort_by
-        elif sort_by is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(sort_order, str):
-            method_url = method_url + '&sort_order=' + sort_order
-        elif sort_order is not None:
-            raise TypeError('Wrong type for input args')
-
-        return _make_get_request(method_url, self.headers)
+        method_url = NFT_COLLECTION_LISTS.url(self.url, range_, collection, page, page_size, sort_by, sort_order)
+        return self._get(method_url)
 
     def collection_items(self, collection: str, page: int | None = 1, page_size: int | None = None,
                          sort_by: str | None = None):
@@ -1110,31 +802,47 @@ class NFTAPIV2(APIV2):
 
             sort_by (str | None): The parameter allows you to specify the field by which the returned list will be sorted. Enum: last_trade, listing_price
         """
-        method_url = self.url_module + 'collection/items?collection=' + collection
+        method_url = NFT_COLLECTION_ITEMS.url(self.url, collection, page, page_size, sort_by)
+        return self._get(method_url)
 
-        if isinstance(page, int):
-            method_url = method_url + '&page=' + str(page)
-        elif page is not None:
-            raise TypeError('Wrong type for input args')
+    def iter_news(self, page: int = 1, page_size: int = 36, prefetch: int = 0, **filters):
+        """
+        Iterate over new NFTs record by record, fetching pages lazily until the last one.
+        Accepts the same filters as news(). prefetch > 0 fetches that many pages ahead concurrently
+        """
+        return self._iter_pages(partial(self.news, **filters), page, page_size, prefetch)
 
-        if isinstance(page_size, int):
-            method_url = method_url + '&page_size=' + str(page_size)
-        elif page_size is not None:
-            raise TypeError('Wrong type for input args')
+    def iter_activities(self, page: int = 1, page_size: int = 100, prefetch: int = 0, **filters):
+        """
+        Iterate over NFT activities record by record, fetching pages lazily until the last one.
+        Accepts the same filters as activities(). prefetch > 0 fetches that many pages ahead concurrently
+        """
+        return self._iter_pages(partial(self.activities, **filters), page, page_size, prefetch)
 
-        if isinstance(sort_by, str):
-            method_url = method_url + '&sort_by=' + sort_by
-        elif sort_by is not None:
-            raise TypeError('Wrong type for input args')
+    def iter_collection_lists(self, page: int = 1, page_size: int = 40, prefetch: int = 0, **filters):
+        """
+        Iterate over NFT collections record by record, fetching pages lazily until the last one.
+        Accepts the same filters as collection_lists(). prefetch > 0 fetches that many pages ahead concurrently
+        """
+        return self._iter_pages(partial(self.collection_lists, **filters), page, page_size, prefetch)
 
-        return _make_get_request(method_url, self.headers)
+    def iter_collection_items(self, collection: str, page: int = 1, page_size: int = 40, prefetch: int = 0, **filters):
+        """
+        Iterate over items of a NFT collection record by record, fetching pages lazily until the last one.
+        Accepts the same filters as collection_items(). prefetch > 0 fetches that many pages ahead concurrently
+        """
+        return self._iter_pages(partial(self.collection_items, collection, **filters), page, page_size, prefetch)
 
+    def activities_table(self, backend: str = 'numpy', page_size: int = 100, prefetch: int = 0, **filters):
+        """
+        Stream all NFT activities into one columnar table: {column: numpy array} for backend='numpy' or a
+        pyarrow.Table for backend='arrow'. Accepts the same filters as activities()
+        """
+        rows = self.iter_activities(page_size=page_size, prefetch=prefetch, **filters)
+        return self._to_table(rows, NFT_ACTIVITY_SCHEMA, backend)
 
-class TransactionAPIV2(APIV2):
-    def __init__(self, api_key):
-        super().__init__(api_key)
-        self.url_module = self.url + 'transaction/'
 
+class TransactionAPIV2(APIV2):
     def last(self, limit: int | None = 100, filter_: str | None = 'exceptVote'):
         """
         Get the list of the latest transactions
@@ -1144,14 +852,8 @@ class TransactionAPIV2(APIV2):
 
         filter_ (str): The filter parameter for excluding vote transactions. Enum: exceptVote, all
         """
-        method_url = self.url_module + 'last?filter=' + filter_
-
-        if isinstance(limit, int):
-            method_url = method_url + '&limit=' + str(limit)
-        elif limit is not None:
-            raise TypeError('Wrong type for input args')
-
-        return _make_get_request(method_url, self.headers)
+        method_url = TRANSACTION_LAST.url(self.url, limit, filter_)
+        return self._get(method_url)
 
     def detail(self, tx: str):
         """
@@ -1160,9 +862,8 @@ class TransactionAPIV2(APIV2):
         Args:
         tx (str): Transaction Address
         """
-        method_url = self.url_module + 'detail?tx=' + tx
-
-        return _make_get_request(method_url, self.headers)
+        method_url = TRANSACTION_DETAIL.url(self.url, tx)
+        return self._get(method_url)
 
     def actions(self, tx: str):
         """
@@ -1171,16 +872,38 @@ class TransactionAPIV2(APIV2):
         Args:
         tx (str): Transaction Address
         """
-        method_url = self.url_module + 'actions?tx=' + tx
+        method_url = TRANSACTION_ACTIONS.url(self.url, tx)
+        return self._get(method_url)
 
-        return _make_get_request(method_url, self.headers)
+    def iter_enriched(self, signatures: Iterable, detail: bool = True, actions: bool = False, max_workers: int = 16,
+                      ordered: bool = True, seen=None):
+        """
+        Fetch detail() and/or actions() for a stream of signatures concurrently and yield
+        {'signature': ..., 'detail': ..., 'actions': ...} per signature, with the exception in place of a failed
+        response. Signatures already fetched are skipped and memory stays bounded for unbounded input
+
+        Args:
+            signatures (Iterable): Signatures, or rows with tx_hash/trans_id, e.g. from account.iter_transactions
 
+            detail (bool): Fetch detail()
 
-class BlockAPIV2(APIV2):
-    def __init__(self, api_key):
-        super().__init__(api_key)
-        self.url_module = self.url + 'block/'
+            actions (bool): Fetch actions()
 
+            max_workers (int): Maximum number of signatures in flight
+
+            ordered (bool): Yield in input order, False to yield in completion order
+
+            seen: Container of signatures to skip, e.g. a SeenSet shared between calls
+        """
+        fetchers = {}
+        if detail:
+            fetchers['detail'] = self.detail
+        if actions:
+            fetchers['actions'] = self.actions
+        return self._iter_enriched(fetchers, signatures, max_workers, ordered, seen)
+
+
+class BlockAPIV2(APIV2):
     def last(self, limit: int | None = 100):
         """
         Get the list of the latest transactions
@@ -1188,9 +911,8 @@ class BlockAPIV2(APIV2):
         Args:
         limit (int): The number of transactions should be returned. Enum: 10, 20, 30, 40, 60, 100
         """
-        method_url = self.url_module + 'last?limit=' + str(limit)
-
-        return _make_get_request(method_url, self.headers)
+        method_url = BLOCK_LAST.url(self.url, limit)
+        return self._get(method_url)
 
     def transactions(self, block: int, page: int | None = None, page_size: int | None = None):
         """
@@ -1203,19 +925,8 @@ class BlockAPIV2(APIV2):
 
         page_size (int | None): Number items per page. Enum: 10, 20, 30, 40, 60, 100
         """
-        method_url = self.url_module + 'transactions?block=' + str(block)
-
-        if isinstance(page, int):
-            method_url = method_url + '&page=' + str(page)
-        elif page is not None:
-            raise TypeError('Wrong type for input args')
-
-        if isinstance(page_size, int):
-            method_url = method_url + '&page_size=' + str(page_size)
-        elif page_size is not None:
-            raise TypeError('Wrong type for input args')
-
-        return _make_get_request(method_url, self.headers)
+        method_url = BLOCK_TRANSACTIONS.url(self.url, block, page, page_size)
+        return self._get(method_url)
 
     def detail(self, block: int):
         """
@@ -1224,19 +935,21 @@ class BlockAPIV2(APIV2):
         Args:
         block (int): The slot index of a block
         """
-        method_url = self.url_module + 'detail?block=' + str(block)
+        method_url = BLOCK_DETAIL.url(self.url, block)
+        return self._get(method_url)
 
-        return _make_get_request(method_url, self.headers)
+    def iter_transactions(self, block: int, page: int = 1, page_size: int = 100, prefetch: int = 0, **filters):
+        """
+        Iterate over transactions of a block record by record, fetching pages lazily until the last one.
+        Accepts the same filters as transactions(). prefetch > 0 fetches that many pages ahead concurrently
+        """
+        return self._iter_pages(partial(self.transactions, block, **filters), page, page_size, prefetch)
 
 
 class MonitoringAPIV2(APIV2):
-    def __init__(self, api_key):
-        super().__init__(api_key)
-        self.url_module = self.url + 'monitor/'
-
     def usage(self):
         """
         Get the used Compute Units of a subscriber
         """
-        method_url = self.url_module + 'usage'
-        return _make_get_request(method_url, self.headers)
+        method_url = MONITOR_USAGE.url(self.url)
+        return self._get(method_url)
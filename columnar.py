@@ -0,0 +1,155 @@
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # optional, needed for backend='numpy'
+    np = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # optional, needed for backend='arrow'
+    pa = None
+
+
+# Column schemas as (column, response key, type). Nested keys use dots, e.g. 'routers.amount1'.
+# Types: 'int64', 'uint64' (raw token amounts, which can exceed int64), 'float64' and 'str'
+TRANSFER_SCHEMA = (
+    ('block_id', 'block_id', 'int64'), ('trans_id', 'trans_id', 'str'), ('block_time', 'block_time', 'int64'),
+    ('activity_type', 'activity_type', 'str'), ('from_address', 'from_address', 'str'),
+    ('to_address', 'to_address', 'str'), ('token_address', 'token_address', 'str'),
+    ('token_decimals', 'token_decimals', 'int64'), ('amount', 'amount', 'uint64'), ('flow', 'flow', 'str'),
+)
+
+BALANCE_CHANGE_SCHEMA = (
+    ('block_id', 'block_id', 'int64'), ('block_time', 'block_time', 'int64'), ('trans_id', 'trans_id', 'str'),
+    ('address', 'address', 'str'), ('token_address', 'token_address', 'str'),
+    ('token_account', 'token_account', 'str'), ('token_decimals', 'token_decimals', 'int64'),
+    ('amount', 'amount', 'uint64'), ('pre_balance', 'pre_balance', 'uint64'),
+    ('post_balance', 'post_balance', 'uint64'), ('change_type', 'change_type', 'str'), ('fee', 'fee', 'int64'),
+)
+
+DEFI_ACTIVITY_SCHEMA = (
+    ('block_id', 'block_id', 'int64'), ('trans_id', 'trans_id', 'str'), ('block_time', 'block_time', 'int64'),
+    ('activity_type', 'activity_type', 'str'), ('from_address', 'from_address', 'str'),
+    ('to_address', 'to_address', 'str'), ('platform', 'platform', 'str'),
+    ('token1', 'routers.token1', 'str'), ('token1_decimals', 'routers.token1_decimals', 'int64'),
+    ('amount1', 'routers.amount1', 'uint64'), ('token2', 'routers.token2', 'str'),
+    ('token2_decimals', 'routers.token2_decimals', 'int64'), ('amount2', 'routers.amount2', 'uint64'),
+)
+
+NFT_ACTIVITY_SCHEMA = (
+    ('block_id', 'block_id', 'int64'), ('trans_id', 'trans_id', 'str'), ('block_time', 'block_time', 'int64'),
+    ('activity_type', 'activity_type', 'str'), ('from_address', 'from_address', 'str'),
+    ('to_address', 'to_address', 'str'), ('token_address', 'token_address', 'str'),
+    ('marketplace_address', 'marketplace_address', 'str'), ('collection_address', 'collection_address', 'str'),
+    ('amount', 'amount', 'uint64'), ('price', 'price', 'uint64'), ('currency_token', 'currency_token', 'str'),
+    ('currency_decimals', 'currency_decimals', 'int64'),
+)
+
+_TYPECODES = {'int64': 'q', 'uint64': 'Q', 'float64': 'd'}
+
+
+def _getter(key):
+    path = key.split('.')
+
+    def get(row):
+        # Nested objects are dicts in raw rows and records (e.g. Router) in typed ones
+        for part in path:
+            if isinstance(row, dict):
+                row = row.get(part)
+            elif row is None:
+                return None
+            else:
+                row = getattr(row, part, None)
+        return row
+    return get
+
+
+class ColumnBuilder:
+    def __init__(self, schema):
+        """
+        Accumulate rows straight into typed column buffers. Numeric columns are stored in compact array.array
+        buffers while pages stream in, so no list of row dicts is ever built. Missing numbers are stored as 0
+
+        Args:
+            schema: Sequence of (column, response key, type), e.g. TRANSFER_SCHEMA
+        """
+        self.schema = schema
+        self._getters = [_getter(key) for _, key, _ in schema]
+        self._columns = [[] if kind == 'str' else array(_TYPECODES[kind]) for _, _, kind in schema]
+        self.rows = 0
+
+    def append(self, row):
+        for getter, column in zip(self._getters, self._columns):
+            value = getter(row)
+            if isinstance(column, array):
+                if value is None:
+                    value = 0
+                column.append(float(value) if column.typecode == 'd' else int(value))
+            else:
+                column.append(value)
+        self.rows += 1
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+        return self
+
+    def to_numpy(self) -> dict:
+        """
+        Return {column: numpy array}. Numeric columns wrap the collected buffers without copying
+        """
+        if np is None:
+            raise ImportError('backend="numpy" requires numpy: pip install numpy')
+        result = {}
+        for (name, _, kind), column in zip(self.schema, self._columns):
+            if isinstance(column, array):
+                result[name] = np.frombuffer(column, dtype=kind)
+            else:
+                result[name] = np.array(column, dtype=object)
+        return result
+
+    def to_arrow(self):
+        """
+        Return a pyarrow.Table
+        """
+        if pa is None:
+            raise ImportError('backend="arrow" requires pyarrow: pip install pyarrow')
+        arrays = []
+        for (_, _, kind), column in zip(self.schema, self._columns):
+            if isinstance(column, array):
+                arrays.append(pa.Array.from_buffers(getattr(pa, kind)(), len(column), [None, pa.py_buffer(column)]))
+            else:
+                arrays.append(pa.array(column, type=pa.string()))
+        return pa.Table.from_arrays(arrays, names=[name for name, _, _ in self.schema])
+
+    def build(self, backend: str = 'numpy'):
+        if backend == 'numpy':
+            return self.to_numpy()
+        if backend == 'arrow':
+            return self.to_arrow()
+        raise ValueError(f'Unknown backend {backend!r}, use "numpy" or "arrow"')
+
+
+def to_table(rows, schema, backend: str = 'numpy'):
+    """
+    Stream rows (e.g. from an iter_* method) into one columnar table
+
+    Args:
+        rows (Iterable): Row dicts or typed records
+
+        schema: Column schema, e.g. TRANSFER_SCHEMA
+
+        backend (str): 'numpy' for {column: ndarray}, 'arrow' for a pyarrow.Table
+    """
+    return ColumnBuilder(schema).extend(rows).build(backend)
+
+
+async def ato_table(rows, schema, backend: str = 'numpy'):
+    """
+    Async version of to_table for async iterators
+    """
+    builder = ColumnBuilder(schema)
+    async for row in rows:
+        builder.append(row)
+    return builder.build(backend)
@@ -0,0 +1,36 @@
+import json
+
+try:
+    import orjson
+except ImportError:  # optional fast decoder
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # optional fast decoder
+    msgspec = None
+
+
+DECODERS = {'json': json.loads}
+if msgspec is not None:
+    DECODERS['msgspec'] = msgspec.json.Decoder().decode
+if orjson is not None:
+    DECODERS['orjson'] = orjson.loads
+
+# Fastest first
+PREFERRED = ('orjson', 'msgspec', 'json')
+
+
+def get_decoder(name: str | None = None):
+    """
+    Return a function turning a raw JSON body (bytes) into Python objects
+
+    Args:
+        name (str | None): 'orjson', 'msgspec' or 'json'. None picks the fastest one installed
+    """
+    if name is None:
+        name = next(candidate for candidate in PREFERRED if candidate in DECODERS)
+    try:
+        return DECODERS[name]
+    except KeyError:
+        raise ValueError(f'JSON decoder {name!r} is not available, installed: {", ".join(DECODERS)}') from None
@@ -0,0 +1,225 @@
+from urllib.parse import quote
+
+_WRONG_TYPE = 'Wrong type for input args'
+
+
+# Escaped form of the strings sent recently. Addresses and signatures are base58 and need no escaping, but the
+# check is slower than a lookup, and crawls send the same address, token or activity type over and over
+_ESCAPED = {}
+_ESCAPED_SIZE = 4096
+
+
+def _escape(value):
+    if not isinstance(value, str):
+        raise TypeError(_WRONG_TYPE)
+    escaped = value if value.isalnum() and value.isascii() else quote(value, safe='')
+    if len(_ESCAPED) >= _ESCAPED_SIZE:
+        _ESCAPED.clear()
+    _ESCAPED[value] = escaped
+    return escaped
+
+
+# Encoders return the '&name=value' pairs of one argument; `name` already is '&name=' (or '&name[]=' for lists)
+def _str(name, value):
+    if value.__class__ is not str and not isinstance(value, str):
+        raise TypeError(_WRONG_TYPE)
+    return name + (_ESCAPED.get(value) or _escape(value))
+
+
+def _int(name, value):
+    if value.__class__ is not int and (not isinstance(value, int) or isinstance(value, bool)):
+        raise TypeError(_WRONG_TYPE)
+    return name + str(value)
+
+
+def _number(name, value):
+    if value.__class__ is not int and (not isinstance(value, (int, float)) or isinstance(value, bool)):
+        raise TypeError(_WRONG_TYPE)
+    return name + str(value)
+
+
+def _bool(name, value):
+    if value is True:
+        return name + 'true'
+    if value is False:
+        return name + 'false'
+    raise TypeError(_WRONG_TYPE)
+
+
+def _list(item):
+    def encode(name, values):
+        if values.__class__ is not list and not isinstance(values, (list, tuple)):
+            raise TypeError(_WRONG_TYPE)
+        return ''.join([item(name, value) for value in values])
+    return encode
+
+
+_ENCODERS = {'str': _str, 'int': _int, 'bool': _bool, 'list[str]': _list(_str), 'list[int]': _list(_number)}
+
+# Inline source for the common values of each kind, {v} is the value and {name} the '&name=' literal. Anything
+# else (subclasses, wrong types, tuples, long number lists) goes through the kind's encoder, bound as {encode}.
+# Strings missing from _ESCAPED, or that are not strings at all, go through _escape()
+_FAST = {
+    'str': ('try:\n'
+            '    query += {name!r} + (_ESCAPED.get({v}) or _escape({v}))\n'
+            'except TypeError:\n'
+            '    raise TypeError(_WRONG_TYPE) from None\n'),
+    'int': ('if {v}.__class__ is int:\n'
+            '    query += {name!r} + str({v})\n'
+            'else:\n'
+            '    query += {encode}({name!r}, {v})\n'),
+    'bool': ('if {v} is True:\n'
+             "    query += {name!r} + 'true'\n"
+             'elif {v} is False:\n'
+             "    query += {name!r} + 'false'\n"
+             'else:\n'
+             '    query += {encode}({name!r}, {v})\n'),
+    'list[str]': ('if {v}.__class__ is list and {v}:\n'
+                  '    try:\n'
+                  '        query += {name!r} + {name!r}.join(map(_ESCAPED.get, {v}))\n'
+                  '    except TypeError:\n'
+                  '        # Some values were not sent recently (None can\'t be joined) or are not strings\n'
+                  '        query += {name!r} + {name!r}.join(map(_escape, {v}))\n'
+                  'else:\n'
+                  '    query += {encode}({name!r}, {v})\n'),
+    # Number lists are [from, to] ranges of block_time, amount, price or time
+    'list[int]': ('if {v}.__class__ is list and len({v}) == 2 and {v}[0].__class__ is int '
+                  'and {v}[1].__class__ is int:\n'
+                  '    query += {name!r} + str({v}[0]) + {name!r} + str({v}[1])\n'
+                  'else:\n'
+                  '    query += {encode}({name!r}, {v})\n'),
+}
+
+
+def _indent(source):
+    return ''.join('    ' + line + '\n' for line in source.splitlines())
+
+
+class Endpoint:
+    def __init__(self, path: str, *params):
+        """
+        Declarative description of one API endpoint: its path and the query parameters of the client method.
+        The parameters are compiled once into a url() function with one unrolled branch per argument
+
+        Args:
+            path (str): Path below the API root, e.g. 'account/transfer'
+
+            params: (argument, query name, kind) or (argument, query name, kind, True) for required arguments,
+            in the order of the client method's signature. Kinds: 'str', 'int', 'bool', 'list[str]' and
+            'list[int]'; list values are sent as repeated `name[]=` pairs
+        """
+        self.path = path
+        self.params = params
+        self.url = self._compile()
+
+    def _compile(self):
+        namespace = {'_WRONG_TYPE': _WRONG_TYPE, '_ESCAPED': _ESCAPED, '_escape': _escape, 'prefixes': {}}
+        # A required scalar first argument always opens the query, so the URL is built in place from the prefix.
+        # Otherwise the query is collected with a leading '&' that becomes the '?'
+        opens = bool(self.params) and len(self.params[0]) > 3 and bool(self.params[0][3]) \
+            and not self.params[0][2].startswith('list')
+        arguments = []
+        body = 'query = prefix\n' if opens else "query = ''\n"
+        for index, param in enumerate(self.params):
+            argument, name, kind = param[:3]
+            required = len(param) > 3 and bool(param[3])
+            if kind not in _ENCODERS:
+                raise ValueError(f'Unknown kind {kind!r} of parameter {argument!r} in {self.path}')
+            namespace[f'encode{index}'] = _ENCODERS[kind]
+            name = ('?' if opens and index == 0 else '&') + name + ('[]=' if kind.startswith('list') else '=')
+            encode = _FAST[kind].format(v=argument, name=name, encode=f'encode{index}')
+            if required:
+                arguments.append(argument)
+                body += f'if {argument} is None:\n    raise TypeError(_WRONG_TYPE)\n' + encode
+            else:
+                arguments.append(argument + '=None')
+                body += f'if {argument} is not None:\n' + _indent(encode)
+        body += 'return query\n' if opens else "return prefix + '?' + query[1:] if query else prefix\n"
+        # base + path is built once per API root and kept in `prefixes`
+        source = (f'def url({", ".join(["base", *arguments])}):\n'
+                  '    prefix = prefixes.get(base)\n'
+                  '    if prefix is None:\n'
+                  f'        prefix = prefixes[base] = base + {self.path!r}\n'
+                  + _indent(body))
+        exec(source, namespace)
+        url = namespace['url']
+        url.__doc__ = (f'Build the URL of {self.path} from the arguments, given in spec order. None means "not sent"; '
+                       'parameters always come out in spec order, so equal calls give equal URLs. Raises TypeError '
+                       'if a value has the wrong type or a required one is missing')
+        url.source = source
+        return url
+
+    def __repr__(self):
+        return f'Endpoint({self.path!r})'
+
+
+_ACTIVITY_FILTERS = (('block_time', 'block_time', 'list[int]'), ('page', 'page', 'int'),
+                     ('page_size', 'page_size', 'int'), ('sort_by', 'sort_by', 'str'),
+                     ('sort_order', 'sort_order', 'str'))
+_TRANSFER_FILTERS = (('activity_type', 'activity_type', 'list[str]'), ('token_account', 'token_account', 'str'),
+                     ('from_', 'from', 'str'), ('to_', 'to', 'str'), ('token', 'token', 'str'),
+                     ('amount', 'amount', 'list[int]'), ('exclude_amount_zero', 'exclude_amount_zero', 'bool'),
+                     ('flow', 'flow', 'str'))
+_DEFI_FILTERS = (('activity_type', 'activity_type', 'list[str]'), ('from_', 'from', 'str'),
+                 ('platform', 'platform', 'list[str]'), ('source', 'source', 'list[str]'), ('token', 'token', 'str'))
+_ADDRESS = ('address', 'address', 'str', True)
+
+ACCOUNT_DEFI_ACTIVITIES = Endpoint('account/defi/activities', _ADDRESS, *_DEFI_FILTERS, *_ACTIVITY_FILTERS)
+ACCOUNT_TRANSFER = Endpoint('account/transfer', _ADDRESS, *_TRANSFER_FILTERS, *_ACTIVITY_FILTERS)
+ACCOUNT_TOKEN_ACCOUNTS = Endpoint('account/token-accounts', _ADDRESS, ('type', 'type', 'str', True),
+                                  ('hide_zero', 'hide_zero', 'bool'), ('page', 'page', 'int'),
+                                  ('page_size', 'page_size', 'int'))
+ACCOUNT_BALANCE_CHANGE = Endpoint('account/balance_change', _ADDRESS, ('token', 'token', 'str'),
+                                  ('remove_spam', 'remove_spam', 'bool'), ('amount', 'amount', 'list[int]'),
+                                  ('flow', 'flow', 'str'), *_ACTIVITY_FILTERS)
+ACCOUNT_TRANSACTIONS = Endpoint('account/transactions', _ADDRESS, ('before', 'before', 'str'),
+                                ('limit', 'limit', 'int'))
+ACCOUNT_STAKE = Endpoint('account/stake', _ADDRESS, ('page', 'page', 'int'), ('page_size', 'page_size', 'int'))
+ACCOUNT_DETAIL = Endpoint('account/detail', _ADDRESS)
+ACCOUNT_REWARDS_EXPORT = Endpoint('account/reward/export', _ADDRESS, ('time_from', 'time_from', 'int', True),
+                                  ('time_to', 'time_to', 'int', True))
+ACCOUNT_TRANSFER_EXPORT = Endpoint('account/transfer/export', _ADDRESS, *_TRANSFER_FILTERS,
+                                   ('block_time', 'block_time', 'list[int]'))
+
+TOKEN_META = Endpoint('token/meta', _ADDRESS)
+TOKEN_MARKETS = Endpoint('token/markets', ('token', 'token', 'list[str]', True), ('sort_by', 'sort_by', 'str'),
+                         ('program', 'program', 'list[str]'), ('page', 'page', 'int'),
+                         ('page_size', 'page_size', 'int'))
+TOKEN_MARKET_INFO = Endpoint('token/market/info', _ADDRESS)
+TOKEN_TRANSFER = Endpoint('token/transfer', _ADDRESS, *_TRANSFER_FILTERS, *_ACTIVITY_FILTERS)
+TOKEN_DEFI_ACTIVITIES = Endpoint('token/defi/activities', _ADDRESS, *_DEFI_FILTERS, *_ACTIVITY_FILTERS)
+TOKEN_LIST = Endpoint('token/list', ('page', 'page', 'int'), ('page_size', 'page_size', 'int'),
+                      ('sort_by', 'sort_by', 'str'), ('sort_order', 'sort_order', 'str'))
+TOKEN_MARKET_VOLUME = Endpoint('token/market/volume', _ADDRESS, ('time', 'time', 'list[int]'))
+TOKEN_TRENDING = Endpoint('token/trending', ('limit', 'limit', 'int'))
+TOKEN_PRICE = Endpoint('token/price', _ADDRESS, ('time', 'time', 'list[int]'))
+TOKEN_HOLDERS = Endpoint('token/holders', _ADDRESS, ('page', 'page', 'int'), ('page_size', 'page_size', 'int'),
+                         ('from_amount', 'from_amount', 'int'), ('to_amount', 'to_amount', 'int'))
+TOKEN_TOP = Endpoint('token/top')
+
+NFT_NEWS = Endpoint('nft/news', ('filter_', 'filter', 'str'), ('page', 'page', 'int'),
+                    ('page_size', 'page_size', 'int'))
+NFT_ACTIVITIES = Endpoint('nft/activities', ('activity_type', 'activity_type', 'list[str]'), ('from_', 'from', 'str'),
+                          ('to_', 'to', 'str'), ('currency_token', 'currency_token', 'str'),
+                          ('collection', 'collection', 'str'), ('price', 'price', 'list[int]'),
+                          ('source', 'source', 'list[str]'), ('token', 'token', 'str'),
+                          ('block_time', 'block_time', 'list[int]'), ('page', 'page', 'int'),
+                          ('page_size', 'page_size', 'int'))
+NFT_COLLECTION_LISTS = Endpoint('nft/collection/lists', ('range_', 'range', 'int'),
+                                ('collection', 'collection', 'str'), ('page', 'page', 'int'),
+                                ('page_size', 'page_size', 'int'), ('sort_by', 'sort_by', 'str'),
+                                ('sort_order', 'sort_order', 'str'))
+NFT_COLLECTION_ITEMS = Endpoint('nft/collection/items', ('collection', 'collection', 'str', True),
+                                ('page', 'page', 'int'), ('page_size', 'page_size', 'int'),
+                                ('sort_by', 'sort_by', 'str'))
+
+TRANSACTION_LAST = Endpoint('transaction/last', ('limit', 'limit', 'int'), ('filter_', 'filter', 'str'))
+TRANSACTION_DETAIL = Endpoint('transaction/detail', ('tx', 'tx', 'str', True))
+TRANSACTION_ACTIONS = Endpoint('transaction/actions', ('tx', 'tx', 'str', True))
+
+BLOCK_LAST = Endpoint('block/last', ('limit', 'limit', 'int'))
+BLOCK_TRANSACTIONS = Endpoint('block/transactions', ('block', 'block', 'int', True), ('page', 'page', 'int'),
+                              ('page_size', 'page_size', 'int'))
+BLOCK_DETAIL = Endpoint('block/detail', ('block', 'block', 'int', True))
+
+MONITOR_USAGE = Endpoint('monitor/usage')
@@ -0,0 +1,148 @@
+import asyncio
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from itertools import islice
+
+
+class SeenSet:
+    def __init__(self, maxsize: int = 1_000_000):
+        """
+        Set of recently fetched signatures with bounded size: once full, the oldest ones are forgotten
+
+        Args:
+            maxsize (int): Number of signatures remembered
+        """
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+
+    def __contains__(self, signature):
+        return signature in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    def add(self, signature):
+        self._items[signature] = None
+        if len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+
+def _signature(item):
+    if isinstance(item, str):
+        return item
+    if not isinstance(item, dict):
+        item = item.to_dict()
+    return item.get('tx_hash') or item.get('trans_id') or item.get('signature')
+
+
+def _fresh(items, seen):
+    for item in items:
+        signature = _signature(item)
+        if signature is None or signature in seen:
+            continue
+        seen.add(signature)
+        yield signature
+
+
+def _enrich(fetchers, signature):
+    result = {'signature': signature}
+    for name, fetch in fetchers.items():
+        try:
+            result[name] = fetch(signature)
+        except Exception as exc:
+            result[name] = exc
+    return result
+
+
+def iter_enriched(fetchers: dict, items, max_workers: int = 16, ordered: bool = True, seen=None):
+    """
+    Fetch extra data for a stream of transactions on a thread pool and yield one dict per new signature:
+    {'signature': ..., name: response or exception, ...}. Signatures already fetched are skipped. At most
+    2 * max_workers signatures are taken from the input at a time, so it can be an unbounded iterator
+
+    Args:
+        fetchers (dict): Name to single-signature endpoint, e.g. {'detail': api.transaction.detail}
+
+        items (Iterable): Signatures, or rows carrying tx_hash/trans_id such as those of account.transactions
+
+        max_workers (int): Maximum number of signatures in flight
+
+        ordered (bool): Yield in input order. False yields as soon as each signature completes
+
+        seen: Container of signatures to skip, updated as signatures are taken. Defaults to a SeenSet
+    """
+    signatures = _fresh(items, seen if seen is not None else SeenSet())
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pending = deque() if ordered else set()
+    put = pending.append if ordered else pending.add
+    try:
+        for signature in islice(signatures, 2 * max_workers):
+            put(executor.submit(_enrich, fetchers, signature))
+        while pending:
+            if ordered:
+                done = [pending.popleft()]
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                pending.difference_update(done)
+            for future in done:
+                for signature in islice(signatures, 1):
+                    put(executor.submit(_enrich, fetchers, signature))
+                yield future.result()
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+async def _aenrich(fetchers, signature):
+    results = await asyncio.gather(*(fetch(signature) for fetch in fetchers.values()), return_exceptions=True)
+    return {'signature': signature, **dict(zip(fetchers, results))}
+
+
+async def _afresh(items, seen):
+    if not hasattr(items, '__aiter__'):
+        for signature in _fresh(items, seen):
+            yield signature
+        return
+    async for item in items:
+        signature = _signature(item)
+        if signature is None or signature in seen:
+            continue
+        seen.add(signature)
+        yield signature
+
+
+async def aiter_enriched(fetchers: dict, items, max_workers: int = 64, ordered: bool = True, seen=None):
+    """
+    Async version of iter_enriched for fetch functions returning awaitables. `items` can also be an async
+    iterable, such as the iter_transactions() of an async client. The endpoints of one signature are requested
+    concurrently
+    """
+    signatures = _afresh(items, seen if seen is not None else SeenSet())
+    pending = deque() if ordered else set()
+    put = pending.append if ordered else pending.add
+
+    async def submit():
+        signature = await anext(signatures, None)
+        if signature is not None:
+            put(asyncio.ensure_future(_aenrich(fetchers, signature)))
+        return signature is not None
+
+    try:
+        for _ in range(max_workers):
+            if not await submit():
+                break
+        while pending:
+            if ordered:
+                done = [pending.popleft()]
+                await done[0]
+            else:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                pending.difference_update(done)
+            for task in done:
+                await submit()
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+        await signatures.aclose()
@@ -0,0 +1,198 @@
+import gzip
+import json
+import os
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional, needed for format='parquet'
+    pa = pq = None
+
+from backfill import Backfill
+
+MANIFEST = 'manifest.json'
+
+
+def _as_dict(row):
+    return row if isinstance(row, dict) else row.to_dict()
+
+
+class Exporter:
+    def __init__(self, directory: str, format: str = 'ndjson', rows_per_file: int = 1_000_000,
+                 batch_size: int = 10_000, compress: bool = True, prefix: str = 'part'):
+        """
+        Write a stream of rows sorted by block_time into rotating NDJSON or Parquet files with constant memory.
+        Only batch_size rows are buffered at a time. A file is written under a temporary name and registered in
+        manifest.json once complete, so after a crash only the unfinished file is lost and resume_from() tells
+        where to restart the crawl. Files are rotated on block_time boundaries, so each second is in one file
+
+        Args:
+            directory (str): Output directory, created if missing
+
+            format (str): 'ndjson' or 'parquet' (requires pyarrow)
+
+            rows_per_file (int): Rows per file before rotating to the next one
+
+            batch_size (int): Rows buffered in memory before they are written
+
+            compress (bool): gzip NDJSON files, use zstd for Parquet
+
+            prefix (str): File name prefix
+        """
+        if format not in ('ndjson', 'parquet'):
+            raise ValueError('format must be "ndjson" or "parquet"')
+        if format == 'parquet' and pq is None:
+            raise ImportError('format="parquet" requires pyarrow: pip install pyarrow')
+        self.directory = directory
+        self.format = format
+        self.rows_per_file = rows_per_file
+        self.batch_size = batch_size
+        self.compress = compress
+        self.prefix = prefix
+        os.makedirs(directory, exist_ok=True)
+        self.manifest = self._load_manifest()
+        self._file = None
+        self._path = None
+        self._schema = None
+        self._batch = []
+        self._rows = 0
+        self._min_time = None
+        self._max_time = None
+
+    def _load_manifest(self):
+        path = os.path.join(self.directory, MANIFEST)
+        if os.path.exists(path):
+            with open(path) as file:
+                return json.load(file)
+        return {'format': self.format, 'files': [], 'rows': 0, 'watermark': None}
+
+    def _save_manifest(self):
+        path = os.path.join(self.directory, MANIFEST)
+        with open(path + '.tmp', 'w') as file:
+            json.dump(self.manifest, file, indent=2)
+        os.replace(path + '.tmp', path)
+
+    def resume_from(self, start: int) -> int:
+        """
+        Return the block_time the crawl should start from: `start` for a fresh export, or the second after the
+        last one fully written by a previous run
+        """
+        watermark = self.manifest['watermark']
+        return start if watermark is None else max(start, watermark + 1)
+
+    def _extension(self):
+        if self.format == 'parquet':
+            return '.parquet'
+        return '.ndjson.gz' if self.compress else '.ndjson'
+
+    def _open(self):
+        self._path = os.path.join(self.directory,
+                                  f'{self.prefix}-{len(self.manifest["files"]):05d}{self._extension()}')
+        if self.format == 'ndjson':
+            tmp = self._path + '.tmp'
+            self._file = gzip.open(tmp, 'wt') if self.compress else open(tmp, 'w')
+
+    def _table(self, rows):
+        # Every batch of every file uses the schema inferred from the first one
+        if self._schema is None:
+            table = pa.Table.from_pylist(rows)
+            self._schema = table.schema
+            return table
+        extra = {key for row in rows for key in row} - set(self._schema.names)
+        if extra:
+            raise ValueError(f'Rows have columns missing from the Parquet schema: {", ".join(sorted(extra))}')
+        try:
+            return pa.Table.from_pylist(rows, schema=self._schema)
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as exc:
+            raise ValueError(f'Rows do not match the Parquet schema {self._schema}: {exc}') from exc
+
+    def _flush(self):
+        if not self._batch:
+            return
+        if self._file is None and self.format == 'ndjson':
+            self._open()
+        if self.format == 'ndjson':
+            self._file.write(''.join(json.dumps(row, separators=(',', ':')) + '\n' for row in self._batch))
+        else:
+            table = self._table(self._batch)
+            if self._file is None:
+                self._open()
+                self._file = pq.ParquetWriter(self._path + '.tmp', table.schema,
+                                              compression='zstd' if self.compress else 'none')
+            self._file.write_table(table)
+        self._batch = []
+
+    def _commit(self):
+        self._flush()
+        if self._file is None:
+            return
+        self._file.close()
+        os.replace(self._path + '.tmp', self._path)
+        self.manifest['files'].append({'path': os.path.basename(self._path), 'rows': self._rows,
+                                       'min_block_time': self._min_time, 'max_block_time': self._max_time})
+        self.manifest['rows'] += self._rows
+        self.manifest['watermark'] = self._max_time
+        self._save_manifest()
+        self._file = None
+        self._rows = 0
+        self._min_time = self._max_time = None
+
+    def write(self, rows):
+        """
+        Consume an iterator of rows in ascending block_time order and write them out. Returns the manifest
+        """
+        for row in rows:
+            row = _as_dict(row)
+            block_time = row.get('block_time')
+            if self._rows >= self.rows_per_file and block_time != self._max_time:
+                self._commit()
+            self._batch.append(row)
+            self._rows += 1
+            if self._min_time is None:
+                self._min_time = block_time
+            self._max_time = block_time
+            if len(self._batch) >= self.batch_size:
+                self._flush()
+        self._commit()
+        return self.manifest
+
+    def close(self):
+        self._commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        # On errors keep the unfinished file out of the manifest, the next run re-crawls it
+        if exc[0] is None:
+            self.close()
+        elif self._file is not None:
+            self._file.close()
+
+
+def export_history(fetch, directory: str, start: int, stop: int, workers: int = 4, **options):
+    """
+    Export everything `fetch` returns for [start, stop] into `directory`, resuming from the manifest of a
+    previous run if there is one. The range is crawled with Backfill, so rows arrive in block_time order
+
+    Usage:
+        export_history(partial(api.account.transfer, address), 'out/transfers', start, stop, format='parquet')
+
+    Args:
+        fetch (callable): Paged endpoint accepting block_time, page and page_size
+
+        directory (str): Output directory
+
+        start (int): Start of the range. UnixTime in seconds
+
+        stop (int): End of the range, inclusive. UnixTime in seconds
+
+        workers (int): Windows fetched in parallel
+
+        options: Passed to Exporter
+    """
+    with Exporter(directory, **options) as exporter:
+        resume = exporter.resume_from(start)
+        if resume > stop:
+            return exporter.manifest
+        return exporter.write(Backfill(fetch, resume, stop, workers=workers))
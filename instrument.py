@@ -0,0 +1,258 @@
+import bisect
+import math
+import threading
+import time
+
+from utils import _endpoint_name
+
+
+class RequestEvent:
+    __slots__ = ('method', 'url', 'endpoint', 'started', 'status', 'bytes', 'attempts', 'cache_hit', 'coalesced',
+                 'error', 'dns', 'connect', 'tls', 'ttfb', 'body', 'decode', 'wait', 'total', 'context', '_clock',
+                 '_dns_started', '_connect_started')
+
+    def __init__(self, method, url):
+        """
+        What happened during one API call, handed to the hooks of a Transport. Timings are in seconds and describe
+        the last attempt; None means the stage did not happen (cache hit, reused connection) or the transport can't
+        measure it: requests gives no DNS/connect/TLS split, aiohttp reports DNS and connect (TLS included) but
+        not TLS alone
+
+        Attributes:
+            method (str): HTTP method
+
+            url (str): Request URL
+
+            endpoint (str | None): Endpoint path such as 'account/transfer', None outside the PRO API
+
+            started (float): Wall clock time the call started, as time.time()
+
+            status (int | None): HTTP status of the last response, None on cache hits and connection errors
+
+            bytes (int): Body bytes received over all attempts
+
+            attempts (int): Requests sent, 0 when the answer came from the cache or another caller
+
+            cache_hit (bool): The response came from the ResponseCache
+
+            coalesced (bool): The response was shared with a concurrent call for the same URL
+
+            error (BaseException | None): Exception the call raised
+
+            dns, connect, tls (float | None): Name resolution, TCP connect and TLS handshake time
+
+            ttfb (float | None): Time from sending the request to the response headers, connection setup included
+
+            body (float | None): Time reading the response body
+
+            decode (float | None): Time decoding the JSON body
+
+            wait (float): Time spent waiting on the rate limiter, key pool and compute unit budget
+
+            total (float | None): Duration of the whole call, retries and backoff included
+
+            context (dict): Free space for hooks to pass data from before_request to after_response
+        """
+        self.method = method
+        self.url = url
+        self.endpoint = _endpoint_name(url)
+        self.started = time.time()
+        self.status = None
+        self.bytes = 0
+        self.attempts = 0
+        self.cache_hit = False
+        self.coalesced = False
+        self.error = None
+        self.dns = None
+        self.connect = None
+        self.tls = None
+        self.ttfb = None
+        self.body = None
+        self.decode = None
+        self.wait = 0.0
+        self.total = None
+        self.context = {}
+        self._clock = time.perf_counter()
+        self._dns_started = None
+        self._connect_started = None
+
+    def _attempt(self):
+        # Timings describe the last attempt only
+        self.attempts += 1
+        self.dns = self.connect = self.tls = self.ttfb = self.body = None
+        self._dns_started = self._connect_started = None
+
+    @property
+    def retries(self) -> int:
+        return max(self.attempts - 1, 0)
+
+    def __repr__(self):
+        return (f'RequestEvent({self.method} {self.endpoint or self.url} status={self.status} '
+                f'attempts={self.attempts} total={self.total})')
+
+
+class Hooks:
+    def __init__(self, before_request=(), after_response=()):
+        """
+        Callbacks a Transport runs around every API call. Each one gets the RequestEvent of the call; before_request
+        sees only method, url, endpoint and started. Hooks run on the calling thread (or event loop) and should be
+        fast. A transport without hooks (the default) skips all of the bookkeeping
+
+        Usage:
+            histograms = LatencyHistograms()
+            api = APIV2(key, Transport(hooks=Hooks(after_response=[histograms])))
+
+        Args:
+            before_request (Iterable[callable]): Called as hook(event) before the call starts
+
+            after_response (Iterable[callable]): Called as hook(event) once the call returned or raised
+        """
+        self.before_request = list(before_request)
+        self.after_response = list(after_response)
+
+    def add(self, before_request=None, after_response=None):
+        if before_request is not None:
+            self.before_request.append(before_request)
+        if after_response is not None:
+            self.after_response.append(after_response)
+
+    def remove(self, before_request=None, after_response=None):
+        if before_request in self.before_request:
+            self.before_request.remove(before_request)
+        if after_response in self.after_response:
+            self.after_response.remove(after_response)
+
+    def __bool__(self):
+        return bool(self.before_request or self.after_response)
+
+    def before(self, event):
+        for hook in self.before_request:
+            hook(event)
+
+    def after(self, event):
+        for hook in self.after_response:
+            hook(event)
+
+
+def _buckets(low=1e-4, high=120.0, per_doubling=8):
+    # Upper bounds growing by 2 ** (1 / per_doubling), about 9% apart, so percentiles are off by at most that much
+    count = math.ceil(math.log2(high / low) * per_doubling)
+    return tuple(low * 2 ** (index / per_doubling) for index in range(count + 1))
+
+
+BUCKETS = _buckets()
+
+
+class _Histogram:
+    __slots__ = ('counts', 'count', 'sum', 'max', 'errors', 'cache_hits', 'coalesced', 'retries', 'bytes',
+                 'statuses')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.errors = 0
+        self.cache_hits = 0
+        self.coalesced = 0
+        self.retries = 0
+        self.bytes = 0
+        self.statuses = {}
+
+    def percentile(self, q):
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(BUCKETS[index], self.max) if index < len(BUCKETS) else self.max
+        return self.max
+
+
+class LatencyHistograms:
+    def __init__(self, percentiles=(0.5, 0.95, 0.99)):
+        """
+        after_response hook keeping a latency histogram and throughput counters per endpoint. Latency is the total
+        duration of calls that went to the network; cache hits and coalesced calls are only counted. Histograms use
+        fixed log-scale buckets, so memory stays constant and percentiles are accurate to about 9%
+
+        Args:
+            percentiles (Iterable[float]): Percentiles reported by snapshot(), as fractions
+        """
+        self.percentiles = tuple(percentiles)
+        self._histograms = {}
+        self._since = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __call__(self, event: RequestEvent):
+        endpoint = event.endpoint or event.url.split('?', 1)[0]
+        with self._lock:
+            histogram = self._histograms.get(endpoint)
+            if histogram is None:
+                histogram = self._histograms[endpoint] = _Histogram()
+            if event.error is not None:
+                histogram.errors += 1
+            if event.cache_hit:
+                histogram.cache_hits += 1
+            elif event.coalesced:
+                histogram.coalesced += 1
+            elif event.attempts:
+                histogram.counts[bisect.bisect_left(BUCKETS, event.total)] += 1
+                histogram.count += 1
+                histogram.sum += event.total
+                histogram.max = max(histogram.max, event.total)
+                histogram.retries += event.retries
+                histogram.bytes += event.bytes
+            if event.status is not None:
+                histogram.statuses[event.status] = histogram.statuses.get(event.status, 0) + 1
+
+    def percentile(self, endpoint: str, q: float) -> float | None:
+        """
+        Latency in seconds below which a fraction q of the calls to `endpoint` completed
+        """
+        with self._lock:
+            histogram = self._histograms.get(endpoint)
+            return histogram.percentile(q) if histogram is not None else None
+
+    def snapshot(self) -> dict:
+        """
+        Current counters per endpoint: calls, rps (network calls per second since the last reset), errors,
+        cache_hits, coalesced, retries, bytes, statuses, mean, max and the configured percentiles as 'p50', 'p95'...
+        """
+        with self._lock:
+            elapsed = max(time.monotonic() - self._since, 1e-9)
+            result = {}
+            for endpoint, histogram in self._histograms.items():
+                stats = {
+                    'calls': histogram.count, 'rps': histogram.count / elapsed, 'errors': histogram.errors,
+                    'cache_hits': histogram.cache_hits, 'coalesced': histogram.coalesced,
+                    'retries': histogram.retries, 'bytes': histogram.bytes, 'statuses': dict(histogram.statuses),
+                    'mean': histogram.sum / histogram.count if histogram.count else None,
+                    'max': histogram.max if histogram.count else None,
+                }
+                for q in self.percentiles:
+                    stats[f'p{q * 100:g}'] = histogram.percentile(q)
+                result[endpoint] = stats
+            return result
+
+    def report(self) -> str:
+        """
+        snapshot() as a text table, latencies in milliseconds
+        """
+        columns = [f'p{q * 100:g}' for q in self.percentiles]
+        lines = [f'{"endpoint":<28}{"calls":>8}{"rps":>8}{"errors":>8}{"cached":>8}'
+                 + ''.join(f'{column:>10}' for column in columns)]
+        for endpoint, stats in sorted(self.snapshot().items()):
+            latencies = ''.join(f'{stats[column] * 1000:>10.1f}' if stats[column] is not None else f'{"-":>10}'
+                                for column in columns)
+            lines.append(f'{endpoint:<28}{stats["calls"]:>8}{stats["rps"]:>8.2f}{stats["errors"]:>8}'
+                         f'{stats["cache_hits"] + stats["coalesced"]:>8}{latencies}')
+        return '\n'.join(lines)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._since = time.monotonic()
+
@@ -0,0 +1,202 @@
+import asyncio
+import threading
+import time
+
+from budget import BudgetExceededError
+from ratelimit import TokenBucket
+from retry import RetryPolicy
+
+# Statuses that take a key out of rotation: rate limited, or refused (revoked key, plan limit reached)
+REJECTED_STATUSES = frozenset({429, 403})
+
+
+class _Key:
+    __slots__ = ('key', 'weight', 'limiter', 'inflight', 'requests', 'rejected', 'cooldown_until', 'remaining_cus',
+                 'usage_checked', 'current')
+
+    def __init__(self, key, weight, limiter):
+        self.key = key
+        self.weight = weight
+        self.limiter = limiter
+        self.inflight = 0
+        self.requests = 0
+        self.rejected = 0
+        self.cooldown_until = 0.0
+        self.remaining_cus = None
+        self.usage_checked = None
+        self.current = 0.0
+
+
+class KeyPool:
+    def __init__(self, keys, weights=None, strategy: str = 'least_loaded', cooldown: float = 60.0,
+                 rate: float | None = None, usage_interval: float | None = 300, min_remaining_cus: int = 0):
+        """
+        Pool of PRO API keys shared by one transport. Every request is sent with a key picked from the pool; a key
+        answering 429 or 403 is taken out of rotation for a cooldown and the request moves to another key right
+        away. Pass the pool instead of a single key: APIV2(KeyPool([key1, key2, key3]))
+
+        Args:
+            keys (Iterable[str]): PRO API keys
+
+            weights (Iterable[float] | None): Relative share of traffic per key, e.g. the plan limit of each key.
+            Defaults to equal weights
+
+            strategy (str): 'least_loaded' picks the key with the fewest requests in flight relative to its weight,
+            'weighted' spreads requests by weight in smooth round-robin order
+
+            cooldown (float): Seconds a rejected key stays out of rotation, or longer if Retry-After asks for more
+
+            rate (float | None): Requests per second allowed for each key (scaled by its weight). None leaves
+            rate limiting to the transport
+
+            usage_interval (float | None): Seconds between monitor/usage checks of each key's remaining compute
+            units, None to never check
+
+            min_remaining_cus (int): Keys with this many compute units left or fewer are skipped until the next
+            usage check shows more
+        """
+        keys = list(keys)
+        if not keys:
+            raise ValueError('KeyPool needs at least one key')
+        weights = list(weights) if weights is not None else [1.0] * len(keys)
+        if len(weights) != len(keys):
+            raise ValueError('weights must have one entry per key')
+        if strategy not in ('least_loaded', 'weighted'):
+            raise ValueError('strategy must be "least_loaded" or "weighted"')
+        self.strategy = strategy
+        self.cooldown = cooldown
+        self.usage_interval = usage_interval
+        self.min_remaining_cus = min_remaining_cus
+        self._keys = [_Key(key, weight, TokenBucket(rate * weight) if rate else None)
+                      for key, weight in zip(keys, weights)]
+        self._by_key = {state.key: state for state in self._keys}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _usable(self, state, now):
+        if state.cooldown_until > now:
+            return False
+        if state.remaining_cus is not None and state.remaining_cus <= self.min_remaining_cus:
+            # Give an exhausted key another chance once its usage is due to be checked again
+            return self.usage_interval is not None and now - state.usage_checked >= self.usage_interval
+        return True
+
+    def _select(self):
+        """
+        Pick a key and return (state, 0.0), or (None, seconds until a key comes back from cooldown)
+        """
+        now = time.monotonic()
+        with self._lock:
+            candidates = [state for state in self._keys if self._usable(state, now)]
+            if not candidates:
+                cooling = [state.cooldown_until for state in self._keys if state.cooldown_until > now]
+                if not cooling:
+                    raise BudgetExceededError('Every key in the pool is out of compute units')
+                return None, min(cooling) - now
+            if self.strategy == 'weighted':
+                total = sum(state.weight for state in candidates)
+                for state in candidates:
+                    state.current += state.weight
+                chosen = max(candidates, key=lambda state: state.current)
+                chosen.current -= total
+            else:
+                chosen = min(candidates, key=lambda state: (
+                    state.inflight / state.weight,
+                    -state.limiter.available if state.limiter is not None else 0,
+                    state.requests / state.weight))
+            chosen.inflight += 1
+            chosen.requests += 1
+            return chosen, 0.0
+
+    def acquire(self, timeout: float | None = None) -> str | None:
+        """
+        Return the key to send the next request with, waiting while every key is cooling down. Every acquire
+        must be paired with release()
+
+        Args:
+            timeout (float | None): Longest time to wait for a key to come back from cooldown. None means wait
+                as long as it takes; when no key comes back in time, None is returned right away without waiting
+
+        Raises:
+            BudgetExceededError: if every key is out of compute units
+        """
+        give_up = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            state, wait = self._select()
+            if state is not None:
+                break
+            if give_up is not None and time.monotonic() + wait > give_up:
+                return None
+            time.sleep(wait)
+        if state.limiter is not None:
+            state.limiter.acquire()
+        return state.key
+
+    async def acquire_async(self, timeout: float | None = None) -> str | None:
+        """
+        Async version of acquire()
+        """
+        give_up = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            state, wait = self._select()
+            if state is not None:
+                break
+            if give_up is not None and time.monotonic() + wait > give_up:
+                return None
+            await asyncio.sleep(wait)
+        if state.limiter is not None:
+            await state.limiter.acquire_async()
+        return state.key
+
+    def release(self, key: str, status: int | None = None, retry_after: str | None = None) -> bool:
+        """
+        Report the outcome of a request sent with `key`. Returns True when the key was rejected and another key
+        is available right now, i.e. the request should be resent immediately instead of backing off
+        """
+        now = time.monotonic()
+        with self._lock:
+            state = self._by_key[key]
+            state.inflight -= 1
+            if status not in REJECTED_STATUSES:
+                return False
+            delay = RetryPolicy.parse_retry_after(retry_after)
+            # A Retry-After of 0 or in the past must not put the key straight back into rotation
+            state.cooldown_until = now + max(self.cooldown, delay or 0.0)
+            state.rejected += 1
+            return any(self._usable(other, now) for other in self._keys)
+
+    def needs_usage(self, key: str) -> bool:
+        """
+        True once per usage_interval for each key, so only one caller checks its usage at a time
+        """
+        if self.usage_interval is None:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            state = self._by_key[key]
+            if state.usage_checked is not None and now - state.usage_checked < self.usage_interval:
+                return False
+            state.usage_checked = now
+            return True
+
+    def update_usage(self, key: str, usage: dict):
+        """
+        Record a monitoring.usage() response fetched with `key`
+        """
+        data = usage.get('data', usage)
+        with self._lock:
+            if data.get('remaining_cus') is not None:
+                self._by_key[key].remaining_cus = data['remaining_cus']
+
+    def stats(self) -> list[dict]:
+        """
+        Per-key counters. Keys are shortened so the output can be logged
+        """
+        now = time.monotonic()
+        with self._lock:
+            return [{'key': state.key[:6] + '...', 'weight': state.weight, 'requests': state.requests,
+                     'inflight': state.inflight, 'rejected': state.rejected,
+                     'cooldown': max(0.0, state.cooldown_until - now), 'remaining_cus': state.remaining_cus}
+                    for state in self._keys]
@@ -0,0 +1,185 @@
+import sys
+
+
+def _int(value):
+    if value is None or isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else value
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+
+def _str(value):
+    return value
+
+
+def _tag(value):
+    # Addresses and enums repeat across millions of rows, interning keeps a single copy of each
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _tags(value):
+    return tuple(_tag(item) for item in value) if isinstance(value, list) else value
+
+
+def _nested(model):
+    def convert(value):
+        return model.from_dict(value) if isinstance(value, dict) else value
+    return convert
+
+
+def _nested_list(model):
+    def convert(value):
+        if not isinstance(value, list):
+            return value
+        return tuple(model.from_dict(item) if isinstance(item, dict) else item for item in value)
+    return convert
+
+
+def _plain(value):
+    # Back to the JSON shape: records to dicts, tuples to lists
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, tuple):
+        return [_plain(item) for item in value]
+    return value
+
+
+class Record:
+    """
+    Base of the typed records. Subclasses list their fields in _fields as (attribute, response key, converter);
+    conversion happens once in from_dict and the values live in __slots__ instead of a per-row dict
+    """
+    __slots__ = ()
+    _fields = ()
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        record = cls.__new__(cls)
+        for name, key, convert in cls._fields:
+            setattr(record, name, convert(data.get(key)))
+        return record
+
+    def to_dict(self) -> dict:
+        return {name: _plain(getattr(self, name)) for name, _, _ in self._fields}
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name, _, _ in self._fields)
+
+    def __repr__(self):
+        values = ', '.join(f'{name}={getattr(self, name)!r}' for name, _, _ in self._fields)
+        return f'{type(self).__name__}({values})'
+
+
+class Transfer(Record):
+    """
+    Row of AccountAPIV2.transfer
+    """
+    __slots__ = ('block_id', 'trans_id', 'block_time', 'activity_type', 'from_address', 'to_address',
+                 'token_address', 'token_decimals', 'amount', 'flow')
+    _fields = (('block_id', 'block_id', _int), ('trans_id', 'trans_id', _str), ('block_time', 'block_time', _int),
+               ('activity_type', 'activity_type', _tag), ('from_address', 'from_address', _tag),
+               ('to_address', 'to_address', _tag), ('token_address', 'token_address', _tag),
+               ('token_decimals', 'token_decimals', _int), ('amount', 'amount', _int), ('flow', 'flow', _tag))
+
+
+class BalanceChange(Record):
+    """
+    Row of AccountAPIV2.balance_change_activities
+    """
+    __slots__ = ('block_id', 'block_time', 'trans_id', 'address', 'token_address', 'token_account',
+                 'token_decimals', 'amount', 'pre_balance', 'post_balance', 'change_type', 'fee')
+    _fields = (('block_id', 'block_id', _int), ('block_time', 'block_time', _int), ('trans_id', 'trans_id', _str),
+               ('address', 'address', _tag), ('token_address', 'token_address', _tag),
+               ('token_account', 'token_account', _tag), ('token_decimals', 'token_decimals', _int),
+               ('amount', 'amount', _int), ('pre_balance', 'pre_balance', _int),
+               ('post_balance', 'post_balance', _int), ('change_type', 'change_type', _tag), ('fee', 'fee', _int))
+
+
+class Router(Record):
+    """
+    `routers` object of a DeFi activity: both sides of the swap and the child_routers it went through. Keys without
+    a slot are kept in `extra` (None when there are none), so to_dict() loses none of them
+    """
+    __slots__ = ('token1', 'token1_decimals', 'amount1', 'token2', 'token2_decimals', 'amount2', 'child_routers',
+                 'extra')
+    _fields = (('token1', 'token1', _tag), ('token1_decimals', 'token1_decimals', _int), ('amount1', 'amount1', _int),
+               ('token2', 'token2', _tag), ('token2_decimals', 'token2_decimals', _int), ('amount2', 'amount2', _int))
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        record = super().from_dict(data)
+        record.extra = {key: value for key, value in data.items() if key not in cls._keys} or None
+        return record
+
+    def to_dict(self) -> dict:
+        result = super().to_dict()
+        if self.extra:
+            result.update(self.extra)
+        return result
+
+    def __eq__(self, other):
+        result = super().__eq__(other)
+        return result if result is not True else self.extra == other.extra
+
+
+# Routers nest: each hop of a multi-hop swap is a Router again
+Router._fields += (('child_routers', 'child_routers', _nested_list(Router)),)
+Router._keys = frozenset(key for _, key, _ in Router._fields)
+
+
+class DefiActivity(Record):
+    """
+    Row of AccountAPIV2.defi_activities. `routers` is a nested Router record, `sources` a tuple
+    """
+    __slots__ = ('block_id', 'trans_id', 'block_time', 'activity_type', 'from_address', 'to_address', 'sources',
+                 'platform', 'routers')
+    _fields = (('block_id', 'block_id', _int), ('trans_id', 'trans_id', _str), ('block_time', 'block_time', _int),
+               ('activity_type', 'activity_type', _tag), ('from_address', 'from_address', _tag),
+               ('to_address', 'to_address', _tag), ('sources', 'sources', _tags), ('platform', 'platform', _tag),
+               ('routers', 'routers', _nested(Router)))
+
+
+class TokenHolder(Record):
+    """
+    Row of TokenAPIV2.holders
+    """
+    __slots__ = ('address', 'amount', 'decimals', 'owner', 'rank')
+    _fields = (('address', 'address', _str), ('amount', 'amount', _int), ('decimals', 'decimals', _int),
+               ('owner', 'owner', _str), ('rank', 'rank', _int))
+
+
+class NFTActivity(Record):
+    """
+    Row of NFTAPIV2.activities
+    """
+    __slots__ = ('block_id', 'trans_id', 'block_time', 'activity_type', 'from_address', 'to_address',
+                 'token_address', 'marketplace_address', 'collection_address', 'amount', 'price', 'currency_token',
+                 'currency_decimals')
+    _fields = (('block_id', 'block_id', _int), ('trans_id', 'trans_id', _str), ('block_time', 'block_time', _int),
+               ('activity_type', 'activity_type', _tag), ('from_address', 'from_address', _tag),
+               ('to_address', 'to_address', _tag), ('token_address', 'token_address', _tag),
+               ('marketplace_address', 'marketplace_address', _tag),
+               ('collection_address', 'collection_address', _tag), ('amount', 'amount', _int),
+               ('price', 'price', _int), ('currency_token', 'currency_token', _tag),
+               ('currency_decimals', 'currency_decimals', _int))
+
+
+def decode_records(response, model):
+    """
+    Return a copy of an API response with its rows converted to `model` records. The original response,
+    which may be shared through the cache, is left untouched
+    """
+    if not isinstance(response, dict):
+        return response
+    data = response.get('data')
+    if isinstance(data, list):
+        return {**response, 'data': [model.from_dict(row) for row in data]}
+    if isinstance(data, dict) and isinstance(data.get('items'), list):
+        return {**response, 'data': {**data, 'items': [model.from_dict(row) for row in data['items']]}}
+    return response
@@ -0,0 +1,126 @@
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _page_items(response):
+    """
+    Pull the list of records out of an API response. Most endpoints return {'data': [...]}, some wrap the list
+    as {'data': {'total': ..., 'items': [...]}} or {'data': {'transactions': [...]}}
+    """
+    data = response.get('data') if isinstance(response, dict) else response
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict):
+        for key in ('items', 'transactions', 'data'):
+            if isinstance(data.get(key), list):
+                return data[key]
+    return []
+
+
+def iter_pages(fetch, page: int = 1, page_size: int = 100, prefetch: int = 0):
+    """
+    Yield records one by one from a page-numbered endpoint. Pages are fetched lazily and only one page is held
+    in memory at a time. Iteration stops after the first page shorter than page_size
+
+    Args:
+        fetch (callable): Called as fetch(page=..., page_size=...) and returns a raw API response
+
+        page (int): First page to fetch
+
+        page_size (int): Number of items per page
+
+        prefetch (int): Number of following pages fetched concurrently while the current one is consumed.
+        Records are still yielded in page order. 0 fetches pages one after another
+    """
+    if prefetch > 0:
+        yield from _iter_pages_prefetch(fetch, page, page_size, prefetch)
+        return
+    while True:
+        items = _page_items(fetch(page=page, page_size=page_size))
+        yield from items
+        if len(items) < page_size:
+            return
+        page += 1
+
+
+def _iter_pages_prefetch(fetch, page, page_size, prefetch):
+    executor = ThreadPoolExecutor(max_workers=prefetch)
+    pending = deque()
+    next_page = page
+    try:
+        for _ in range(prefetch + 1):
+            pending.append(executor.submit(fetch, page=next_page, page_size=page_size))
+            next_page += 1
+        while pending:
+            items = _page_items(pending.popleft().result())
+            if len(items) < page_size:
+                # Last page: pages fetched speculatively past it are empty, drop them
+                yield from items
+                return
+            pending.append(executor.submit(fetch, page=next_page, page_size=page_size))
+            next_page += 1
+            yield from items
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def iter_before(fetch, before: str | None = None, limit: int = 40, cursor_key: str = 'tx_hash'):
+    """
+    Yield records one by one from an endpoint paginated with a `before` signature cursor
+
+    Args:
+        fetch (callable): Called as fetch(before=..., limit=...) and returns a raw API response
+
+        before (str | None): Signature to start before, None to start from the newest record
+
+        limit (int): Number of items per request
+
+        cursor_key (str): Record field holding the signature passed as `before` for the next request
+    """
+    while True:
+        items = _page_items(fetch(before=before, limit=limit))
+        yield from items
+        if len(items) < limit:
+            return
+        before = items[-1][cursor_key]
+
+
+async def aiter_pages(fetch, page: int = 1, page_size: int = 100, prefetch: int = 0):
+    """
+    Async version of iter_pages for fetch functions returning awaitables
+    """
+    pending = deque()
+    next_page = page
+    try:
+        for _ in range(prefetch + 1):
+            pending.append(asyncio.ensure_future(fetch(page=next_page, page_size=page_size)))
+            next_page += 1
+        while pending:
+            items = _page_items(await pending.popleft())
+            if len(items) < page_size:
+                for item in items:
+                    yield item
+                return
+            pending.append(asyncio.ensure_future(fetch(page=next_page, page_size=page_size)))
+            next_page += 1
+            for item in items:
+                yield item
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def aiter_before(fetch, before: str | None = None, limit: int = 40, cursor_key: str = 'tx_hash'):
+    """
+    Async version of iter_before for fetch functions returning awaitables
+    """
+    while True:
+        items = _page_items(await fetch(before=before, limit=limit))
+        for item in items:
+            yield item
+        if len(items) < limit:
+            return
+        before = items[-1][cursor_key]
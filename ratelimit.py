@@ -0,0 +1,83 @@
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float | None = None):
+        """
+        Thread-safe token bucket rate limiter. One instance can be shared by several transports, threads and
+        event loops: callers reserve tokens under a lock and then sleep outside of it, so requests are spread evenly
+        at `rate` instead of going out in bursts
+
+        Args:
+            rate (float): Tokens added per second, i.e. the sustained requests per second
+
+            capacity (float | None): Maximum burst size. Defaults to one second worth of tokens
+        """
+        if rate <= 0:
+            raise ValueError('rate must be positive')
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_minute(cls, requests_per_minute: float, capacity: float | None = None) -> "TokenBucket":
+        """
+        Build a bucket from a requests-per-minute plan limit, e.g. TokenBucket.per_minute(1000)
+        """
+        return cls(requests_per_minute / 60, capacity)
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _reserve(self, tokens):
+        # Tokens may go negative: that debt is the queue of callers already waiting for their turn
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self, tokens: float = 1):
+        """
+        Block the calling thread until `tokens` are available
+        """
+        wait = self._reserve(tokens)
+        if wait:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: float = 1):
+        """
+        Wait without blocking the event loop until `tokens` are available
+        """
+        wait = self._reserve(tokens)
+        if wait:
+            await asyncio.sleep(wait)
+
+    @property
+    def available(self) -> float:
+        """
+        Tokens currently in the bucket. Negative when callers are queued waiting for tokens
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+    @property
+    def fill_level(self) -> float:
+        """
+        Fraction of the bucket that is full, from 0.0 (saturated) to 1.0 (idle)
+        """
+        return max(0.0, self.available) / self.capacity
+
+    @property
+    def saturation(self) -> float:
+        """
+        How close the client is to the limit, from 0.0 (idle) to 1.0 (running at the limit)
+        """
+        return 1.0 - self.fill_level
@@ -0,0 +1,107 @@
+import random
+import time
+from email.utils import parsedate_to_datetime
+
+
+class RetryPolicy:
+    def __init__(self, max_retries: int = 5, backoff_factor: float = 0.5, max_backoff: float = 30.0,
+                 jitter: bool = True, statuses: frozenset[int] = frozenset({429, 500, 502, 503, 504}),
+                 methods: frozenset[str] = frozenset({'GET'}), deadline: float | None = 120.0,
+                 respect_retry_after: bool = True, on_retry=None):
+        """
+        Retry policy used by Transport and AsyncTransport for transient failures
+
+        Args:
+            max_retries (int): Maximum number of retries after the first attempt. 0 disables retries
+
+            backoff_factor (float): Base delay in seconds, the n-th retry waits backoff_factor * 2 ** n
+
+            max_backoff (float): Upper bound for a single delay in seconds
+
+            jitter (bool): Pick a random delay between 0 and the backoff ("full jitter") so that parallel
+            clients don't retry in lockstep
+
+            statuses (frozenset[int]): HTTP statuses that are retried
+
+            methods (frozenset[str]): HTTP methods that are retried. Only idempotent GETs by default
+
+            deadline (float | None): Total time budget in seconds for one call including all retries
+
+            respect_retry_after (bool): Wait at least as long as the Retry-After header asks for
+
+            on_retry (callable | None): Called as on_retry(url, attempt, delay, status, error) before each retry.
+            status is None for connection errors, error is None for bad statuses
+        """
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.statuses = statuses
+        self.methods = methods
+        self.deadline = deadline
+        self.respect_retry_after = respect_retry_after
+        self.on_retry = on_retry
+
+    @staticmethod
+    def parse_retry_after(value: str | None) -> float | None:
+        """
+        Parse a Retry-After header given either in seconds or as an HTTP date
+        """
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def can_resend(self, attempt: int, elapsed: float) -> bool:
+        """
+        True while one more attempt fits within max_retries and the deadline. Used for resends that need no
+        backoff, such as moving a rejected request to another key of a KeyPool
+        """
+        return attempt < self.max_retries and (self.deadline is None or elapsed < self.deadline)
+
+    def remaining(self, elapsed: float) -> float | None:
+        """
+        Seconds left before the deadline, None when there is no deadline
+        """
+        return max(0.0, self.deadline - elapsed) if self.deadline is not None else None
+
+    def get_delay(self, method: str, attempt: int, elapsed: float, status: int | None = None,
+                  retry_after: str | None = None) -> float | None:
+        """
+        Return how long to sleep before the next attempt, or None if the call should not be retried
+
+        Args:
+            method (str): HTTP method of the request
+
+            attempt (int): Number of retries already made
+
+            elapsed (float): Seconds since the first attempt started
+
+            status (int | None): Response status, None for connection errors
+
+            retry_after (str | None): Value of the Retry-After response header
+        """
+        if method not in self.methods or attempt >= self.max_retries:
+            return None
+        if status is not None and status not in self.statuses:
+            return None
+        delay = min(self.max_backoff, self.backoff_factor * 2 ** attempt)
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        if self.respect_retry_after:
+            server_delay = self.parse_retry_after(retry_after)
+            if server_delay is not None:
+                delay = max(delay, server_delay)
+        if self.deadline is not None and elapsed + delay > self.deadline:
+            return None
+        return delay
+
+    def notify(self, url, attempt, delay, status=None, error=None):
+        if self.on_retry is not None:
+            self.on_retry(url, attempt, delay, status, error)
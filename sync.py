@@ -0,0 +1,163 @@
+import time
+from functools import partial
+
+from checkpoint import CheckpointStore, row_key
+from pagination import _page_items
+
+
+def _field(row, name):
+    return row.get(name) if isinstance(row, dict) else getattr(row, name, None)
+
+
+class IncrementalSync:
+    def __init__(self, account, store: CheckpointStore | None = None, page_size: int = 100, limit: int = 40,
+                 max_pages: int = 20):
+        """
+        Poll accounts for new records only. A high-water mark is kept per address and endpoint: the newest
+        signature for transactions, the newest block_time (plus the keys of the rows of that second) for the
+        paged activity endpoints. Every sync walks from the newest record backwards, stops at the first page
+        overlapping the mark and returns only the records that are new, newest first. A wallet without new
+        activity costs a single request. The first sync of an address only reads the newest page and returns it
+
+        Usage:
+            sync = IncrementalSync(api.account, CheckpointStore('marks.db'))
+            for address in wallets:
+                new = sync.balance_change_activities(address)
+
+        Args:
+            account (AccountAPIV2): Client used for the requests
+
+            store (CheckpointStore | None): Where marks are kept between runs. None keeps them in memory
+
+            page_size (int): Items per page for the page-numbered endpoints
+
+            limit (int): Items per request for transactions. Enum: 10, 20, 30, 40
+
+            max_pages (int): Most pages read in one sync. Bounds the cost after a long pause; the mark still moves
+            to the newest record, so older gaps are left to a backfill
+        """
+        self.account = account
+        self.store = store
+        self.page_size = page_size
+        self.limit = limit
+        self.max_pages = max_pages
+        self._marks = {}
+
+    def _get_mark(self, name):
+        if self.store is not None:
+            return self.store.get(name)
+        return self._marks.get(name)
+
+    def _set_mark(self, name, mark):
+        if self.store is not None:
+            self.store.commit(name, mark)
+        else:
+            self._marks[name] = mark
+
+    def mark(self, endpoint: str, address: str) -> dict | None:
+        """
+        Return the current high-water mark of an address for 'transactions', 'transfer',
+        'balance_change_activities' or 'defi_activities'
+        """
+        return self._get_mark(f'sync:{endpoint}:{address}')
+
+    def reset(self, endpoint: str, address: str):
+        name = f'sync:{endpoint}:{address}'
+        if self.store is not None:
+            self.store.reset(name)
+        else:
+            self._marks.pop(name, None)
+
+    def sync_signatures(self, name: str, fetch) -> list:
+        """
+        Return the records of a `before`-cursor endpoint newer than the signature saved under `name`
+
+        Args:
+            name (str): Key of the mark in the store
+
+            fetch (callable): Called as fetch(before=..., limit=...), e.g. partial(api.account.transactions, address)
+        """
+        mark = self._get_mark(name)
+        last = mark['signature'] if mark else None
+        delta = []
+        before = None
+        for _ in range(self.max_pages):
+            items = _page_items(fetch(before=before, limit=self.limit))
+            for item in items:
+                if _field(item, 'tx_hash') == last:
+                    break
+                delta.append(item)
+            else:
+                if mark is not None and len(items) == self.limit:
+                    before = _field(items[-1], 'tx_hash')
+                    continue
+            break
+        if delta:
+            self._set_mark(name, {'signature': _field(delta[0], 'tx_hash'), 'updated': int(time.time())})
+        return delta
+
+    def sync_block_time(self, name: str, fetch) -> list:
+        """
+        Return the records of a page-numbered endpoint newer than the block_time saved under `name`. Rows of
+        the mark's own second that were already returned are recognised by key and skipped
+
+        Args:
+            name (str): Key of the mark in the store
+
+            fetch (callable): Called with block_time, page, page_size, sort_by and sort_order, e.g.
+            partial(api.account.transfer, address)
+        """
+        mark = self._get_mark(name)
+        since = mark['block_time'] if mark else None
+        known = set(mark['keys']) if mark else set()
+        # The time filter already makes the API skip everything older than the mark
+        block_time = [since, int(time.time()) + 3600] if since is not None else None
+        delta = []
+        for page in range(1, self.max_pages + 1):
+            items = _page_items(fetch(block_time=block_time, page=page, page_size=self.page_size,
+                                      sort_by='block_time', sort_order='desc'))
+            overlap = False
+            for item in items:
+                item_time = _field(item, 'block_time')
+                if since is not None and item_time <= since:
+                    overlap = True
+                    if item_time < since or row_key(item) in known:
+                        continue
+                delta.append(item)
+            if overlap or mark is None or len(items) < self.page_size:
+                break
+        if delta:
+            newest = _field(delta[0], 'block_time')
+            keys = [row_key(item) for item in delta if _field(item, 'block_time') == newest]
+            if newest == since:
+                keys += known
+            self._set_mark(name, {'block_time': newest, 'keys': keys, 'updated': int(time.time())})
+        return delta
+
+    def transactions(self, address: str) -> list:
+        """
+        New transactions of an account since the last sync, newest first
+        """
+        return self.sync_signatures(f'sync:transactions:{address}', partial(self.account.transactions, address))
+
+    def transfer(self, address: str, **filters) -> list:
+        """
+        New transfers of an account since the last sync, newest first. Accepts the filters of transfer()
+        """
+        return self.sync_block_time(f'sync:transfer:{address}', partial(self.account.transfer, address, **filters))
+
+    def balance_change_activities(self, address: str, **filters) -> list:
+        """
+        New balance change activities of an account since the last sync, newest first. Accepts the filters of
+        balance_change_activities()
+        """
+        fetch = partial(self.account.balance_change_activities, address, **filters)
+        return self.sync_block_time(f'sync:balance_change_activities:{address}', fetch)
+
+    def defi_activities(self, address: str, **filters) -> list:
+        """
+        New defi activities of an account since the last sync, newest first. Accepts the filters of
+        defi_activities()
+        """
+        fetch = partial(self.account.defi_activities, address, **filters)
+        return self.sync_block_time(f'sync:defi_activities:{address}', fetch)
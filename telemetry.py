@@ -0,0 +1,210 @@
+from functools import partial
+
+try:
+    import prometheus_client
+except ImportError:  # optional, needed for PrometheusExporter
+    prometheus_client = None
+
+try:
+    from opentelemetry import trace, metrics
+    from opentelemetry.metrics import Observation
+    from opentelemetry.trace import SpanKind, Status, StatusCode
+except ImportError:  # optional, needed for OpenTelemetryExporter
+    trace = metrics = None
+
+from instrument import Hooks
+
+# Prometheus histogram buckets in seconds, sized for API calls rather than the prometheus_client web defaults
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def series_name(event) -> str:
+    # 'account/transfer' -> 'account.transfer'; calls outside the PRO API share one series
+    return event.endpoint.replace('/', '.') if event.endpoint else 'other'
+
+
+class _Exporter:
+    """
+    Hook registration shared by the exporters, which define _before(transport, event) and
+    _after(transport, event). Nothing is registered until install(), so a client without an exporter keeps its
+    hook-free fast path
+    """
+
+    def __init__(self):
+        self._installed = {}
+
+    def install(self, target):
+        """
+        Start exporting the calls of an APIV2 client (and all of its sub-clients) or of a transport
+        """
+        transport = getattr(target, '_transport', target)
+        if transport in self._installed:
+            return self
+        hooks = (partial(self._before, transport), partial(self._after, transport))
+        if transport.hooks is None:
+            transport.hooks = Hooks()
+        transport.hooks.add(*hooks)
+        self._installed[transport] = hooks
+        return self
+
+    def uninstall(self, target=None):
+        """
+        Stop exporting the calls of `target`, or of every client it was installed on
+        """
+        transports = [getattr(target, '_transport', target)] if target is not None else list(self._installed)
+        for transport in transports:
+            hooks = self._installed.pop(transport, None)
+            if hooks is None:
+                continue
+            transport.hooks.remove(*hooks)
+            if not transport.hooks:
+                transport.hooks = None
+
+    def _saturation(self):
+        limiters = [transport.rate_limiter for transport in self._installed if transport.rate_limiter is not None]
+        return max((limiter.saturation for limiter in limiters), default=0.0)
+
+    @staticmethod
+    def _compute_units(transport, event):
+        # Estimated from the budget's cost table: only calls that were actually sent are charged
+        if transport.budget is None or event.endpoint is None or not event.attempts:
+            return 0
+        return transport.budget.cost(event.endpoint)
+
+
+class PrometheusExporter(_Exporter):
+    def __init__(self, registry=None, namespace: str = 'solscan', buckets=LATENCY_BUCKETS):
+        """
+        Publish request counts, errors, latency histograms, in-flight gauges, rate limiter saturation and compute
+        unit spend per endpoint as Prometheus metrics. Endpoints are labelled like 'account.transfer'. Compute
+        units are the estimates of the transport's ComputeUnitBudget and are only counted when it has one
+
+        Usage:
+            exporter = PrometheusExporter().install(api)
+            prometheus_client.start_http_server(9100)
+
+        Args:
+            registry (prometheus_client.CollectorRegistry | None): Registry the metrics are added to.
+            Defaults to the global registry
+
+            namespace (str): Prefix of the metric names
+
+            buckets (Iterable[float]): Upper bounds of the latency histogram buckets, in seconds
+        """
+        if prometheus_client is None:
+            raise ImportError('PrometheusExporter requires prometheus_client: pip install prometheus-client')
+        super().__init__()
+        registry = registry if registry is not None else prometheus_client.REGISTRY
+        options = {'namespace': namespace, 'registry': registry}
+        self.requests = prometheus_client.Counter('requests', 'API calls by endpoint and HTTP status',
+                                                  ['endpoint', 'status'], **options)
+        self.errors = prometheus_client.Counter('request_errors', 'API calls that raised', ['endpoint'], **options)
+        self.retries = prometheus_client.Counter('request_retries', 'Requests resent after a failure',
+                                                 ['endpoint'], **options)
+        self.cache_hits = prometheus_client.Counter('cache_hits', 'API calls answered by the response cache',
+                                                    ['endpoint'], **options)
+        self.latency = prometheus_client.Histogram('request_duration_seconds',
+                                                   'Duration of API calls sent to the network, retries included',
+                                                   ['endpoint'], buckets=tuple(buckets), **options)
+        self.in_flight = prometheus_client.Gauge('requests_in_flight', 'API calls in progress', ['endpoint'],
+                                                 **options)
+        self.compute_units = prometheus_client.Counter('compute_units', 'Estimated compute units spent',
+                                                       ['endpoint'], **options)
+        self.saturation = prometheus_client.Gauge('rate_limiter_saturation',
+                                                  'Rate limiter usage from 0 (idle) to 1 (at the limit)', **options)
+        self.saturation.set_function(self._saturation)
+
+    def _before(self, transport, event):
+        self.in_flight.labels(series_name(event)).inc()
+
+    def _after(self, transport, event):
+        endpoint = series_name(event)
+        self.in_flight.labels(endpoint).dec()
+        self.requests.labels(endpoint, str(event.status) if event.status is not None else 'none').inc()
+        if event.error is not None:
+            self.errors.labels(endpoint).inc()
+        if event.cache_hit:
+            self.cache_hits.labels(endpoint).inc()
+        elif event.attempts:
+            self.latency.labels(endpoint).observe(event.total)
+            if event.retries:
+                self.retries.labels(endpoint).inc(event.retries)
+            units = self._compute_units(transport, event)
+            if units:
+                self.compute_units.labels(endpoint).inc(units)
+
+
+class OpenTelemetryExporter(_Exporter):
+    def __init__(self, tracer_provider=None, meter_provider=None, name: str = 'solscan'):
+        """
+        Emit a client span around every API call and publish the same metrics as PrometheusExporter through the
+        OpenTelemetry metrics API. Spans are children of the span current in the caller, carry the endpoint, HTTP
+        status, retries, cache hit and byte count, and are marked as errors when the call raised
+
+        Usage:
+            exporter = OpenTelemetryExporter().install(api)
+
+        Args:
+            tracer_provider (TracerProvider | None): Defaults to the global tracer provider
+
+            meter_provider (MeterProvider | None): Defaults to the global meter provider
+
+            name (str): Instrumentation scope name, also the prefix of the metric names
+        """
+        if trace is None:
+            raise ImportError('OpenTelemetryExporter requires opentelemetry-api: pip install opentelemetry-api')
+        super().__init__()
+        self.tracer = trace.get_tracer(name, tracer_provider=tracer_provider)
+        meter = metrics.get_meter(name, meter_provider=meter_provider)
+        self.requests = meter.create_counter(f'{name}.requests', unit='{call}', description='API calls')
+        self.errors = meter.create_counter(f'{name}.request.errors', unit='{call}',
+                                           description='API calls that raised')
+        self.retries = meter.create_counter(f'{name}.request.retries', unit='{request}',
+                                            description='Requests resent after a failure')
+        self.cache_hits = meter.create_counter(f'{name}.cache.hits', unit='{call}',
+                                               description='API calls answered by the response cache')
+        self.latency = meter.create_histogram(f'{name}.request.duration', unit='s',
+                                              description='Duration of API calls sent to the network')
+        self.in_flight = meter.create_up_down_counter(f'{name}.requests.in_flight', unit='{call}',
+                                                      description='API calls in progress')
+        self.compute_units = meter.create_counter(f'{name}.compute_units', unit='{unit}',
+                                                  description='Estimated compute units spent')
+        meter.create_observable_gauge(f'{name}.rate_limiter.saturation', callbacks=[self._observe_saturation],
+                                      description='Rate limiter usage from 0 (idle) to 1 (at the limit)')
+
+    def _observe_saturation(self, options):
+        return [Observation(self._saturation())]
+
+    def _before(self, transport, event):
+        endpoint = series_name(event)
+        event.context['span'] = self.tracer.start_span(
+            f'solscan {endpoint}', kind=SpanKind.CLIENT,
+            attributes={'solscan.endpoint': endpoint, 'http.request.method': event.method})
+        self.in_flight.add(1, {'endpoint': endpoint})
+
+    def _after(self, transport, event):
+        endpoint = series_name(event)
+        attributes = {'endpoint': endpoint}
+        self.in_flight.add(-1, attributes)
+        self.requests.add(1, {**attributes, 'status': str(event.status) if event.status is not None else 'none'})
+        if event.error is not None:
+            self.errors.add(1, attributes)
+        if event.cache_hit:
+            self.cache_hits.add(1, attributes)
+        elif event.attempts:
+            self.latency.record(event.total, attributes)
+            if event.retries:
+                self.retries.add(event.retries, attributes)
+            units = self._compute_units(transport, event)
+            if units:
+                self.compute_units.add(units, attributes)
+        span = event.context.pop('span')
+        if event.status is not None:
+            span.set_attribute('http.response.status_code', event.status)
+        span.set_attribute('solscan.retries', event.retries)
+        span.set_attribute('solscan.cache_hit', event.cache_hit)
+        span.set_attribute('solscan.response_bytes', event.bytes)
+        if event.error is not None:
+            span.record_exception(event.error)
+            span.set_status(Status(StatusCode.ERROR, str(event.error)))
+        span.end()
@@ -0,0 +1,49 @@
+import random
+import threading
+
+from backfill import Backfill
+
+
+def _dense_history(count=20_000, seed=1):
+    # Mostly sparse, with a burst around t=50_000 far denser than one window can hold
+    rng = random.Random(seed)
+    return [{'tx': index, 'block_time': rng.randint(50_000, 50_100) if index % 3 == 0 else rng.randint(0, 100_000)}
+            for index in range(count)]
+
+
+class _Endpoint:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, block_time, page, page_size):
+        start, stop = block_time
+        selected = sorted((row for row in self.rows if start <= row['block_time'] <= stop),
+                          key=lambda row: -row['block_time'])
+        with self.lock:
+            self.calls.append((start, stop, page))
+        return {'success': True, 'data': selected[(page - 1) * page_size:page * page_size]}
+
+
+def test_rows_arrive_once_in_time_order_without_deep_pages():
+    rows = _dense_history()
+    endpoint = _Endpoint(rows)
+    backfill = Backfill(endpoint, 0, 100_000, workers=4, page_size=100, target_rows=500)
+
+    result = list(backfill)
+
+    assert sorted(row['tx'] for row in result) == list(range(len(rows)))
+    assert [row['block_time'] for row in result] == sorted(row['block_time'] for row in rows)
+    assert backfill.max_pages == 5
+    assert max(page for _, _, page in endpoint.calls) <= backfill.max_pages
+
+
+def test_first_window_is_read_before_fanning_out():
+    endpoint = _Endpoint(_dense_history())
+    list(Backfill(endpoint, 0, 100_000, workers=4, page_size=100, target_rows=500))
+
+    starts = [start for start, _, _ in endpoint.calls]
+    probe = starts.index(next(start for start in starts if start != 0))
+    assert set(starts[:probe]) == {0}
+    assert 0 not in starts[probe:]
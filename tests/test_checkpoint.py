@@ -0,0 +1,76 @@
+import pytest
+
+from checkpoint import CheckpointStore, CheckpointedCrawl
+
+ROWS = [{'trans_id': f'tx{index}', 'block_time': index // 7} for index in range(1000)]
+
+
+class Crash(Exception):
+    pass
+
+
+def _endpoint(fail_at=None):
+    calls = []
+
+    def fetch(page, page_size, block_time=None, sort_by=None, sort_order=None):
+        calls.append(page)
+        if len(calls) == fail_at:
+            raise Crash('fetch')
+        rows = ROWS
+        if block_time is not None:
+            rows = [row for row in ROWS if block_time[0] <= row['block_time'] <= block_time[1]]
+        return {'success': True, 'data': rows[(page - 1) * page_size:page * page_size]}
+
+    return fetch
+
+
+class _Sink:
+    def __init__(self, fail_at=None):
+        self.rows = []
+        self.batches = 0
+        self.fail_at = fail_at
+
+    def __call__(self, batch):
+        self.batches += 1
+        if self.batches == self.fail_at:
+            raise Crash('sink')
+        self.rows.extend(batch)
+
+
+def _crawl(path, cursor, fetch):
+    return CheckpointedCrawl(CheckpointStore(path), 'rows', fetch, cursor=cursor, page_size=50, start=0,
+                             stop=ROWS[-1]['block_time'], max_page=3)
+
+
+@pytest.mark.parametrize('cursor', ['page', 'block_time'])
+@pytest.mark.parametrize('crash', ['sink', 'fetch'])
+def test_crash_and_resume_delivers_every_row_exactly_once(tmp_path, cursor, crash):
+    path = str(tmp_path / 'checkpoints.db')
+    delivered = []
+    for run in range(3):
+        # The first run dies part way through, later runs start over from a freshly opened store
+        fail_at = 5 if run == 0 else None
+        sink = _Sink(fail_at if crash == 'sink' else None)
+        fetch = _endpoint(fail_at if crash == 'fetch' else None)
+        try:
+            _crawl(path, cursor, fetch).run(sink)
+        except Crash:
+            assert run == 0
+        delivered.extend(sink.rows)
+
+    assert len(delivered) == len(ROWS)
+    assert sorted(row['trans_id'] for row in delivered) == sorted(row['trans_id'] for row in ROWS)
+    assert _crawl(path, cursor, _endpoint()).state['done']
+
+
+def test_iterating_redelivers_the_batch_in_hand_after_a_crash(tmp_path):
+    path = str(tmp_path / 'checkpoints.db')
+    first = []
+    for batch in _crawl(path, 'page', _endpoint()):
+        first.append(batch)
+        if len(first) == 3:
+            break  # the third batch was handed out but never acknowledged
+    resumed = list(_crawl(path, 'page', _endpoint()))
+
+    assert resumed[0] == first[2]
+    assert sum(map(len, first[:2] + resumed)) == len(ROWS)
@@ -0,0 +1,127 @@
+import asyncio
+import threading
+
+import pytest
+
+from transport import Transport
+
+URL = 'https://pro-api.solscan.io/v2.0/token/meta'
+
+
+def test_sync_callers_share_one_fetch():
+    transport = Transport()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fetch(url, headers, params, event=None):
+        calls.append(url)
+        started.set()
+        release.wait(5)
+        return {'success': True, 'data': {'calls': len(calls)}}
+
+    transport._fetch = fetch
+    results = []
+    leader = threading.Thread(target=lambda: results.append(transport.get(URL, params={'address': 'a'})))
+    leader.start()
+    assert started.wait(5)
+    follower = threading.Thread(target=lambda: results.append(transport.get(URL, params={'address': 'a'})))
+    follower.start()
+    while not transport.coalesced:
+        threading.Event().wait(0.001)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert len(calls) == 1
+    assert transport.coalesced == 1
+    assert results == [{'success': True, 'data': {'calls': 1}}] * 2
+    assert not transport._inflight
+
+
+def test_sync_followers_get_the_leader_error():
+    transport = Transport()
+    started = threading.Event()
+    release = threading.Event()
+
+    def fetch(url, headers, params, event=None):
+        started.set()
+        release.wait(5)
+        raise ValueError('Error: 500: boom')
+
+    transport._fetch = fetch
+    errors = []
+
+    def call():
+        try:
+            transport.get(URL)
+        except ValueError as exc:
+            errors.append(str(exc))
+
+    threads = [threading.Thread(target=call) for _ in range(3)]
+    threads[0].start()
+    assert started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    while transport.coalesced < 2:
+        threading.Event().wait(0.001)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert errors == ['Error: 500: boom'] * 3
+    assert not transport._inflight
+
+
+def test_async_leader_cancellation_leaves_followers_running():
+    pytest.importorskip('aiohttp')
+    from transport import AsyncTransport
+
+    async def main():
+        transport = AsyncTransport()
+        release = asyncio.Event()
+        calls = []
+
+        async def fetch(url, headers, params, event=None):
+            calls.append(url)
+            await release.wait()
+            return {'success': True, 'data': 'shared'}
+
+        transport._fetch = fetch
+        leader = asyncio.ensure_future(transport.get(URL))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(transport.get(URL))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await follower == {'success': True, 'data': 'shared'}
+        assert leader.cancelled()
+        assert len(calls) == 1
+        assert transport.coalesced == 1
+        assert not transport._inflight
+
+    asyncio.run(main())
+
+
+def test_async_wait_for_timeout_of_one_caller():
+    pytest.importorskip('aiohttp')
+    from transport import AsyncTransport
+
+    async def main():
+        transport = AsyncTransport()
+
+        async def fetch(url, headers, params, event=None):
+            await asyncio.sleep(0.05)
+            return {'success': True, 'data': 'shared'}
+
+        transport._fetch = fetch
+        impatient = asyncio.wait_for(transport.get(URL), 0.01)
+        patient = transport.get(URL)
+        results = await asyncio.gather(impatient, patient, return_exceptions=True)
+
+        assert isinstance(results[0], asyncio.TimeoutError)
+        assert results[1] == {'success': True, 'data': 'shared'}
+
+    asyncio.run(main())
@@ -0,0 +1,123 @@
+import inspect
+from urllib.parse import urlsplit, parse_qsl
+
+import pytest
+
+from client import APIV2
+
+BASE = 'https://pro-api.solscan.io/v2.0/'
+
+_TRANSFER = ['address', 'activity_type[]', 'token_account', 'from', 'to', 'token', 'amount[]', 'exclude_amount_zero',
+             'flow', 'block_time[]', 'page', 'page_size', 'sort_by', 'sort_order']
+_DEFI = ['address', 'activity_type[]', 'from', 'platform[]', 'source[]', 'token', 'block_time[]', 'page', 'page_size',
+         'sort_by', 'sort_order']
+
+# Path and query parameter names of every client method, as listed in the Solscan PRO API v2 reference
+DOCUMENTED = [
+    ('account', 'defi_activities', 'account/defi/activities', _DEFI),
+    ('account', 'transfer', 'account/transfer', _TRANSFER),
+    ('account', 'token_accounts', 'account/token-accounts', ['address', 'type', 'hide_zero', 'page', 'page_size']),
+    ('account', 'balance_change_activities', 'account/balance_change',
+     ['address', 'token', 'remove_spam', 'amount[]', 'flow', 'block_time[]', 'page', 'page_size', 'sort_by',
+      'sort_order']),
+    ('account', 'transactions', 'account/transactions', ['address', 'before', 'limit']),
+    ('account', 'stake', 'account/stake', ['address', 'page', 'page_size']),
+    ('account', 'detail', 'account/detail', ['address']),
+    ('account', 'rewards_export', 'account/reward/export', ['address', 'time_from', 'time_to']),
+    ('account', 'transfer_export', 'account/transfer/export',
+     ['address', 'activity_type[]', 'token_account', 'from', 'to', 'token', 'amount[]', 'exclude_amount_zero', 'flow',
+      'block_time[]']),
+    ('token', 'meta', 'token/meta', ['address']),
+    ('token', 'markets', 'token/markets', ['token[]', 'sort_by', 'program[]', 'page', 'page_size']),
+    ('token', 'market_info', 'token/market/info', ['address']),
+    ('token', 'transfer', 'token/transfer', _TRANSFER),
+    ('token', 'defi_activities', 'token/defi/activities', _DEFI),
+    ('token', 'token_list', 'token/list', ['page', 'page_size', 'sort_by', 'sort_order']),
+    ('token', 'market_volume', 'token/market/volume', ['address', 'time[]']),
+    ('token', 'trending', 'token/trending', ['limit']),
+    ('token', 'token_price', 'token/price', ['address', 'time[]']),
+    ('token', 'holders', 'token/holders', ['address', 'page', 'page_size', 'from_amount', 'to_amount']),
+    ('token', 'top', 'token/top', []),
+    ('nft', 'news', 'nft/news', ['filter', 'page', 'page_size']),
+    ('nft', 'activities', 'nft/activities',
+     ['activity_type[]', 'from', 'to', 'currency_token', 'collection', 'price[]', 'source[]', 'token', 'block_time[]',
+      'page', 'page_size']),
+    ('nft', 'collection_lists', 'nft/collection/lists',
+     ['range', 'collection', 'page', 'page_size', 'sort_by', 'sort_order']),
+    ('nft', 'collection_items', 'nft/collection/items', ['collection', 'page', 'page_size', 'sort_by']),
+    ('transaction', 'last', 'transaction/last', ['limit', 'filter']),
+    ('transaction', 'detail', 'transaction/detail', ['tx']),
+    ('transaction', 'actions', 'transaction/actions', ['tx']),
+    ('block', 'last', 'block/last', ['limit']),
+    ('block', 'transactions', 'block/transactions', ['block', 'page', 'page_size']),
+    ('block', 'detail', 'block/detail', ['block']),
+    ('monitoring', 'usage', 'monitor/usage', []),
+]
+
+
+class _Capture:
+    key_pool = None
+
+    def __init__(self):
+        self.urls = []
+
+    def get(self, url, headers=None, params=None):
+        self.urls.append(url)
+        return {'success': True, 'data': []}
+
+
+def _sample(parameter):
+    annotation = str(parameter.annotation)
+    if 'list[str]' in annotation:
+        return ['a', 'b']
+    if 'list[int]' in annotation:
+        return [1, 2]
+    if 'bool' in annotation:
+        return True
+    if 'int' in annotation:
+        return 10
+    return 'x'
+
+
+@pytest.mark.parametrize('client, method, path, names', DOCUMENTED, ids=[f'{c}.{m}' for c, m, _, _ in DOCUMENTED])
+def test_url_matches_documented_path_and_query(client, method, path, names):
+    transport = _Capture()
+    bound = getattr(getattr(APIV2('key', transport), client), method)
+    bound(**{name: _sample(parameter) for name, parameter in inspect.signature(bound).parameters.items()})
+    scheme, netloc, url_path, query, _ = urlsplit(transport.urls[-1])
+    assert f'{scheme}://{netloc}{url_path}' == BASE + path
+    sent = []
+    for name, _ in parse_qsl(query):
+        if not sent or sent[-1] != name or not name.endswith('[]'):
+            sent.append(name)
+    assert sent == names
+
+
+def test_values_are_escaped_and_type_checked():
+    transport = _Capture()
+    api = APIV2('key', transport)
+    api.account.transfer('a b/c', token='x&y=z')
+    assert transport.urls[-1] == BASE + 'account/transfer?address=a%20b%2Fc&token=x%26y%3Dz'
+    with pytest.raises(TypeError):
+        api.account.transfer('A', page='1')
+    with pytest.raises(TypeError):
+        api.account.transfer('A', amount=['1'])
+    with pytest.raises(TypeError):
+        api.account.rewards_export('A', 1, None)
+
+
+def test_fast_paths_match_the_encoders():
+    transport = _Capture()
+    api = APIV2('key', transport)
+    api.account.transfer('A', activity_type=['a b', 'ACTIVITY_SPL_TRANSFER'], amount=[1, 2, 3], block_time=(1, 2))
+    assert transport.urls[-1] == (BASE + 'account/transfer?address=A&activity_type[]=a%20b'
+                                  '&activity_type[]=ACTIVITY_SPL_TRANSFER&amount[]=1&amount[]=2&amount[]=3'
+                                  '&block_time[]=1&block_time[]=2')
+    api.account.transfer('A', activity_type=[], token='')
+    assert transport.urls[-1] == BASE + 'account/transfer?address=A&token='
+    api.token.token_list(sort_by='block_time')
+    assert transport.urls[-1] == BASE + 'token/list?page=1&sort_by=block_time'
+    for bad in ({'activity_type': [b'ab']}, {'activity_type': [['x']]}, {'token': ['x']}, {'token': b'x'},
+                {'amount': [1, True]}, {'exclude_amount_zero': 1}):
+        with pytest.raises(TypeError, match='Wrong type for input args'):
+            api.account.transfer('A', **bad)
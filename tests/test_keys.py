@@ -0,0 +1,29 @@
+import time
+
+from keys import KeyPool
+from retry import RetryPolicy
+from transport import Transport
+from test_retry import _serve
+
+TOO_MANY = b'HTTP/1.1 429 Too Many Requests\r\nConnection: close\r\nContent-Length: 0\r\n\r\n'
+
+
+def test_acquire_gives_up_when_no_key_comes_back_in_time():
+    pool = KeyPool(['a'], cooldown=60, usage_interval=None)
+    pool.release(pool.acquire(), 429)
+
+    started = time.monotonic()
+    assert pool.acquire(timeout=1.0) is None
+    assert time.monotonic() - started < 0.5
+
+
+def test_cooling_key_pool_returns_the_429_within_the_deadline():
+    url = _serve([TOO_MANY] * 5)
+    pool = KeyPool(['a'], cooldown=60, usage_interval=None)
+    policy = RetryPolicy(backoff_factor=0.05, jitter=False, deadline=2.0)
+
+    started = time.monotonic()
+    with Transport(retry=policy, key_pool=pool, timeout=5) as transport:
+        response = transport._request('GET', url)
+    assert response.status_code == 429
+    assert time.monotonic() - started < policy.deadline
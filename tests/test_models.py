@@ -0,0 +1,35 @@
+from columnar import ColumnBuilder, DEFI_ACTIVITY_SCHEMA
+from models import DefiActivity, Router, decode_records
+
+ROW = {
+    'block_id': 300000001, 'trans_id': 'sig', 'block_time': 1700000000, 'activity_type': 'ACTIVITY_TOKEN_SWAP',
+    'from_address': 'owner', 'to_address': 'pool', 'sources': ['amm'], 'platform': 'jupiter',
+    'routers': {'token1': 'So11', 'token1_decimals': 9, 'amount1': 5, 'token2': 'EPjF', 'token2_decimals': 6,
+                'amount2': 7, 'fee_bps': 30,
+                'child_routers': [{'token1': 'So11', 'token1_decimals': 9, 'amount1': 5, 'token2': 'mSoL',
+                                   'token2_decimals': 9, 'amount2': 4, 'program': 'whirlpool'},
+                                  {'token1': 'mSoL', 'token1_decimals': 9, 'amount1': 4, 'token2': 'EPjF',
+                                   'token2_decimals': 6, 'amount2': 7, 'child_routers': []}]},
+}
+
+
+def test_defi_activity_keeps_routers_nested_and_complete():
+    record = DefiActivity.from_dict(ROW)
+    assert isinstance(record.routers, Router)
+    assert record.routers.amount2 == 7
+    assert record.routers.extra == {'fee_bps': 30}
+    hops = record.routers.child_routers
+    assert [hop.token2 for hop in hops] == ['mSoL', 'EPjF']
+    assert hops[0].extra == {'program': 'whirlpool'} and hops[0].child_routers is None
+    assert hops[1].extra is None and hops[1].child_routers == ()
+    restored = record.to_dict()
+    assert restored['routers']['child_routers'][1]['child_routers'] == []
+    assert restored['routers']['fee_bps'] == 30
+    assert DefiActivity.from_dict(restored) == record
+
+
+def test_typed_defi_rows_fill_the_same_columns_as_dicts():
+    typed = decode_records({'success': True, 'data': [ROW]}, DefiActivity)['data']
+    raw = ColumnBuilder(DEFI_ACTIVITY_SCHEMA).extend([ROW])
+    records = ColumnBuilder(DEFI_ACTIVITY_SCHEMA).extend(typed)
+    assert records._columns == raw._columns
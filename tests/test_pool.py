@@ -0,0 +1,33 @@
+import inspect
+
+import pytest
+
+import bulk
+import enrich
+from blockstream import BlockStream
+from client import APIV2
+from transport import Transport
+from watcher import WalletWatcher
+
+
+def _default(function, name):
+    return inspect.signature(function).parameters[name].default
+
+
+POOL = _default(Transport, 'pool_maxsize')
+BULK = [(namespace, name) for namespace in ('account', 'token') for name in dir(getattr(APIV2('key'), namespace))
+        if name.startswith(('bulk_', 'iter_bulk_'))]
+
+
+@pytest.mark.parametrize('namespace, name', BULK)
+def test_default_bulk_workers_fit_the_pool(namespace, name):
+    assert _default(getattr(getattr(APIV2('key'), namespace), name), 'max_workers') <= POOL
+
+
+def test_default_helper_fan_out_fits_the_pool():
+    assert _default(bulk.iter_bulk, 'max_workers') <= POOL
+    assert _default(enrich.iter_enriched, 'max_workers') <= POOL
+    assert _default(APIV2('key').transaction.iter_enriched, 'max_workers') <= POOL
+    assert _default(WalletWatcher, 'workers') <= POOL
+    # Every block stream worker reads its slot's transaction pages with `prefetch` extra pages in flight
+    assert _default(BlockStream, 'workers') * (_default(BlockStream, 'prefetch') + 1) <= POOL
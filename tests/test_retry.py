@@ -0,0 +1,40 @@
+import socket
+import threading
+
+from retry import RetryPolicy
+from transport import Transport
+
+BODY = b'{"success": true, "data": []}'
+
+
+def _serve(responses):
+    """
+    Answer one connection per entry of `responses` with its raw bytes, then close the connection
+    """
+    server = socket.create_server(('127.0.0.1', 0))
+
+    def run():
+        for response in responses:
+            connection, _ = server.accept()
+            with connection:
+                connection.recv(65536)
+                connection.sendall(response)
+        server.close()
+
+    threading.Thread(target=run, daemon=True).start()
+    return f'http://127.0.0.1:{server.getsockname()[1]}/v2.0/token/meta'
+
+
+def test_reset_while_reading_the_body_is_retried():
+    # Headers promise more body than is sent before the connection goes away
+    cut = b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: 500\r\n\r\n{"success"'
+    whole = (b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nConnection: close\r\n'
+             b'Content-Length: %d\r\n\r\n%s' % (len(BODY), BODY))
+    url = _serve([cut, whole])
+    retries = []
+    policy = RetryPolicy(backoff_factor=0.0, on_retry=lambda *args: retries.append(args))
+
+    with Transport(retry=policy, timeout=5) as transport:
+        assert transport.get(url) == {'success': True, 'data': []}
+    assert len(retries) == 1
+    assert retries[0][4] is not None
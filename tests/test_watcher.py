@@ -0,0 +1,44 @@
+import asyncio
+import time
+
+from watcher import WalletWatcher
+
+
+class _Sync:
+    """
+    IncrementalSync stand-in: every wallet already has a mark and every poll finds five new rows
+    """
+
+    def __init__(self):
+        self.polls = 0
+
+    def mark(self, endpoint, address):
+        return 1
+
+    def transfer(self, address, **filters):
+        self.polls += 1
+        return [{'trans_id': f'{address}-{self.polls}-{index}', 'block_time': int(time.time())} for index in range(5)]
+
+
+def test_full_bounded_queue_holds_the_pollers_instead_of_dropping_rows():
+    async def main():
+        queue = asyncio.Queue(maxsize=2)
+        watcher = WalletWatcher(None, ['a', 'b', 'c'], queue=queue, interval=0.01, workers=2)
+        watcher.sync = sync = _Sync()
+        watcher.start()
+        # Nobody reads for a while: the queue fills up and the workers must wait for room
+        await asyncio.sleep(0.2)
+        polls = sync.polls
+        assert polls <= 2 + watcher.workers
+        received = [await queue.get() for _ in range(40)]
+        stopping = asyncio.get_running_loop().run_in_executor(None, watcher.stop)
+        while not stopping.done():
+            while not queue.empty():
+                received.append(queue.get_nowait())
+            await asyncio.sleep(0.01)
+        while not queue.empty():
+            received.append(queue.get_nowait())
+        assert len(received) == 5 * sync.polls
+        assert len({row['trans_id'] for _, row in received}) == len(received)
+
+    asyncio.run(main())
@@ -0,0 +1,584 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from functools import partial
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import aiohttp
+except ImportError:  # aiohttp is only needed by AsyncTransport
+    aiohttp = None
+
+from budget import ComputeUnitBudget
+from cache import ResponseCache, MISS, canonical_url
+from decoders import get_decoder
+from instrument import Hooks, RequestEvent
+from keys import KeyPool
+from ratelimit import TokenBucket
+from retry import RetryPolicy
+from utils import _handle_response, _handle_delete_response, _endpoint_name, _usage_url
+
+
+class Transport:
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = 32, pool_block: bool = False,
+                 keep_alive: bool = True, timeout: float | None = 30, rate_limiter: TokenBucket | None = None,
+                 retry: RetryPolicy | None = None, budget: ComputeUnitBudget | None = None,
+                 cache: ResponseCache | None = None, coalesce: bool = True, decoder: str | None = None,
+                 key_pool: KeyPool | None = None, hooks: Hooks | None = None):
+        """
+        Pooled HTTP transport shared by APIV2 and all of its sub-clients
+
+        Args:
+            pool_connections (int): Number of per-host connection pools to keep
+
+            pool_maxsize (int): Maximum number of connections kept alive per host. Requests above it open a
+            connection that is thrown away afterwards, so keep it at least as large as the threads using the
+            transport. The default covers the default fan-out of the bulk, enrichment, watcher and block stream
+            helpers (BlockStream: 8 workers each prefetching 2 pages)
+
+            pool_block (bool): Block when all connections to a host are busy instead of opening extra ones
+
+            keep_alive (bool): Reuse TCP/TLS connections between requests
+
+            timeout (float | None): Per-request timeout in seconds
+
+            rate_limiter (TokenBucket | None): Limiter every request waits on before it is sent
+
+            retry (RetryPolicy | None): Retry policy for transient errors. Defaults to RetryPolicy(), which retries
+            GETs only. Pass RetryPolicy(max_retries=0) to disable retries
+
+            budget (ComputeUnitBudget | None): Compute unit budget every API call is charged against
+
+            cache (ResponseCache | None): Cache consulted before GET requests. Hits skip the rate limiter and budget
+
+            coalesce (bool): Share one in-flight GET between all callers asking for the same canonical URL
+
+            decoder (str | None): JSON decoder for response bodies: 'orjson', 'msgspec' or 'json'.
+            None picks the fastest one installed
+
+            key_pool (KeyPool | None): Keys to spread requests over. Each request is sent with a key from the pool
+            instead of the token header of the client
+
+            hooks (Hooks | None): Callbacks run around every call with its RequestEvent. requests can't report
+            DNS/connect/TLS timings, only time to first byte and body read
+        """
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.budget = budget
+        self.cache = cache
+        self.coalesce = coalesce
+        self.coalesced = 0
+        self.decode = get_decoder(decoder)
+        self.key_pool = key_pool
+        self.hooks = hooks
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        if not keep_alive:
+            self.session.headers['Connection'] = 'close'
+
+    def _throttle(self):
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+
+    def _pick_key(self, url, kwargs, timeout=None):
+        if self.key_pool is None:
+            return None
+        key = self.key_pool.acquire(timeout)
+        if key is None:
+            raise TimeoutError('No key of the pool comes back from cooldown before the retry deadline')
+        kwargs['headers'] = headers = {**(kwargs.get('headers') or {}), 'token': key}
+        if _endpoint_name(url) is not None and self.key_pool.needs_usage(key):
+            try:
+                usage = self.session.get(_usage_url(url), headers=headers, timeout=self.timeout)
+                self.key_pool.update_usage(key, _handle_response(usage, self.decode))
+            except (ValueError, requests.RequestException):
+                pass  # the key stays in rotation until the next check
+        return key
+
+    def _release_key(self, key):
+        if key is not None:
+            self.key_pool.release(key)
+
+    def _request(self, method, url, event=None, **kwargs):
+        started = time.monotonic()
+        attempt = 0
+        rejected = None
+        while True:
+            waited = time.perf_counter() if event is not None else None
+            try:
+                key = self._pick_key(url, kwargs, self.retry.remaining(time.monotonic() - started))
+            except TimeoutError:
+                # Waiting for a key would run past the deadline: answer with the last rejection instead
+                if rejected is None:
+                    raise
+                return rejected
+            self._throttle()
+            if event is not None:
+                sent = time.perf_counter()
+                event.wait += sent - waited
+                event._attempt()
+            try:
+                response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+                if event is not None:
+                    # elapsed stops at the response headers, the body is read after it
+                    event.ttfb = response.elapsed.total_seconds()
+                    event.body = max(time.perf_counter() - sent - event.ttfb, 0.0)
+                    event.status = response.status_code
+                    event.bytes += len(response.content)
+            except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as exc:
+                self._release_key(key)
+                delay = self.retry.get_delay(method, attempt, time.monotonic() - started)
+                if delay is None:
+                    raise
+                self.retry.notify(url, attempt + 1, delay, error=exc)
+            except BaseException:
+                self._release_key(key)
+                raise
+            else:
+                rejected = response
+                if (key is not None
+                        and self.key_pool.release(key, response.status_code, response.headers.get('Retry-After'))
+                        and self.retry.can_resend(attempt, time.monotonic() - started)):
+                    # The key was rejected and another one is free: resend right away instead of backing off
+                    self.retry.notify(url, attempt + 1, 0.0, status=response.status_code)
+                    response.close()
+                    attempt += 1
+                    continue
+                if response.status_code == 200:
+                    return response
+                delay = self.retry.get_delay(method, attempt, time.monotonic() - started, response.status_code,
+                                             response.headers.get('Retry-After'))
+                if delay is None:
+                    return response
+                self.retry.notify(url, attempt + 1, delay, status=response.status_code)
+                response.close()
+            attempt += 1
+            time.sleep(delay)
+
+    def _charge(self, url, headers):
+        endpoint = _endpoint_name(url)
+        if self.budget is None or endpoint is None:
+            return
+        if self.budget.needs_reconcile():
+            try:
+                usage = self._request('GET', _usage_url(url), headers=headers)
+                self.budget.reconcile(_handle_response(usage, self.decode))
+            except (ValueError, requests.RequestException):
+                pass  # keep going on local estimates until the next reconciliation
+        delay = self.budget.reserve(endpoint)
+        if delay:
+            time.sleep(delay)
+
+    def _decode(self, response, event=None):
+        if event is None:
+            return _handle_response(response, self.decode)
+        decoding = time.perf_counter()
+        result = _handle_response(response, self.decode)
+        event.decode = time.perf_counter() - decoding
+        return result
+
+    def _observe(self, method, url, call):
+        """
+        Run call(event) between the hooks
+        """
+        event = RequestEvent(method, url)
+        self.hooks.before(event)
+        try:
+            return call(event)
+        except BaseException as exc:
+            event.error = exc
+            raise
+        finally:
+            event.total = time.perf_counter() - event._clock
+            self.hooks.after(event)
+
+    def _fetch(self, url, headers, params, event=None):
+        if event is None:
+            self._charge(url, headers)
+        else:
+            waited = time.perf_counter()
+            self._charge(url, headers)
+            event.wait += time.perf_counter() - waited
+        result = self._decode(self._request('GET', url, event, headers=headers, params=params), event)
+        if self.cache is not None:
+            self.cache.set(url, result, params)
+        return result
+
+    def get(self, url, headers=None, params=None):
+        if self.hooks is None:
+            return self._get(url, headers, params)
+        return self._observe('GET', url, partial(self._get, url, headers, params))
+
+    def _get(self, url, headers, params, event=None):
+        if self.cache is not None:
+            cached = self.cache.get(url, params)
+            if cached is not MISS:
+                if event is not None:
+                    event.cache_hit = True
+                return cached
+        if not self.coalesce:
+            return self._fetch(url, headers, params, event)
+        key = canonical_url(url, params)
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+            else:
+                self.coalesced += 1
+        if not leader:
+            if event is not None:
+                event.coalesced = True
+            return future.result()
+        try:
+            result = self._fetch(url, headers, params, event)
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+
+    def _send(self, method, url, event=None, **kwargs):
+        if method == 'DELETE':
+            return _handle_delete_response(self._request(method, url, event, **kwargs))
+        return self._decode(self._request(method, url, event, **kwargs), event)
+
+    def post(self, url, payload, headers=None):
+        if self.hooks is None:
+            return self._send('POST', url, json=payload, headers=headers)
+        return self._observe('POST', url, lambda event: self._send('POST', url, event, json=payload, headers=headers))
+
+    def put(self, url, payload, headers=None):
+        if self.hooks is None:
+            return self._send('PUT', url, json=payload, headers=headers)
+        return self._observe('PUT', url, lambda event: self._send('PUT', url, event, json=payload, headers=headers))
+
+    def delete(self, url, headers=None):
+        if self.hooks is None:
+            return self._send('DELETE', url, headers=headers)
+        return self._observe('DELETE', url, lambda event: self._send('DELETE', url, event, headers=headers))
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class AsyncTransport:
+    def __init__(self, limit: int = 1000, limit_per_host: int = 1000, keep_alive: bool = True,
+                 timeout: float | None = 30, rate_limiter: TokenBucket | None = None,
+                 retry: RetryPolicy | None = None, budget: ComputeUnitBudget | None = None,
+                 cache: ResponseCache | None = None, coalesce: bool = True, decoder: str | None = None,
+                 key_pool: KeyPool | None = None, hooks: Hooks | None = None):
+        """
+        Pooled asyncio HTTP transport shared by AsyncAPIV2 and all of its sub-clients
+
+        Args:
+            limit (int): Maximum number of simultaneously open connections, 0 for no limit
+
+            limit_per_host (int): Maximum number of simultaneously open connections per host, 0 for no limit
+
+            keep_alive (bool): Reuse TCP/TLS connections between requests
+
+            timeout (float | None): Per-request timeout in seconds
+
+            rate_limiter (TokenBucket | None): Limiter every request waits on before it is sent. The same
+            instance can be shared with sync transports
+
+            retry (RetryPolicy | None): Retry policy for transient errors. Defaults to RetryPolicy(), which retries
+            GETs only. Pass RetryPolicy(max_retries=0) to disable retries
+
+            budget (ComputeUnitBudget | None): Compute unit budget every API call is charged against
+
+            cache (ResponseCache | None): Cache consulted before GET requests. Hits skip the rate limiter and budget
+
+            coalesce (bool): Share one in-flight GET between all callers asking for the same canonical URL
+
+            decoder (str | None): JSON decoder for response bodies: 'orjson', 'msgspec' or 'json'.
+            None picks the fastest one installed
+
+            key_pool (KeyPool | None): Keys to spread requests over. Each request is sent with a key from the pool
+            instead of the token header of the client
+
+            hooks (Hooks | None): Callbacks run around every call with its RequestEvent. DNS and connect timings are
+            traced only if hooks are set before the first request, when the aiohttp session is created
+        """
+        if aiohttp is None:
+            raise ImportError('AsyncTransport requires aiohttp: pip install aiohttp')
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.budget = budget
+        self.cache = cache
+        self.coalesce = coalesce
+        self.coalesced = 0
+        self.decode = get_decoder(decoder)
+        self.key_pool = key_pool
+        self.hooks = hooks
+        self._inflight = {}
+        self.session = None
+
+    def _get_session(self):
+        # aiohttp sessions must be created inside a running event loop, so the session is built on first use
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host,
+                                             force_close=not self.keep_alive)
+            self.session = aiohttp.ClientSession(connector=connector,
+                                                 timeout=aiohttp.ClientTimeout(total=self.timeout),
+                                                 trace_configs=[_trace_config()] if self.hooks is not None else None)
+        return self.session
+
+    async def _throttle(self):
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire_async()
+
+    async def _pick_key(self, url, kwargs, timeout=None):
+        if self.key_pool is None:
+            return None
+        key = await self.key_pool.acquire_async(timeout)
+        if key is None:
+            raise TimeoutError('No key of the pool comes back from cooldown before the retry deadline')
+        kwargs['headers'] = headers = {**(kwargs.get('headers') or {}), 'token': key}
+        if _endpoint_name(url) is not None and self.key_pool.needs_usage(key):
+            try:
+                async with self._get_session().get(_usage_url(url), headers=headers) as usage:
+                    self.key_pool.update_usage(key, self._handle_response(usage.status, await usage.read()))
+            except (ValueError, aiohttp.ClientError, asyncio.TimeoutError):
+                pass  # the key stays in rotation until the next check
+        return key
+
+    def _release_key(self, key):
+        if key is not None:
+            self.key_pool.release(key)
+
+    async def _request(self, method, url, event=None, **kwargs):
+        """
+        Send a request with retries and return (status, body)
+        """
+        started = time.monotonic()
+        attempt = 0
+        if event is not None:
+            kwargs['trace_request_ctx'] = event
+        rejected = None
+        while True:
+            waited = time.perf_counter() if event is not None else None
+            try:
+                key = await self._pick_key(url, kwargs, self.retry.remaining(time.monotonic() - started))
+            except TimeoutError:
+                # Waiting for a key would run past the deadline: answer with the last rejection instead
+                if rejected is None:
+                    raise
+                return rejected
+            await self._throttle()
+            if event is not None:
+                sent = time.perf_counter()
+                event.wait += sent - waited
+                event._attempt()
+            try:
+                async with self._get_session().request(method, url, **kwargs) as response:
+                    if event is None:
+                        body = await response.read()
+                    else:
+                        reading = time.perf_counter()
+                        event.ttfb = reading - sent
+                        body = await response.read()
+                        event.body = time.perf_counter() - reading
+                        event.status = response.status
+                        event.bytes += len(body)
+                    status = response.status
+                    retry_after = response.headers.get('Retry-After')
+            except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError) as exc:
+                self._release_key(key)
+                delay = self.retry.get_delay(method, attempt, time.monotonic() - started)
+                if delay is None:
+                    raise
+                self.retry.notify(url, attempt + 1, delay, error=exc)
+            except BaseException:
+                self._release_key(key)
+                raise
+            else:
+                rejected = status, body
+                if (key is not None and self.key_pool.release(key, status, retry_after)
+                        and self.retry.can_resend(attempt, time.monotonic() - started)):
+                    # The key was rejected and another one is free: resend right away instead of backing off
+                    self.retry.notify(url, attempt + 1, 0.0, status=status)
+                    attempt += 1
+                    continue
+                if status == 200:
+                    return status, body
+                delay = self.retry.get_delay(method, attempt, time.monotonic() - started, status, retry_after)
+                if delay is None:
+                    return status, body
+                self.retry.notify(url, attempt + 1, delay, status=status)
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    def _handle_response(self, status, body):
+        if status == 200:
+            return self.decode(body)
+        raise ValueError(f'Error: {status}: {body}')
+
+    def _decode(self, status, body, event=None):
+        if event is None:
+            return self._handle_response(status, body)
+        decoding = time.perf_counter()
+        result = self._handle_response(status, body)
+        event.decode = time.perf_counter() - decoding
+        return result
+
+    async def _observe(self, method, url, call):
+        """
+        Await call(event) between the hooks
+        """
+        event = RequestEvent(method, url)
+        self.hooks.before(event)
+        try:
+            return await call(event)
+        except BaseException as exc:
+            event.error = exc
+            raise
+        finally:
+            event.total = time.perf_counter() - event._clock
+            self.hooks.after(event)
+
+    async def _charge(self, url, headers):
+        endpoint = _endpoint_name(url)
+        if self.budget is None or endpoint is None:
+            return
+        if self.budget.needs_reconcile():
+            try:
+                self.budget.reconcile(self._handle_response(*await self._request('GET', _usage_url(url),
+                                                                                 headers=headers)))
+            except (ValueError, aiohttp.ClientError, asyncio.TimeoutError):
+                pass  # keep going on local estimates until the next reconciliation
+        delay = self.budget.reserve(endpoint)
+        if delay:
+            await asyncio.sleep(delay)
+
+    async def _fetch(self, url, headers, params, event=None):
+        if event is None:
+            await self._charge(url, headers)
+        else:
+            waited = time.perf_counter()
+            await self._charge(url, headers)
+            event.wait += time.perf_counter() - waited
+        result = self._decode(*await self._request('GET', url, event, headers=headers, params=params), event)
+        if self.cache is not None:
+            self.cache.set(url, result, params)
+        return result
+
+    async def get(self, url, headers=None, params=None):
+        if self.hooks is None:
+            return await self._get(url, headers, params)
+        return await self._observe('GET', url, partial(self._get, url, headers, params))
+
+    async def _get(self, url, headers, params, event=None):
+        if self.cache is not None:
+            cached = self.cache.get(url, params)
+            if cached is not MISS:
+                if event is not None:
+                    event.cache_hit = True
+                return cached
+        if not self.coalesce:
+            return await self._fetch(url, headers, params, event)
+        key = canonical_url(url, params)
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            if event is not None:
+                event.coalesced = True
+        else:
+            # The fetch runs as its own task and every caller, the first one included, waits on it through a
+            # shield, so a caller that is cancelled (e.g. by wait_for) doesn't cancel the others
+            task = self._inflight[key] = asyncio.ensure_future(self._fetch(url, headers, params, event))
+            task.add_done_callback(partial(self._settle, key))
+        return await asyncio.shield(task)
+
+    def _settle(self, key, task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the outcome as retrieved so a failure nobody waited for isn't logged as lost
+        task.cancelled() or task.exception()
+
+    async def _send(self, method, url, event=None, **kwargs):
+        status, body = await self._request(method, url, event, **kwargs)
+        if method == 'DELETE' and status == 200 and not body.strip():
+            return None
+        return self._decode(status, body, event)
+
+    async def post(self, url, payload, headers=None):
+        if self.hooks is None:
+            return await self._send('POST', url, json=payload, headers=headers)
+        return await self._observe('POST', url,
+                                   lambda event: self._send('POST', url, event, json=payload, headers=headers))
+
+    async def put(self, url, payload, headers=None):
+        if self.hooks is None:
+            return await self._send('PUT', url, json=payload, headers=headers)
+        return await self._observe('PUT', url,
+                                   lambda event: self._send('PUT', url, event, json=payload, headers=headers))
+
+    async def delete(self, url, headers=None):
+        if self.hooks is None:
+            return await self._send('DELETE', url, headers=headers)
+        return await self._observe('DELETE', url, lambda event: self._send('DELETE', url, event, headers=headers))
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+def _trace_config():
+    """
+    aiohttp TraceConfig filling the DNS and connect timings of the RequestEvent passed as trace_request_ctx
+    """
+    async def on_dns_start(session, context, params):
+        if context.trace_request_ctx is not None:
+            context.trace_request_ctx._dns_started = time.perf_counter()
+
+    async def on_dns_end(session, context, params):
+        event = context.trace_request_ctx
+        if event is not None and event._dns_started is not None:
+            event.dns = time.perf_counter() - event._dns_started
+
+    async def on_connect_start(session, context, params):
+        if context.trace_request_ctx is not None:
+            context.trace_request_ctx._connect_started = time.perf_counter()
+
+    async def on_connect_end(session, context, params):
+        event = context.trace_request_ctx
+        if event is not None and event._connect_started is not None:
+            # Name resolution happens inside connection setup; aiohttp doesn't time the TLS handshake on its own
+            event.connect = time.perf_counter() - event._connect_started - (event.dns or 0.0)
+
+    config = aiohttp.TraceConfig()
+    config.on_dns_resolvehost_start.append(on_dns_start)
+    config.on_dns_resolvehost_end.append(on_dns_end)
+    config.on_connection_create_start.append(on_connect_start)
+    config.on_connection_create_end.append(on_connect_end)
+    return config
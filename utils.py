@@ -1,31 +1,31 @@
+import os
+import sqlite3
+
 import requests
 
+API_PREFIX = '/v2.0/'
 
-def _make_get_request(url, headers=None, params=None):
-    response = requests.get(url, headers=headers, params=params)
-    if response.status_code == 200:
-        return response.json()
-    else:
-        raise ValueError(f'Error: {response.status_code}: {response.content}')
 
+def _endpoint_name(url):
+    # 'https://pro-api.solscan.io/v2.0/account/transfer?address=...' -> 'account/transfer'
+    _, sep, path = url.partition(API_PREFIX)
+    if not sep:
+        return None
+    return path.split('?', 1)[0]
 
-def _make_post_request(url, payload, headers=None):
-    response = requests.post(url, json=payload)
-    if response.status_code == 200:
-        return response.json()
-    else:
-        raise ValueError(f'Error: {response.status_code}: {response.content}')
 
+def _usage_url(url):
+    return url.partition(API_PREFIX)[0] + API_PREFIX + 'monitor/usage'
 
-def _make_put_request(url, payload, headers=None):
-    response = requests.put(url, json=payload)
+
+def _handle_response(response, decode=None):
     if response.status_code == 200:
-        return response.json()
+        return decode(response.content) if decode is not None else response.json()
     else:
         raise ValueError(f'Error: {response.status_code}: {response.content}')
 
-def _make_delete_request(url):
-    response = requests.delete(url)
+
+def _handle_delete_response(response):
     # Check if the response contains any content
     if response.status_code == 200:
         try:
@@ -38,3 +38,36 @@ def _make_delete_request(url):
             raise ValueError("Received unexpected response format from API")
     else:
         response.raise_for_status()  # Handle other HTTP errors
+
+
+def _make_get_request(url, headers=None, params=None, session=None, timeout=None):
+    response = (session or requests).get(url, headers=headers, params=params, timeout=timeout)
+    return _handle_response(response)
+
+
+def _make_post_request(url, payload, headers=None, session=None, timeout=None):
+    response = (session or requests).post(url, json=payload, headers=headers, timeout=timeout)
+    return _handle_response(response)
+
+
+def _make_put_request(url, payload, headers=None, session=None, timeout=None):
+    response = (session or requests).put(url, json=payload, headers=headers, timeout=timeout)
+    return _handle_response(response)
+
+def _make_delete_request(url, headers=None, session=None, timeout=None):
+    response = (session or requests).delete(url, headers=headers, timeout=timeout)
+    return _handle_delete_response(response)
+
+
+def _sqlite_connect(local, path, *pragmas):
+    # sqlite connections can't cross threads or forks, so each thread of each process opens its own and keeps
+    # it in `local`. WAL lets readers and one writer of several processes share the file
+    conn = getattr(local, 'conn', None)
+    if conn is None or local.pid != os.getpid():
+        conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        for pragma in pragmas:
+            conn.execute(f'PRAGMA {pragma}')
+        local.conn = conn
+        local.pid = os.getpid()
+    return conn
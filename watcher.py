@@ -0,0 +1,253 @@
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from checkpoint import CheckpointStore
+from sync import IncrementalSync, _field
+
+
+class _Wallet:
+    __slots__ = ('address', 'hot', 'base_interval', 'interval', 'next_due', 'idle', 'polls', 'synced', 'events',
+                 'errors', 'last_poll', 'last_lag', 'total_lag', 'max_lag', 'overdue', 'removed')
+
+    def __init__(self, address, hot, interval, due):
+        self.address = address
+        self.hot = hot
+        self.base_interval = interval
+        self.interval = interval
+        self.next_due = due
+        self.idle = 0
+        self.polls = 0
+        self.synced = False
+        self.events = 0
+        self.errors = 0
+        self.last_poll = None
+        self.last_lag = None
+        self.total_lag = 0.0
+        self.max_lag = 0.0
+        self.overdue = 0.0
+        self.removed = False
+
+
+class WalletWatcher:
+    def __init__(self, account, addresses=(), on_event=None, queue: asyncio.Queue | None = None, loop=None,
+                 endpoint: str = 'transfer', workers: int = 8, interval: float = 60.0, hot_interval: float = 10.0,
+                 max_interval: float = 900.0, idle_polls: int = 3, backoff: float = 2.0,
+                 store: CheckpointStore | None = None, emit_initial: bool = False, on_error=None, **filters):
+        """
+        Long-running poller for many wallets. Wallets are polled earliest-due first by a fixed number of workers,
+        so all of them share the transport's rate limiter fairly and none starves. Each poll goes through
+        IncrementalSync and costs one request when nothing changed. Wallets with new activity are polled at their
+        base interval, wallets without activity for `idle_polls` polls back off up to max_interval
+
+        Usage:
+            watcher = WalletWatcher(api.account, wallets, on_event=handle)
+            watcher.start()
+            ...
+            watcher.stop()
+
+        Args:
+            account (AccountAPIV2): Client used for the polls. Give its transport a TokenBucket for the plan limit
+
+            addresses (Iterable[str]): Wallets to watch, more can be added with add()
+
+            on_event (callable | None): Called as on_event(address, rows) from a worker thread for every poll with
+            new rows, newest first
+
+            queue (asyncio.Queue | None): Queue receiving (address, row) tuples, put from the event loop thread.
+            When a bounded queue is full, the worker waits for room, which slows the polls down to the consumer
+
+            loop (asyncio.AbstractEventLoop | None): Loop owning `queue`. Defaults to the running loop
+
+            endpoint (str): 'transfer', 'balance_change_activities', 'defi_activities' or 'transactions'
+
+            workers (int): Polls in flight at once
+
+            interval (float): Seconds between polls of a normal wallet
+
+            hot_interval (float): Seconds between polls of a wallet added with hot=True
+
+            max_interval (float): Longest interval an idle wallet backs off to
+
+            idle_polls (int): Empty polls in a row after which a wallet starts backing off
+
+            backoff (float): Factor the interval of an idle wallet grows by on each further empty poll
+
+            store (CheckpointStore | None): Where high-water marks are kept, so a restart picks up only new rows
+
+            emit_initial (bool): Emit the rows read by the first poll of a wallet without a mark. By default that
+            poll only sets the mark
+
+            on_error (callable | None): Called as on_error(address, exception) when a poll fails
+
+            filters: Passed to the endpoint, e.g. token=... or remove_spam=True. 'transactions' takes none
+        """
+        if endpoint not in ('transfer', 'balance_change_activities', 'defi_activities', 'transactions'):
+            raise ValueError(f'Unknown endpoint {endpoint!r}')
+        if endpoint == 'transactions' and filters:
+            raise ValueError(f'endpoint="transactions" takes no filters, got {", ".join(filters)}')
+        if queue is not None and loop is None:
+            loop = asyncio.get_running_loop()
+        self.sync = IncrementalSync(account, store)
+        self.on_event = on_event
+        self.queue = queue
+        self.loop = loop
+        self.endpoint = endpoint
+        self.workers = workers
+        self.interval = interval
+        self.hot_interval = hot_interval
+        self.max_interval = max_interval
+        self.idle_polls = idle_polls
+        self.backoff = backoff
+        self.emit_initial = emit_initial
+        self.on_error = on_error
+        self.filters = filters
+        self._wallets = {}
+        self._heap = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._changed = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        for address in addresses:
+            self.add(address)
+
+    def _schedule(self, wallet):
+        heapq.heappush(self._heap, (wallet.next_due, not wallet.hot, next(self._seq), wallet))
+
+    def add(self, address: str, hot: bool = False):
+        """
+        Start watching a wallet. Hot wallets are polled every hot_interval and win ties with normal ones
+        """
+        with self._lock:
+            if address in self._wallets:
+                return
+            wallet = _Wallet(address, hot, self.hot_interval if hot else self.interval, time.monotonic())
+            self._wallets[address] = wallet
+            self._schedule(wallet)
+        self._changed.set()
+
+    def remove(self, address: str):
+        with self._lock:
+            wallet = self._wallets.pop(address, None)
+            if wallet is not None:
+                wallet.removed = True
+
+    def _next(self):
+        """
+        Pop the next due wallet, or return the seconds to wait for one
+        """
+        with self._lock:
+            while self._heap and self._heap[0][3].removed:
+                heapq.heappop(self._heap)
+            if not self._heap:
+                return None, 1.0
+            due, _, _, wallet = self._heap[0]
+            now = time.monotonic()
+            if due > now:
+                return None, due - now
+            heapq.heappop(self._heap)
+            wallet.overdue = now - due
+            return wallet, 0.0
+
+    async def _put(self, address, rows):
+        for row in rows:
+            await self.queue.put((address, row))
+
+    def _emit(self, address, rows):
+        if self.on_event is not None:
+            self.on_event(address, rows)
+        if self.queue is not None:
+            # The mark has already moved past these rows, so they must not be dropped: a full bounded queue holds
+            # the worker until the consumer makes room
+            asyncio.run_coroutine_threadsafe(self._put(address, rows), self.loop).result()
+
+    def _poll(self, wallet):
+        # Only a successful poll establishes the mark: after a failed first poll the next one is still initial
+        initial = not wallet.synced and self.sync.mark(self.endpoint, wallet.address) is None
+        try:
+            rows = getattr(self.sync, self.endpoint)(wallet.address, **self.filters)
+        except Exception as exc:
+            rows = None
+            wallet.errors += 1
+            if self.on_error is not None:
+                self.on_error(wallet.address, exc)
+        now = time.time()
+        with self._lock:
+            wallet.polls += 1
+            wallet.synced = wallet.synced or rows is not None
+            wallet.last_poll = now
+            if rows and not initial:
+                wallet.idle = 0
+                wallet.interval = wallet.base_interval
+                wallet.events += len(rows)
+                lags = [now - block_time for block_time in (_field(row, 'block_time') for row in rows)
+                        if block_time is not None]
+                if lags:
+                    wallet.last_lag = min(lags)
+                    wallet.total_lag += sum(lags)
+                    wallet.max_lag = max(wallet.max_lag, max(lags))
+            elif rows is not None:
+                wallet.idle += 1
+                if wallet.idle >= self.idle_polls:
+                    wallet.interval = min(wallet.interval * self.backoff, self.max_interval)
+            if not wallet.removed:
+                wallet.next_due = time.monotonic() + wallet.interval
+                self._schedule(wallet)
+        self._changed.set()
+        if rows and (self.emit_initial or not initial):
+            self._emit(wallet.address, rows)
+
+    def run(self):
+        """
+        Poll until stop() is called. Blocks the calling thread
+        """
+        slots = threading.Semaphore(self.workers)
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while not self._stopped.is_set():
+                wallet, wait = self._next()
+                if wallet is None:
+                    self._changed.wait(wait)
+                    self._changed.clear()
+                    continue
+                # Waiting for a free worker is the backpressure: wallets become overdue instead of piling up
+                slots.acquire()
+                future = executor.submit(self._poll, wallet)
+                future.add_done_callback(lambda _: slots.release())
+
+    def start(self):
+        """
+        Run the watcher in a background thread
+        """
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self.run, name='wallet-watcher', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None):
+        """
+        Stop scheduling new polls and wait for the running ones to finish
+        """
+        self._stopped.set()
+        self._changed.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def metrics(self, address: str | None = None) -> dict:
+        """
+        Per-wallet polling metrics. Lags are seconds from a row's block_time to the poll that found it;
+        overdue is how late the last poll started compared to its schedule. Returns one wallet's metrics when
+        `address` is given, otherwise {address: metrics}
+        """
+        with self._lock:
+            wallets = [self._wallets[address]] if address is not None else list(self._wallets.values())
+            result = {wallet.address: {
+                'hot': wallet.hot, 'interval': wallet.interval, 'idle_polls': wallet.idle, 'polls': wallet.polls,
+                'events': wallet.events, 'errors': wallet.errors, 'last_poll': wallet.last_poll,
+                'last_lag': wallet.last_lag, 'avg_lag': wallet.total_lag / wallet.events if wallet.events else None,
+                'max_lag': wallet.max_lag, 'overdue': wallet.overdue,
+            } for wallet in wallets}
+        return result[address] if address is not None else result